@@ -0,0 +1,337 @@
+"""Benchmark suite for the kuehn_et_al_fdm calculation functions and command-line entry points.
+
+The suite times each public calculation over sweeps of the scenario count, location-grid size,
+displacement-grid size, and coefficient type, as well as the cold import and CLI startup times
+(in fresh interpreters), which are checked against a target. Results are written as JSON so runs
+from different versions can be compared locally.
+
+Usage
+-----
+$ python benchmarks/run_benchmarks.py -o benchmark_results.json
+$ python benchmarks/run_benchmarks.py --quick
+$ python benchmarks/run_benchmarks.py --compare old_results.json new_results.json
+"""
+
+# Python imports
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+# Module imports
+import kuehn_et_al_fdm as kea
+from kuehn_et_al_fdm.kernels import get_backend
+
+# Sweep values (full run, quick run)
+SCENARIO_COUNTS = ([1, 10, 100, 1000], [1, 100])
+LOCATION_STEPS = ([0.1, 0.05, 0.01], [0.1, 0.05])
+GRID_SIZES = ([10, 100, 1000], [10, 100])
+COEFFICIENT_TYPES = ["median", "full"]
+
+# Regressions larger than this ratio are flagged when comparing results
+REGRESSION_RATIO = 1.2
+
+# Target for the median cold import and CLI startup times in seconds
+STARTUP_TARGET_S = 0.3
+
+
+def _time_call(func, repeat):
+    """Time a callable; the first call is a warm-up and is not recorded."""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _time_subprocess(args, repeat):
+    """Time a command in a fresh interpreter (cold start)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _summarize(name, params, times):
+    """Summarize the timings of a benchmark case."""
+    return {
+        "name": name,
+        "params": params,
+        "repeat": len(times),
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+    }
+
+
+def _calculation_cases(quick):
+    """Yield (name, params, callable) for the calculation benchmarks."""
+    i = 1 if quick else 0
+    rng = np.random.default_rng(0)
+
+    for ct in COEFFICIENT_TYPES:
+        for n in SCENARIO_COUNTS[i]:
+            magnitude = rng.uniform(6.5, 7.5, n)
+            location = rng.uniform(0, 1, n)
+            params = {"scenarios": n, "coefficient_type": ct}
+            yield "_calc_params", params, lambda m=magnitude, u=location, ct=ct: kea._calc_params(
+                magnitude=m[:, np.newaxis],
+                location=u[:, np.newaxis],
+                style="strike-slip",
+                coefficient_type=ct,
+                override=True,
+            )
+            yield "calc_displ_site", params, lambda m=magnitude, u=location, ct=ct: (
+                kea.calc_displ_site(
+                    magnitude=m,
+                    location=u,
+                    style="strike-slip",
+                    percentile=[0.5, 0.84],
+                    coefficient_type=ct,
+                    override=True,
+                )
+            )
+
+        for size in GRID_SIZES[i]:
+            displ = np.logspace(-3, 2, size)
+            params = {"displacements": size, "coefficient_type": ct}
+            yield "calc_prob_exceed", params, lambda d=displ, ct=ct: kea.calc_prob_exceed(
+                magnitude=7,
+                location=0.3,
+                style="normal",
+                displacement_array=d,
+                coefficient_type=ct,
+            )
+
+    # Average displacement and probability of occurrence are only available for point estimates
+    # of the model coefficients
+    for ct in ["mean", "median"]:
+        yield "calc_displ_avg", {"coefficient_type": ct}, lambda ct=ct: kea.calc_displ_avg(
+            magnitude=7, style="reverse", coefficient_type=ct
+        )
+
+        for size in GRID_SIZES[i]:
+            location = np.linspace(0, 0.5, size)
+            displ = np.full(size, 1.0)
+            params = {"locations": size, "coefficient_type": ct}
+            yield "calc_prob_occur", params, lambda u=location, d=displ, ct=ct: (
+                kea.calc_prob_occur(
+                    magnitude=7,
+                    location_array=u,
+                    style="normal",
+                    displacement_array=d,
+                    coefficient_type=ct,
+                )
+            )
+
+    for step in LOCATION_STEPS[i]:
+        params = {"locations": int(round(1 / step)) + 1, "coefficient_type": "median"}
+        yield "calc_displ_profile", params, lambda step=step: kea.calc_displ_profile(
+            magnitude=7, style="strike-slip", percentile=0.5, location_step=step
+        )
+
+    # Hazard and risk functions
+    for n in SCENARIO_COUNTS[i]:
+        magnitude = rng.uniform(6.5, 7.5, n)
+        location = rng.uniform(0, 1, n)
+        params = {"scenarios": n, "displacements": 20, "coefficient_type": "median"}
+        yield "calc_hazard", params, lambda m=magnitude, u=location: kea.calc_hazard(
+            magnitude=m,
+            location_array=u,
+            style="strike-slip",
+            rate=1e-4,
+            displacement_array=np.logspace(-2, 1, 20),
+        )
+        params = {"scenarios": n, "coefficient_type": "median"}
+        yield "calc_prob_failure", params, lambda m=magnitude, u=location: kea.calc_prob_failure(
+            magnitude=m, location=u, style="strike-slip", median_capacity=1, beta=0.5
+        )
+
+    for size in GRID_SIZES[i]:
+        location = np.linspace(0.01, 0.99, size)
+        params = {"locations": size, "coefficient_type": "median"}
+        yield "calc_joint_prob_exceed", params, lambda u=location: kea.calc_joint_prob_exceed(
+            magnitude=7, location_array=u, style="normal", displacement_array=1
+        )
+        yield "simulate_displ", params, lambda u=location: kea.simulate_displ(
+            magnitude=7, location_array=u, style="normal", n_realizations=100
+        )
+
+    params = {"events": 100_000, "coefficient_type": "median"}
+    yield "calc_event_hazard", params, lambda: kea.calc_event_hazard(
+        magnitude=[6.5, 7, 7.5],
+        location_array=[0.2, 0.3, 0.1],
+        style="normal",
+        rate=[1e-3, 5e-4, 1e-4],
+        displacement_array=[0.1, 1, 3],
+        n_events=100_000,
+    )
+
+    params = {"magnitudes": 10, "coefficient_type": "median"}
+    yield "calc_floating_prob_exceed", params, lambda: kea.calc_floating_prob_exceed(
+        magnitude=np.linspace(6.5, 8, 10),
+        fault_length=200,
+        site_position=50,
+        style="strike-slip",
+        displacement_array=np.logspace(-2, 1, 20),
+    )
+
+
+def _startup_cases():
+    """Yield (name, params, command) for the cold-start benchmarks."""
+    python = sys.executable
+    yield "cold_import", {}, [python, "-c", "import kuehn_et_al_fdm"]
+
+    scenario = ["-m", "7", "-l", "0.5", "-s", "strike-slip"]
+    commands = {
+        "calc_params": scenario,
+        "calc_displ_site": scenario + ["-p", "0.5"],
+        "calc_displ_avg": ["-m", "7", "-s", "strike-slip"],
+        "calc_displ_profile": ["-m", "7", "-s", "strike-slip", "-p", "0.5"],
+        "calc_prob_exceed": scenario + ["-d", "0.1", "1"],
+        "calc_prob_occur": ["-m", "7", "-l", "0.5", "-s", "strike-slip", "-d", "1"],
+    }
+    for module, args in commands.items():
+        command = [python, "-m", f"kuehn_et_al_fdm.{module}"] + args
+        yield "cli_startup", {"module": module}, command
+
+
+def run_benchmarks(quick=False, repeat=5, startup_repeat=3):
+    """
+    Run the benchmark suite.
+
+    Parameters
+    ----------
+    quick : boolean, optional
+        Option to run smaller sweeps. Default False.
+
+    repeat : int, optional
+        Number of timed calls for each calculation case (after one warm-up call). Default 5.
+
+    startup_repeat : int, optional
+        Number of fresh interpreters for each cold-start case. Default 3.
+
+    Returns
+    -------
+    dict
+        Metadata and a list of results with the minimum, median, and mean times in seconds.
+    """
+    results = []
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name, params, func in _calculation_cases(quick):
+            results.append(_summarize(name, params, _time_call(func, repeat)))
+            print(f"{name:28s} {json.dumps(params):60s} {results[-1]['median_s']:.4e} s")
+
+    for name, params, command in _startup_cases():
+        result = _summarize(name, params, _time_subprocess(command, startup_repeat))
+        result["target_s"] = STARTUP_TARGET_S
+        result["meets_target"] = result["median_s"] <= STARTUP_TARGET_S
+        results.append(result)
+        flag = "" if result["meets_target"] else f"  <-- exceeds {STARTUP_TARGET_S} s target"
+        print(f"{name:28s} {json.dumps(params):60s} {result['median_s']:.4e} s{flag}")
+
+    versions = {}
+    for package in ["kuehn_et_al_fdm", "numpy", "pandas", "scipy", "numba"]:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit or None,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "versions": versions,
+            "backend": get_backend(),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare_results(old, new):
+    """
+    Compare two benchmark result files and print the ratio of the median times.
+
+    Parameters
+    ----------
+    old : dict
+        Baseline results.
+
+    new : dict
+        Results to compare against the baseline.
+
+    Returns
+    -------
+    list
+        Cases in both files with a median-time ratio greater than 1.2 (regressions).
+    """
+
+    def _key(result):
+        return result["name"], json.dumps(result["params"], sort_keys=True)
+
+    baseline = {_key(r): r for r in old["results"]}
+    regressions = []
+    for result in new["results"]:
+        if _key(result) not in baseline:
+            continue
+        ratio = result["median_s"] / baseline[_key(result)]["median_s"]
+        flag = "  <-- regression" if ratio > REGRESSION_RATIO else ""
+        print(f"{result['name']:28s} {_key(result)[1]:60s} {ratio:6.2f}x{flag}")
+        if flag:
+            regressions.append(_key(result))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("-o", "--output_file", default="benchmark_results.json")
+    parser.add_argument("--quick", action="store_true", help="Run smaller sweeps.")
+    parser.add_argument("--repeat", default=5, type=int, help="Timed calls per case.")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files."
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        old, new = [json.loads(Path(f).read_text()) for f in args.compare]
+        regressions = compare_results(old, new)
+        sys.exit(1 if regressions else 0)
+
+    results = run_benchmarks(quick=args.quick, repeat=args.repeat)
+    Path(args.output_file).write_text(json.dumps(results, indent=2))
+    print(f"Saved to {args.output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,27 @@
-from .calc_params import _calc_params  # noqa: F401
+from .calc_params import _calc_params, DistributionParams  # noqa: F401
 from .calc_displ_site import calc_displ_site  # noqa: F401
 from .calc_displ_avg import calc_displ_avg  # noqa: F401
 from .calc_displ_profile import calc_displ_profile  # noqa: F401
 from .calc_prob_exceed import calc_prob_exceed  # noqa: F401
 from .calc_prob_occur import calc_prob_occur  # noqa: F401
+from .calc_hazard import calc_hazard  # noqa: F401
+from .calc_event_hazard import calc_event_hazard  # noqa: F401
+from .calc_joint_prob_exceed import calc_joint_prob_exceed  # noqa: F401
+from .calc_prob_failure import calc_prob_failure  # noqa: F401
+from .calc_floating_prob_exceed import (  # noqa: F401
+    calc_floating_prob_exceed,
+    enumerate_floating_ruptures,
+)
+from .geometry import project_sites  # noqa: F401
+from .reduce_posterior import reduce_posterior  # noqa: F401
+from .simulate_displ import simulate_displ  # noqa: F401
+from .model import FaultDisplacementModel  # noqa: F401
+from .validation import validate_scenarios  # noqa: F401
+from .results import CalculationResult  # noqa: F401
 
 from ._help import __doc__, main as help  # noqa: F401
+from .profiling import _enable_from_environment
 
 
-import pandas as pd
-
-pd.set_option("display.max_columns", 50)
-pd.set_option("display.width", 1000)
+# Opt-in profiling of the calculation stages
+_enable_from_environment()
@@ -7,13 +7,35 @@ __all__ = [
     "_add_coefficient_type",
     "_add_percentile",
     "_add_folded_flag",
+    "_add_exact_folded_flag",
     "_add_debug_flag",
     "_add_displacement",
     "_add_location_step",
+    "_add_n_models",
+    "_add_seed",
+    "_add_n_realizations",
+    "_add_rate",
+    "_add_n_events",
+    "_add_chunk_size",
+    "_add_joint_mode",
+    "_add_median_capacity",
+    "_add_beta",
+    "_add_fault_length",
+    "_add_site_position",
+    "_add_position_step",
+    "_add_output_file",
+    "_add_stdio_flag",
+    "_add_http_flag",
+    "_add_host",
+    "_add_port",
+    "_add_max_batch_size",
+    "_add_batch_window",
     "_add_arguments",
+    "_print_result",
 ]
 
 import functools
+import sys
 
 
 def _add_magnitude(parser, nargs=None):
@@ -78,10 +100,13 @@ def _add_coefficient_type(parser):
         "--coefficient_type",
         default="median",
         type=str.lower,
-        choices=("mean", "median", "full"),
+        choices=("mean", "median", "full", "reduced", "parametric", "analytic"),
         help=(
-            "Run model with point estimates for coefficients ('mean' or 'median') or with full "
-            "model coefficients ('full'); case-insensitive. Default is 'median'."
+            "Run model with point estimates for coefficients ('mean' or 'median'), with full "
+            "model coefficients ('full'), with a weighted set of representative coefficients "
+            "('reduced'), with the median coefficients and tabulated epistemic "
+            "uncertainties ('parametric'), or with the mean coefficients and delta-method epistemic "
+            "uncertainties ('analytic'); case-insensitive. Default is 'median'."
         ),
     )
 
@@ -114,6 +139,17 @@ def _add_folded_flag(parser):
     parser.set_defaults(folded=True)
 
 
+def _add_exact_folded_flag(parser):
+    """Add exact folded argument (boolean) to an existing parser."""
+    parser.add_argument(
+        "--exact_folded",
+        dest="exact_folded",
+        action="store_true",
+        help="Option to return the exact quantile of the folded (site/complement) mixture.",
+        default=False,
+    )
+
+
 def _add_debug_flag(parser):
     """Add debug argument (boolean) to an existing parser."""
     parser.add_argument(
@@ -148,13 +184,232 @@ def _add_location_step(parser):
     )
 
 
+def _add_n_models(parser):
+    """Add number of models argument to an existing parser."""
+    parser.add_argument(
+        "-n",
+        "--n_models",
+        default=20,
+        type=int,
+        help="Number of representative coefficient rows. Default 20.",
+    )
+
+
+def _add_seed(parser):
+    """Add random seed argument to an existing parser."""
+    parser.add_argument(
+        "--seed",
+        default=0,
+        type=int,
+        help="Seed for the random number generator. Default 0.",
+    )
+
+
+def _add_n_realizations(parser):
+    """Add number of realizations argument to an existing parser."""
+    parser.add_argument(
+        "-n",
+        "--n_realizations",
+        default=1,
+        type=int,
+        help="Number of realizations per rupture. Default 1.",
+    )
+
+
+def _add_rate(parser, nargs="+"):
+    """Add annual rate argument to an existing parser."""
+    parser.add_argument(
+        "-r",
+        "--rate",
+        required=True,
+        nargs=nargs,
+        type=float,
+        help="Annual rate of each rupture scenario.",
+    )
+
+
+def _add_n_events(parser):
+    """Add number of events argument to an existing parser."""
+    parser.add_argument(
+        "-ne",
+        "--n_events",
+        default=1_000_000,
+        type=int,
+        help="Number of events in the stochastic catalog. Default 1,000,000.",
+    )
+
+
+def _add_chunk_size(parser):
+    """Add chunk size argument to an existing parser."""
+    parser.add_argument(
+        "--chunk_size",
+        default=100_000,
+        type=int,
+        help="Number of events simulated at once. Default 100,000.",
+    )
+
+
+def _add_joint_mode(parser):
+    """Add joint exceedance mode argument to an existing parser."""
+    parser.add_argument(
+        "--mode",
+        default="any",
+        type=str.lower,
+        choices=("any", "all"),
+        help="Probability that any or all sites exceed. Default 'any'.",
+    )
+
+
+def _add_median_capacity(parser, nargs="+"):
+    """Add median displacement capacity argument to an existing parser."""
+    parser.add_argument(
+        "-c",
+        "--median_capacity",
+        required=True,
+        nargs=nargs,
+        type=float,
+        help="Median displacement capacity in meters.",
+    )
+
+
+def _add_beta(parser):
+    """Add fragility logarithmic standard deviation argument to an existing parser."""
+    parser.add_argument(
+        "-b",
+        "--beta",
+        required=True,
+        type=float,
+        help="Logarithmic standard deviation of the displacement capacity.",
+    )
+
+
+def _add_fault_length(parser):
+    """Add fault length argument to an existing parser."""
+    parser.add_argument(
+        "-fl",
+        "--fault_length",
+        required=True,
+        type=float,
+        help="Fault length in km.",
+    )
+
+
+def _add_site_position(parser):
+    """Add site position argument to an existing parser."""
+    parser.add_argument(
+        "-x",
+        "--site_position",
+        required=True,
+        type=float,
+        help="Distance along the fault from the fault end to the site in km.",
+    )
+
+
+def _add_position_step(parser):
+    """Add rupture position step argument to an existing parser."""
+    parser.add_argument(
+        "-ps",
+        "--position_step",
+        default=1.0,
+        type=float,
+        help="Spacing of the rupture start positions in km. Default 1.0.",
+    )
+
+
+def _add_output_file(parser):
+    """Add output file argument to an existing parser."""
+    parser.add_argument(
+        "-o",
+        "--output_file",
+        default=None,
+        type=str,
+        help="Path to save the results as a CSV file. (Optional.)",
+    )
+
+
+def _add_stdio_flag(parser):
+    """Add standard input/output mode argument (boolean) to an existing parser."""
+    parser.add_argument(
+        "--stdio",
+        dest="stdio",
+        action="store_true",
+        help="Read JSON requests (one per line) from the standard input.",
+        default=False,
+    )
+
+
+def _add_http_flag(parser):
+    """Add HTTP service mode argument (boolean) to an existing parser."""
+    parser.add_argument(
+        "--http",
+        dest="http",
+        action="store_true",
+        help="Run a local HTTP service that evaluates JSON requests posted to /evaluate.",
+        default=False,
+    )
+
+
+def _add_host(parser):
+    """Add host argument to an existing parser."""
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        type=str,
+        help="Host name or address of the HTTP service. Default 127.0.0.1.",
+    )
+
+
+def _add_port(parser):
+    """Add port argument to an existing parser."""
+    parser.add_argument(
+        "--port",
+        default=8000,
+        type=int,
+        help="Port number of the HTTP service. Default 8000.",
+    )
+
+
+def _add_max_batch_size(parser):
+    """Add maximum batch size argument to an existing parser."""
+    parser.add_argument(
+        "--max_batch_size",
+        default=256,
+        type=int,
+        help="Maximum number of requests evaluated in one batch. Default 256.",
+    )
+
+
+def _add_batch_window(parser):
+    """Add batch window argument to an existing parser."""
+    parser.add_argument(
+        "--batch_window",
+        default=0.002,
+        type=float,
+        help="Time in seconds to wait for more requests in a batch. Default 0.002.",
+    )
+
+
+def _print_result(result):
+    """Print a result, using wide display options for pandas DataFrames."""
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(result, pd.DataFrame):
+        with pd.option_context("display.max_columns", 50, "display.width", 1000):
+            print(result)
+    else:
+        print(result)
+
+
 def _add_arguments(parser):
-    """Decorator function that takes an argument parser object."""
+    """
+    Decorator function that takes an argument parser object, or a function that creates it. The
+    function is only called when the command is run, so the parser is not built on import.
+    """
 
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            parsed_args = vars(parser.parse_args())
+            arg_parser = parser if hasattr(parser, "parse_args") else parser()
+            parsed_args = vars(arg_parser.parse_args())
             kwargs.update(parsed_args)
             return func(**kwargs)
 
@@ -14,6 +14,14 @@ To use the CLI, you can invoke the following commands:
 - kea-displ_profile : Calculate the predicted displacement profile in meters.
 - kea-prob_exceed : Calculate the probability of exceedance.
 - kea-prob_occur : Calculate the percentile rank of observations.
+- kea-hazard : Calculate the annual rate of exceedance, with optional disaggregation.
+- kea-event_hazard : Calculate the annual rate of exceedance with an event-based approach.
+- kea-joint_prob_exceed : Calculate the joint probability of exceedance at multiple sites.
+- kea-prob_failure : Calculate the probability of failure for a lognormal fragility function.
+- kea-floating_prob_exceed : Calculate the probability of exceedance for floating ruptures.
+- kea-reduce_posterior : Reduce the posterior coefficients to a small weighted set.
+- kea-simulate_displ : Simulate displacement realizations along the rupture length.
+- kea-serve : Evaluate JSON requests in a long-running worker or local HTTP service.
 
 Example CLI Usage:
 
@@ -29,8 +37,19 @@ The following functions are available:
 - calc_displ_profile : Calculate the predicted displacement profile in meters.
 - calc_prob_exceed : Calculate the probability of exceedance.
 - calc_prob_occur : Calculate the percentile rank of observations.
+- calc_hazard : Calculate the annual rate of exceedance, with optional disaggregation.
+- calc_event_hazard : Calculate the annual rate of exceedance with an event-based approach.
+- calc_joint_prob_exceed : Calculate the joint probability of exceedance at multiple sites.
+- calc_prob_failure : Calculate the probability of failure for a lognormal fragility function.
+- calc_floating_prob_exceed : Calculate the probability of exceedance for floating ruptures.
+- enumerate_floating_ruptures : Enumerate the floating rupture positions that include a site.
+- project_sites : Calculate the normalized locations of sites along rupture traces.
+- reduce_posterior : Reduce the posterior coefficients to a small weighted set.
+- simulate_displ : Simulate displacement realizations along the rupture length.
+- FaultDisplacementModel : Model object for a style of faulting and set of coefficients.
+- validate_scenarios : Validate a batch of scenarios with per-row diagnostics.
 
-Each function corresponds to a CLI command but can be invoked programmatically within Python.
+Most functions correspond to a CLI command, and all can be invoked programmatically within Python.
 
 To use the package at the module level, you can import and call the functions directly:
 
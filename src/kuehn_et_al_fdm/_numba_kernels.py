@@ -0,0 +1,179 @@
+"""This module contains the Numba-compiled kernels used by the compiled backend (see `kernels`).
+
+Each kernel fuses the parameter predictions, the Box-Cox transformation, and the normal
+distribution calls into a single pass over the scenarios, models, and displacements or
+percentiles, without temporary arrays. The terms that only depend on the model or the scenario
+are calculated once, the site and complementary locations share the magnitude terms, and the
+scenarios are evaluated in parallel. The kernels are compiled on first use and cached on disk.
+
+This module requires Numba and is only imported by `kernels`.
+"""
+
+# Python imports
+import math
+import numba
+import numpy as np
+
+# Model constants (see `prediction_functions`)
+MAG_BREAK, DELTA = 7.0, 0.1
+
+# Style of faulting codes and columns of the coefficient matrix
+STYLE_CODES = {"strike-slip": 0, "reverse": 1, "normal": 2}
+C1, C2, C3, ALPHA, BETA, GAMMA, LAMBDA, S1, S2, S3, S4 = range(11)
+
+
+@numba.njit(cache=True)
+def _peak(coefficients):
+    """Calculate the peak of the location shape function for each model."""
+    alpha, beta, gamma = coefficients[:, ALPHA], coefficients[:, BETA], coefficients[:, GAMMA]
+    return gamma * (alpha / (alpha + beta)) ** alpha * (beta / (alpha + beta)) ** beta
+
+
+@numba.njit(cache=True)
+def _mode(coefficients, style_code, magnitude, softplus_magnitude, peak):
+    """Calculate the mode (less the peak) and its standard deviation for one model."""
+    c = coefficients
+    fm = c[C1] + c[C2] * (magnitude - MAG_BREAK) + (c[C3] - c[C2]) * softplus_magnitude
+
+    if style_code == 0:
+        sd_mode = (
+            c[S1]
+            + c[S2] * (magnitude - c[S3])
+            - c[S2] * DELTA * math.log(1 + math.exp((magnitude - c[S3]) / DELTA))
+        )
+    elif style_code == 1:
+        sd_mode = c[S1]
+    else:
+        sd_mode = c[S2] - c[S3] / (1 + math.exp(-1 * c[S4] * (magnitude - MAG_BREAK)))
+
+    return fm - peak, sd_mode
+
+
+@numba.njit(cache=True)
+def _mu_sd(coefficients, style_code, a, sd_mode, location, log_location, log_complement):
+    """
+    Calculate the mean and total standard deviation in transformed units for one model and
+    location (with the logs of the location and its complement, shared by both locations).
+    """
+    c = coefficients
+    alpha, beta = c[ALPHA], c[BETA]
+    mu = a + c[GAMMA] * math.exp(alpha * log_location + beta * log_complement)
+
+    # Standard deviation of the location (columns S1 to S4 depend on the style)
+    if style_code == 0:
+        sd_u = c[S4] + c[S4 + 1] * (location - alpha / (alpha + beta)) ** 2
+    elif style_code == 1:
+        sd_u = c[S2] + c[S3] * (location - alpha / (alpha + beta)) ** 2
+    else:
+        sd_u = c[S1]
+
+    return mu, math.sqrt(sd_mode**2 + sd_u**2)
+
+
+@numba.njit(cache=True)
+def _scenario_terms(magnitude, location):
+    """Calculate the terms that only depend on the scenario."""
+    softplus_magnitude = DELTA * math.log(1 + math.exp((magnitude - MAG_BREAK) / DELTA))
+    return softplus_magnitude, math.log(location), math.log(1 - location)
+
+
+@numba.njit(cache=True)
+def _norm_sf(x, mean, stdv):
+    """Normal survival function."""
+    return 0.5 * math.erfc((x - mean) / (stdv * math.sqrt(2.0)))
+
+
+@numba.njit(cache=True)
+def _transformed_displ(bc_param, mean, stdv, z, is_mean):
+    """Calculate the displacement in transformed units for a standard normal quantile or mean."""
+    if is_mean:
+        base = bc_param * mean + 1
+        displ_meters = base ** (1 / bc_param) * (
+            1 + (stdv**2 * (1 - bc_param)) / (2 * base**2)
+        )
+        return (displ_meters**bc_param - 1) / bc_param
+    return mean + z * stdv
+
+
+@numba.njit(cache=True)
+def _to_meters(Y_value, bc_param):
+    """Convert from transformed units to meters; displacements less than 1 mm are zero."""
+    displ = (Y_value * bc_param + 1) ** (1 / bc_param)
+    if math.isnan(displ) or displ < 0.001:
+        return 0.0
+    return displ
+
+
+@numba.njit(cache=True, parallel=True)
+def _prob_exceed(coefficients, style_code, magnitude, location, displacement, folded):
+    """
+    Calculate the probability of exceedance with shape (scenarios, models, displacements).
+    """
+    n_scenarios, n_models, n_displ = magnitude.size, coefficients.shape[0], displacement.size
+    result = np.empty((n_scenarios, n_models, n_displ))
+
+    # Transformed displacements only depend on the model
+    transformed = np.empty((n_models, n_displ))
+    for j in range(n_models):
+        bc_param = coefficients[j, LAMBDA]
+        for k in range(n_displ):
+            transformed[j, k] = (displacement[k] ** bc_param - 1) / bc_param
+
+    peak = _peak(coefficients)
+    for i in numba.prange(n_scenarios):
+        softplus_magnitude, log_site, log_complement = _scenario_terms(magnitude[i], location[i])
+        for j in range(n_models):
+            c = coefficients[j]
+            a, sd_mode = _mode(c, style_code, magnitude[i], softplus_magnitude, peak[j])
+            mean_site, stdv_site = _mu_sd(
+                c, style_code, a, sd_mode, location[i], log_site, log_complement
+            )
+            mean_complement, stdv_complement = mean_site, stdv_site
+            if folded:
+                mean_complement, stdv_complement = _mu_sd(
+                    c, style_code, a, sd_mode, 1 - location[i], log_complement, log_site
+                )
+            for k in range(n_displ):
+                probex = _norm_sf(transformed[j, k], mean_site, stdv_site)
+                if folded:
+                    probex = 0.5 * (
+                        probex + _norm_sf(transformed[j, k], mean_complement, stdv_complement)
+                    )
+                result[i, j, k] = probex
+
+    return result
+
+
+@numba.njit(cache=True, parallel=True)
+def _displ_site(coefficients, style_code, magnitude, location, z, is_mean, folded):
+    """
+    Calculate the displacement in meters with shape (scenarios, percentiles, models).
+    """
+    n_scenarios, n_percentiles, n_models = magnitude.size, z.size, coefficients.shape[0]
+    result = np.empty((n_scenarios, n_percentiles, n_models))
+
+    peak = _peak(coefficients)
+    for i in numba.prange(n_scenarios):
+        softplus_magnitude, log_site, log_complement = _scenario_terms(magnitude[i], location[i])
+        for j in range(n_models):
+            c = coefficients[j]
+            bc_param = c[LAMBDA]
+            a, sd_mode = _mode(c, style_code, magnitude[i], softplus_magnitude, peak[j])
+            mean_site, stdv_site = _mu_sd(
+                c, style_code, a, sd_mode, location[i], log_site, log_complement
+            )
+            mean_complement, stdv_complement = mean_site, stdv_site
+            if folded:
+                mean_complement, stdv_complement = _mu_sd(
+                    c, style_code, a, sd_mode, 1 - location[i], log_complement, log_site
+                )
+            for p in range(n_percentiles):
+                Y_value = _transformed_displ(bc_param, mean_site, stdv_site, z[p], is_mean[p])
+                if folded:
+                    Y_complement = _transformed_displ(
+                        bc_param, mean_complement, stdv_complement, z[p], is_mean[p]
+                    )
+                    Y_value = 0.5 * (Y_value + Y_complement)
+                result[i, p, j] = _to_meters(Y_value, bc_param)
+
+    return result
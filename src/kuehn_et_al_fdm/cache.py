@@ -0,0 +1,492 @@
+"""This module provides opt-in caches of the results of `calc_displ_site` and `calc_prob_exceed`
+for repeated scenarios. The caches are keyed on the normalized inputs (e.g., case-insensitive
+strings, default arguments, and the contents of NumPy arrays).
+
+- The in-memory cache is bounded by the memory used by the cached results, and evicts the least
+  recently used results first.
+- The on-disk cache stores each array result as a ``.npy`` file in a directory, named by a hash of
+  the inputs, the package version, and checksums of the coefficient files (and of the active
+  reduced set of coefficients), so results persist between runs and are invalidated when the
+  model changes. It is bounded by the total file size,
+  and evicts the least recently used files first.
+
+When the caches are disabled (the default), the cached functions call the calculation directly.
+"""
+
+# Python imports
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+
+# Module imports
+from kuehn_et_al_fdm.load_data import _get_coefficients, dir_data
+from kuehn_et_al_fdm.trace import _tracing
+from kuehn_et_al_fdm.utilities import _check_magnitude_range
+
+# Default memory bound of the in-memory cache in bytes
+MAX_BYTES = 64 * 1024**2
+
+# Default size bound of the on-disk cache in bytes
+MAX_DISK_BYTES = 1024**3
+
+# Number of writes between scans of the on-disk cache, which count files from other writers
+SCAN_INTERVAL = 256
+
+# Fraction of the size bound that the on-disk cache is reduced to when it is exceeded
+EVICT_FRACTION = 0.9
+
+_ACTIVE = None
+_DISK = None
+
+
+class ResultCache:
+    """
+    Least-recently-used cache of calculation results, bounded by the memory used by the results.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum memory in bytes used by the cached results. Results larger than this are not
+        cached. Default 64 MiB.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError("The 'max_bytes' must be positive.")
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return a copy of the cached result, or None if the key is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy(entry[0])
+
+    def put(self, key, value):
+        """Cache a copy of the result, evicting the least recently used results if needed."""
+        nbytes = _get_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (_copy(value), nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all cached results and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """
+        Return the cache statistics.
+
+        Returns
+        -------
+        dict
+            Statistics with the keys 'hits', 'misses', 'hit_rate', 'evictions', 'entries',
+            'nbytes', and 'max_bytes'.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class DiskCache:
+    """
+    Content-addressed on-disk cache of array results, bounded by the total file size.
+
+    Each result is stored as a ``.npy`` file named by a hash of the inputs, the package version,
+    and checksums of the coefficient files; keys of 'reduced' results include the checksum of the
+    active reduced set (see `_make_key`). Files are written to a temporary file and renamed,
+    so concurrent writers (threads or processes) never expose partial files.
+
+    The total file size is tracked on each write and refreshed from the directory every
+    `SCAN_INTERVAL` writes. When it exceeds `max_bytes`, the least recently used files (by
+    modification time, which is updated on each hit) are removed until the total is below
+    `EVICT_FRACTION` of `max_bytes`.
+
+    Parameters
+    ----------
+    directory : Union[str, pathlib.Path]
+        Cache directory; created if needed.
+
+    max_bytes : int, optional
+        Maximum total size in bytes of the cached files. Default 1 GiB.
+    """
+
+    def __init__(self, directory, max_bytes=MAX_DISK_BYTES):
+        if max_bytes <= 0:
+            raise ValueError("The 'max_bytes' must be positive.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._salt = _get_model_checksum()
+        self._nbytes = None  # unknown until the directory is scanned
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _get_path(self, key):
+        digest = hashlib.blake2b(repr((self._salt, key)).encode(), digest_size=20).hexdigest()
+        return self.directory / f"{digest}.npy"
+
+    def get(self, key):
+        """Return the cached result, or None if the key is not cached."""
+        path = self._get_path(key)
+        try:
+            result = np.load(path, allow_pickle=False)
+            os.utime(path)
+        except (OSError, ValueError):  # missing, evicted, or unreadable files
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key, value):
+        """Write an array result to the cache and evict files if the size bound is exceeded."""
+        if not isinstance(value, np.ndarray) or value.dtype.kind not in "biufc":
+            return
+
+        path = self._get_path(key)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, value, allow_pickle=False)
+                size = f.tell()
+            os.replace(temp, path)
+        except OSError:
+            if os.path.exists(temp):
+                os.remove(temp)
+            return
+
+        with self._lock:
+            self._writes += 1
+            if self._nbytes is not None:
+                self._nbytes += size - replaced
+            scan = (
+                self._nbytes is None
+                or self._nbytes > self.max_bytes
+                or self._writes % SCAN_INTERVAL == 0
+            )
+        if scan:
+            self._evict()
+
+    def _evict(self):
+        """Scan the directory and remove the least recently used files if the bound is exceeded."""
+        files = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:  # removed by another writer
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes if total <= self.max_bytes else EVICT_FRACTION * self.max_bytes
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                with self._lock:
+                    self.evictions += 1
+            except OSError:
+                pass
+            total -= size
+
+        with self._lock:
+            self._nbytes = total
+
+    def clear(self):
+        """Remove all cached files and reset the statistics."""
+        for path in self.directory.glob("*.npy"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+            self._nbytes = 0
+
+    def info(self):
+        """
+        Return the cache statistics.
+
+        Returns
+        -------
+        dict
+            Statistics with the keys 'hits', 'misses', 'hit_rate', 'evictions', 'entries',
+            'nbytes', and 'max_bytes'.
+        """
+        sizes = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                sizes.append(path.stat().st_size)
+            except OSError:
+                pass
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(sizes),
+                "nbytes": sum(sizes),
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _get_model_checksum():
+    """Checksum of the package version and the coefficient files."""
+    from importlib import metadata
+
+    try:
+        version = metadata.version("kuehn_et_al_fdm")
+    except metadata.PackageNotFoundError:
+        version = None
+
+    checksum = hashlib.blake2b(str(version).encode(), digest_size=20)
+    for path in sorted(dir_data.glob("*.csv")):
+        checksum.update(path.name.encode())
+        checksum.update(path.read_bytes())
+    return checksum.hexdigest()
+
+
+def _copy(value):
+    """Copy mutable results (arrays and DataFrames) so cached results cannot be modified."""
+    return value.copy() if hasattr(value, "copy") else value
+
+
+def _get_nbytes(value):
+    """Estimate the memory used by a result in bytes."""
+    if hasattr(value, "memory_usage"):  # pandas DataFrame
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return int(getattr(value, "nbytes", 64))
+
+
+def _normalize(value):
+    """Normalize an argument to a hashable key; arrays are keyed by their contents."""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.lower()
+
+    array = np.asarray(value)
+    if array.dtype.kind in "biuf":
+        array = np.ascontiguousarray(array, dtype=float)
+        return "array", array.shape, hashlib.blake2b(array.tobytes(), digest_size=16).hexdigest()
+    if array.dtype.kind in "OUS" and array.ndim > 0:
+        return "array", array.shape, tuple(_normalize(v) for v in array.ravel().tolist())
+    raise TypeError(f"Cannot cache argument of type '{type(value).__name__}'.")
+
+
+def _get_reduced_checksum(style):
+    """Checksum of the active reduced set of coefficients, which can be replaced by the user."""
+    coeffs = _get_coefficients(style, "reduced")
+    checksum = hashlib.blake2b(str(coeffs.dtype).encode(), digest_size=16)
+    checksum.update(np.ascontiguousarray(coeffs).tobytes())
+    return checksum.hexdigest()
+
+
+def _make_key(name, signature, kwargs):
+    """
+    Create the cache key from the arguments, including the default values.
+
+    The 'reduced' coefficients are not read from the coefficient files, so their checksum is
+    included in the key.
+    """
+    bound = signature.bind(**kwargs)
+    bound.apply_defaults()
+    key = (name,) + tuple((k, _normalize(v)) for k, v in bound.arguments.items())
+    if str(bound.arguments.get("coefficient_type")).lower() == "reduced":
+        key += (("reduced", _get_reduced_checksum(bound.arguments["style"].lower())),)
+    return key
+
+
+def _cached(func):
+    """
+    Decorator to cache the results of a calculation function when the cache is enabled.
+
+    Arguments that cannot be normalized to a key (e.g., arbitrary objects) bypass the cache, and
+    the cache is bypassed while tracing is enabled so that every call is recorded. The magnitude
+    range is checked on cache hits so that they warn like the calculation; the note issued when
+    `override` is `True` is not repeated.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(**kwargs):
+        caches = [c for c in (_ACTIVE, _DISK) if c is not None]
+        if not caches or _tracing():
+            return func(**kwargs)
+
+        try:
+            key = _make_key(func.__name__, signature, kwargs)
+        except (TypeError, ValueError):
+            return func(**kwargs)
+
+        for i, cache in enumerate(caches):
+            result = cache.get(key)
+            if result is not None:
+                _check_magnitude_range(kwargs["magnitude"], kwargs["style"])
+                # Promote results from the on-disk cache to the in-memory cache
+                for faster in caches[:i]:
+                    faster.put(key, result)
+                return result
+
+        result = func(**kwargs)
+        for cache in caches:
+            cache.put(key, result)
+        return result
+
+    return wrapper
+
+
+def enable_cache(max_bytes=MAX_BYTES):
+    """
+    Enable the in-memory cache of the `calc_displ_site` and `calc_prob_exceed` results.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum memory in bytes used by the cached results. Default 64 MiB.
+
+    Returns
+    -------
+    ResultCache
+        The cache; use `ResultCache.info` for the hit-rate statistics.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        import kuehn_et_al_fdm as kea
+        from kuehn_et_al_fdm.cache import enable_cache
+
+        cache = enable_cache(max_bytes=16 * 1024**2)
+        for magnitude in [7, 7.5, 7, 7.5]:
+            kea.calc_prob_exceed(
+                magnitude=magnitude, location=0.3, style="normal", displacement_array=[0.1, 1]
+            )
+        print(cache.info())
+    """
+    global _ACTIVE
+    _ACTIVE = ResultCache(max_bytes)
+    return _ACTIVE
+
+
+def disable_cache():
+    """
+    Disable and clear the cache.
+
+    Returns
+    -------
+    ResultCache or None
+        The disabled cache (with its statistics), or None if the cache was not enabled.
+    """
+    global _ACTIVE
+    cache, _ACTIVE = _ACTIVE, None
+    if cache is not None:
+        with cache._lock:
+            cache._entries.clear()
+            cache.nbytes = 0
+    return cache
+
+
+def cache_info():
+    """Return the statistics of the enabled cache (see `ResultCache.info`), or None."""
+    return None if _ACTIVE is None else _ACTIVE.info()
+
+
+def enable_disk_cache(directory, max_bytes=MAX_DISK_BYTES):
+    """
+    Enable the on-disk cache of the `calc_displ_site` and `calc_prob_exceed` array results.
+
+    Results are looked up in the in-memory cache first (if enabled), then in the on-disk cache.
+    The cache directory can be shared by concurrent processes.
+
+    Parameters
+    ----------
+    directory : Union[str, pathlib.Path]
+        Cache directory; created if needed.
+
+    max_bytes : int, optional
+        Maximum total size in bytes of the cached files. Default 1 GiB.
+
+    Returns
+    -------
+    DiskCache
+        The cache; use `DiskCache.info` for the hit-rate statistics.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        import kuehn_et_al_fdm as kea
+        from kuehn_et_al_fdm.cache import enable_disk_cache
+
+        cache = enable_disk_cache(".kea_cache", max_bytes=256 * 1024**2)
+        kea.calc_prob_exceed(
+            magnitude=7, location=0.3, style="normal", displacement_array=[0.1, 1]
+        )
+        print(cache.info())
+    """
+    global _DISK
+    _DISK = DiskCache(directory, max_bytes)
+    return _DISK
+
+
+def disable_disk_cache():
+    """
+    Disable the on-disk cache; the cached files are kept.
+
+    Returns
+    -------
+    DiskCache or None
+        The disabled cache, or None if the cache was not enabled.
+    """
+    global _DISK
+    cache, _DISK = _DISK, None
+    return cache
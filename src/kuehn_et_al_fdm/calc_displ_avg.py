@@ -6,11 +6,12 @@ import warnings
 import numpy as np
 
 # Module imports
-from kuehn_et_al_fdm.calc_params import _calc_params
-from kuehn_et_al_fdm.transformation_functions import _calc_analytic_mean
+from kuehn_et_al_fdm.model import _get_model
+from kuehn_et_al_fdm.profiling import _profile_stage
 from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
 
 
+@_profile_stage()
 def calc_displ_avg(*, magnitude, style, coefficient_type="median"):
     """
     Calculate the median predicted average displacement in meters.
@@ -54,36 +55,24 @@ def calc_displ_avg(*, magnitude, style, coefficient_type="median"):
             " only 'mean' or 'median' is allowed."
         )
 
-    # Calculate statistical distribution parameter predictions
-    # Dense location spacing is used to create well-descritized profile for intergration
-    params = {"magnitude": magnitude, "style": style, "coefficient_type": coefficient_type}
-    locations = np.arange(0, 1.01, 0.01)
-    vectorized_param_calc = np.vectorize(_calc_params)
-
+    # Calculate area under the predicted mean slip profile; this is the Average Displacement (AD)
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
-        _, bc_param, mean, _, stdv_within, _ = vectorized_param_calc(
-            **params, location=locations, override=True
-        )
-        # override allows multiple scenarios; default is false to avoid mis-matched arrays
-
-    # Calculate predicted mean slip profile
-    # Use within-event variability only for median AD; see manucript for discussion
-    mean_displ_meters = _calc_analytic_mean(bc_param, mean, stdv_within)
+        return _get_model(style, coefficient_type).displ_avg(magnitude)
 
-    # Calculate area under the mean slip profile; this is the Average Displacement (AD)
-    return np.trapz(mean_displ_meters, locations)
 
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_displ_avg.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser)
+    _add_style(parser)
 
-# Create an ArgumentParser instance and add specific arguments to the parser
-parser = argparse.ArgumentParser(
-    description=calc_displ_avg.__doc__, formatter_class=argparse.RawTextHelpFormatter
-)
-_add_magnitude(parser)
-_add_style(parser)
+    return parser
 
 
-@_add_arguments(parser)
+@_add_arguments(_create_parser)
 def main(**kwargs):
 
     try:
@@ -6,10 +6,12 @@ import warnings
 import numpy as np
 
 # Module imports
-from kuehn_et_al_fdm.calc_displ_site import calc_displ_site
+from kuehn_et_al_fdm.model import _get_model
+from kuehn_et_al_fdm.profiling import _profile_stage
 from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
 
 
+@_profile_stage()
 def calc_displ_profile(
     *, magnitude, style, percentile, coefficient_type="median", folded=True, location_step=0.05
 ):
@@ -66,38 +68,29 @@ def calc_displ_profile(
             " only 'mean' or 'median' is allowed for the profile."
         )
 
-    locations = np.arange(0, 1 + location_step, location_step)
-    params = {
-        "magnitude": magnitude,
-        "location": locations,
-        "style": style,
-        "percentile": percentile,
-        "folded": folded,
-        "coefficient_type": coefficient_type,
-    }
-    vectorized_site_calc = np.vectorize(calc_displ_site)
-
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
-        displ_meters = vectorized_site_calc(**params, override=True)
-        # override allows multiple scenarios; default is false to avoid mis-matched arrays
+        return _get_model(style, coefficient_type).displ_profile(
+            magnitude, percentile, location_step=location_step, folded=folded
+        )
 
-    return locations, displ_meters
 
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_displ_profile.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser)
+    _add_style(parser)
+    _add_percentile(parser)
+    _add_coefficient_type(parser)
+    _add_folded_flag(parser)
+    _add_location_step(parser)
 
-# Create an ArgumentParser instance and add specific arguments to the parser
-parser = argparse.ArgumentParser(
-    description=calc_displ_profile.__doc__, formatter_class=argparse.RawTextHelpFormatter
-)
-_add_magnitude(parser)
-_add_style(parser)
-_add_percentile(parser)
-_add_coefficient_type(parser)
-_add_folded_flag(parser)
-_add_location_step(parser)
+    return parser
 
 
-@_add_arguments(parser)
+@_add_arguments(_create_parser)
 def main(**kwargs):
 
     try:
@@ -5,24 +5,44 @@ In other words, this module implements the model in a deterministic fault displa
 # Python imports
 import argparse
 import numpy as np
-import pandas as pd
 
 # Module imports
 from kuehn_et_al_fdm.calc_params import _calc_params
-from kuehn_et_al_fdm.transformation_functions import _calc_transformed_displ, _convert_bc_to_meters
+from kuehn_et_al_fdm.load_data import _get_weights
+from kuehn_et_al_fdm.transformation_functions import (
+    _calc_transformed_displ,
+    _calc_folded_transformed_displ,
+    _convert_bc_to_meters,
+)
+from kuehn_et_al_fdm.uncertainty_functions import (
+    EPISTEMIC_FRACTILES,
+    POINT_ESTIMATES,
+    _calc_epistemic_params,
+    _calc_fractile_transformed_displ,
+)
+from kuehn_et_al_fdm.cache import _cached
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm.results import CalculationResult
+from kuehn_et_al_fdm.trace import _record_trace, _tracing
 from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
 
 
+@_profile_stage()
+@_cached
 def calc_displ_site(
     *,
-    magnitude,
-    location,
-    style,
+    magnitude=None,
+    location=None,
+    style=None,
     percentile,
     coefficient_type="median",
+    epistemic_fractiles=None,
     folded=True,
+    exact_folded=False,
     debug=False,
     override=False,
+    params=None,
+    as_result=False,
 ):
     """
     Calculate the predicted displacement in meters. If displacement is less than 1 mm (0.001 m),
@@ -40,17 +60,34 @@ def calc_displ_site(
         Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
         'normal'.
 
-    percentile : int or float or numpy.ndarray with a single element
-        Aleatory quantile value. Use -1 for mean.
+    percentile : int or float or ArrayLike
+        Aleatory quantile value(s). Use -1 for mean. An array of percentiles (which can mix -1 for
+        the mean with regular quantiles) is computed from one set of distribution parameters.
 
     coefficient_type : str, optional
         Option to run model using full epistemic uncertainty or with point estimates (mean or
         median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
-        or 'full'. Default 'median'.
+        'full', 'reduced', 'parametric', or 'analytic'. The 'reduced' option uses a small weighted
+        set of representative posterior coefficients. The 'parametric' option uses the median
+        coefficients and the tabulated epistemic standard deviations of the mean and total standard
+        deviation to return epistemic fractiles instead of evaluating the full set of coefficients.
+        The 'analytic' option uses the mean coefficients and propagates the covariance of the
+        coefficients to the mean and total standard deviation with the delta method. Default
+        'median'.
+
+    epistemic_fractiles : ArrayLike, optional
+        Epistemic fractiles returned if `coefficient_type` is 'parametric' or 'analytic'. Default
+        (0.05, 0.16, 0.5, 0.84, 0.95).
 
     folded : boolean, optional
         Return displacement for the folded location. Default True.
 
+    exact_folded : boolean, optional
+        Option to calculate the folded displacement as the exact quantile of the 50/50 mixture of
+        the site and complementary distributions, which is consistent with the folded probability
+        of exceedance in `calc_prob_exceed`. If False, the folded displacement is the average of
+        the site and complementary displacements in transformed units. Default False.
+
     debug : boolean, optional
         Option to return DataFrame of internal calculations. Default False.
 
@@ -58,12 +95,29 @@ def calc_displ_site(
         Option to override single scenario limitation that is hard-coded. Not recommended for most
         users. Default False.
 
+    params : DistributionParams, optional
+        Distribution parameters from `_calc_params` (with ``as_object=True``), used in place of
+        `magnitude`, `location`, and `style` (and `override`). The coefficients must match
+        `coefficient_type`. Default None.
+
+    as_result : boolean, optional
+        Option to return a `CalculationResult` with the axes ('scenario', 'percentile', 'model')
+        for all coefficient types (and the internal calculations as additional variables if
+        `debug` is True). Default False.
+
     Returns
     -------
     If debug is False:
         displ_folded_meters : numpy.ndarray
             Displacement in meters for the folded location. The array contains a single element.
 
+        If `percentile` is an array, the displacements have shape (scenarios, percentiles) for
+        point estimates of the coefficients or (scenarios, percentiles, models) if
+        `coefficient_type` is 'full', 'reduced', 'parametric', or 'analytic'.
+
+        If `coefficient_type` is 'parametric' or 'analytic', the model axis contains the epistemic
+        fractiles and the debug `model_id` is the epistemic fractile.
+
     If debug is True:
         pd.DataFrame
             A DataFrame with the following columns:
@@ -84,13 +138,24 @@ def calc_displ_site(
             - **displ_site_meters**: Displacement in meters for the site location.
             - **displ_complement_meters**: Displacement in meters for the complementary location.
             - **displ_folded_meters**: Displacement in meters for the folded location.
+            - **weight**: Weight of the model coefficients (only if `coefficient_type` is 'full'
+              or 'reduced').
+
 
+    If as_result is True:
+        CalculationResult
+            Displacement in meters with the axes ('scenario', 'percentile', 'model').
 
     Raises
     ------
     RuntimeError
         If `debug` is `True` and `override` is also `True`. Debug mode is not available when
-        running multiple scenarios because the dataframe arrays are mismatched.
+        running multiple scenarios because the dataframe arrays are mismatched; use the
+        `kuehn_et_al_fdm.trace.trace` context manager to record the internal calculations for
+        multiple scenarios.
+
+    RuntimeError
+        If `debug` is `True` and `percentile` is an array.
 
     Examples
     --------
@@ -100,68 +165,289 @@ def calc_displ_site(
 
         $ kea-displ_site -m 7 -l 0.25 -s strike-slip -p 0.5 -ct full --debug
         $ kea-displ_site -m 7 -l 0.25 -s strike-slip -p 0.5 --unfolded
+        $ kea-displ_site -m 7 -l 0.25 -s strike-slip -p 0.84 --exact_folded
+        $ kea-displ_site -m 7 -l 0.25 -s strike-slip -p 0.84 -ct parametric
+        $ kea-displ_site -m 7 -l 0.25 -s strike-slip -p 0.84 -ct analytic
+        $ kea-displ_site -m 7 -l 0.25 -s strike-slip -p 0.84 -ct reduced --debug
     """
-    # Calculate statistical distribution parameter predictions
     coefficient_type = coefficient_type.lower()
-    params = {
-        "magnitude": magnitude,
-        "style": style,
-        "coefficient_type": coefficient_type,
-        "override": override,
-    }
-    model_id, bc_param, mean_site, stdv_site, _, _ = _calc_params(**params, location=location)
-    _, _, mean_complement, stdv_complement, _, _ = _calc_params(**params, location=1 - location)
+    epistemic = coefficient_type in POINT_ESTIMATES
+
+    # Use the scenarios of precalculated distribution parameters
+    if params is not None:
+        params._check_coefficient_type(POINT_ESTIMATES.get(coefficient_type, coefficient_type))
+        magnitude, location, style = params.magnitude, params.location, params.style
+        override = params.override
+    dist_params = params
+
+    # Multiple percentiles are calculated on a (scenarios, percentiles, models) grid
+    multiple_percentiles = np.ndim(percentile) > 0
+    if multiple_percentiles:
+        if debug:
+            raise RuntimeError(
+                "***Debug is not available for an array of percentiles. \n"
+                "   Try again with only one percentile. \n"
+            )
+    if multiple_percentiles or epistemic:
+        if override:
+            magnitude, location = np.broadcast_arrays(
+                np.atleast_1d(magnitude), np.atleast_1d(location)
+            )
+            magnitude, location = magnitude[:, np.newaxis], location[:, np.newaxis]
+
+    # Calculate statistical distribution parameter predictions
+    if dist_params is None:
+        params = {
+            "magnitude": magnitude,
+            "style": style,
+            "coefficient_type": POINT_ESTIMATES.get(coefficient_type, coefficient_type),
+            "override": override,
+        }
+        model_id, bc_param, mean_site, stdv_site, _, _ = _calc_params(**params, location=location)
+        _, _, mean_complement, stdv_complement, _, _ = _calc_params(
+            **params, location=1 - location
+        )
+    else:
+        scenario_axis = override and (multiple_percentiles or epistemic)
+        (
+            model_id,
+            bc_param,
+            mean_site,
+            stdv_site,
+            mean_complement,
+            stdv_complement,
+        ) = dist_params._get_arrays(scenario_axis)
+
+    if multiple_percentiles:
+        arrays = [mean_site, stdv_site, mean_complement, stdv_complement]
+        reshaped_arrays = [np.atleast_2d(arr)[:, np.newaxis, :] for arr in arrays]
+        mean_site, stdv_site, mean_complement, stdv_complement = reshaped_arrays
+        percentile = np.asarray(percentile, dtype=float)[:, np.newaxis]
+        del arrays, reshaped_arrays
 
     # Calculate transformed displacement
     Y_site = _calc_transformed_displ(bc_param, mean_site, stdv_site, percentile)
     Y_complement = _calc_transformed_displ(bc_param, mean_complement, stdv_complement, percentile)
-    Y_folded = np.mean([Y_site, Y_complement], axis=0)
+    if exact_folded:
+        Y_folded = _calc_folded_transformed_displ(
+            bc_param, mean_site, stdv_site, mean_complement, stdv_complement, percentile
+        )
+    else:
+        Y_folded = np.mean([Y_site, Y_complement], axis=0)
+
+    # Use the epistemic uncertainties of the mean and total standard deviation
+    if epistemic:
+        fractiles = np.asarray(
+            EPISTEMIC_FRACTILES if epistemic_fractiles is None else epistemic_fractiles,
+            dtype=float,
+        )
+        model_id = fractiles
+        epistemic_params = {"style": style, "coefficient_type": coefficient_type}
+        sd_med_site, sd_sigma_site, corr_site = _calc_epistemic_params(
+            magnitude, location, **epistemic_params
+        )
+        sd_med_complement, sd_sigma_complement, corr_complement = _calc_epistemic_params(
+            magnitude, 1 - location, **epistemic_params
+        )
+        if multiple_percentiles:
+            arrays = [
+                sd_med_site,
+                sd_sigma_site,
+                corr_site,
+                sd_med_complement,
+                sd_sigma_complement,
+                corr_complement,
+            ]
+            reshaped_arrays = [np.atleast_2d(arr)[:, np.newaxis, :] for arr in arrays]
+            (
+                sd_med_site,
+                sd_sigma_site,
+                corr_site,
+                sd_med_complement,
+                sd_sigma_complement,
+                corr_complement,
+            ) = reshaped_arrays
+            del arrays, reshaped_arrays
+
+        # Shift the point-estimate displacements to the epistemic fractiles
+        Y_site = _calc_fractile_transformed_displ(
+            Y_site, sd_med_site, sd_sigma_site, percentile, fractiles, corr_site
+        )
+        Y_complement = _calc_fractile_transformed_displ(
+            Y_complement,
+            sd_med_complement,
+            sd_sigma_complement,
+            percentile,
+            fractiles,
+            corr_complement,
+        )
+        Y_folded = _calc_fractile_transformed_displ(
+            Y_folded,
+            0.5 * (sd_med_site + sd_med_complement),
+            0.5 * (sd_sigma_site + sd_sigma_complement),
+            percentile,
+            fractiles,
+            0.5 * (corr_site + corr_complement),
+        )
 
     # Back-transform displacement to meters
     displ_site_meters = _convert_bc_to_meters(Y_site, bc_param)
     displ_complement_meters = _convert_bc_to_meters(Y_complement, bc_param)  # noqa: F841
     displ_folded_meters = _convert_bc_to_meters(Y_folded, bc_param)
 
+    # Record the internal calculations on a (scenarios, percentiles, models) grid
+    if _tracing():
+        n_scenarios = np.broadcast(magnitude, location).size if override else 1
+        scenario_vector = override and not (multiple_percentiles or epistemic)
+
+        def _align(arr):
+            arr = np.asarray(arr)
+            if arr.ndim == 2:
+                return arr[:, np.newaxis, :]
+            if arr.ndim < 2 and scenario_vector:
+                return np.reshape(arr, (-1, 1, 1))
+            return arr
+
+        _record_trace(
+            "calc_displ_site",
+            (n_scenarios, np.size(percentile), np.size(model_id)),
+            {"percentile": np.ravel(percentile)[:, np.newaxis], "model_id": np.ravel(model_id)},
+            magnitude=np.reshape(magnitude, (-1, 1, 1)),
+            location=np.reshape(location, (-1, 1, 1)),
+            style=style,
+            bc_param=np.ravel(bc_param),
+            **{
+                k: _align(v)
+                for k, v in {
+                    "mean_site": mean_site,
+                    "stdv_site": stdv_site,
+                    "mean_complement": mean_complement,
+                    "stdv_complement": stdv_complement,
+                    "Y_site": Y_site,
+                    "Y_complement": Y_complement,
+                    "Y_folded": Y_folded,
+                    "displ_site_meters": displ_site_meters,
+                    "displ_complement_meters": displ_complement_meters,
+                    "displ_folded_meters": displ_folded_meters,
+                }.items()
+            },
+        )
+
+    if as_result and not (debug and override):
+        n_scenarios = np.broadcast(magnitude, location).size if override else 1
+        shape = (n_scenarios, np.size(percentile), np.size(model_id))
+        name = "displ_folded_meters" if folded else "displ_site_meters"
+        data = {name: displ_folded_meters if folded else displ_site_meters}
+        if debug:
+            data.update(
+                {
+                    "mean_site": mean_site,
+                    "stdv_site": stdv_site,
+                    "mean_complement": mean_complement,
+                    "stdv_complement": stdv_complement,
+                    "Y_site": Y_site,
+                    "Y_complement": Y_complement,
+                    "Y_folded": Y_folded,
+                    "displ_site_meters": displ_site_meters,
+                    "displ_complement_meters": displ_complement_meters,
+                    "displ_folded_meters": displ_folded_meters,
+                }
+            )
+        # Variables without a model axis are repeated for each model
+        dims = ("scenario", "percentile", "model")
+        data = {
+            k: (dims, np.broadcast_to(np.reshape(v, shape[:2] + (-1,)), shape).copy())
+            for k, v in data.items()
+        }
+        if coefficient_type in ["full", "reduced"]:
+            data["weight"] = (("model",), _get_weights(style.lower(), coefficient_type))
+        coords = {"percentile": np.ravel(percentile), "model": np.ravel(model_id)}
+        return CalculationResult(name, data, coords)
+
     if debug:
         if override:
             raise RuntimeError(
                 "***Debug is not available when `override=True`. \n"
                 "   This is because the dataframe arrays are mismatched. \n"
-                "   Try again with only one scenario. \n"
+                "   Try again with only one scenario, or use `kuehn_et_al_fdm.trace.trace` to \n"
+                "   record the internal calculations for multiple scenarios. \n"
             )
             # TODO: vectorize / organize
         else:
             result = {
                 k: v
                 for k, v in locals().items()
-                if k not in ["coefficient_type", "folded", "debug", "override", "params", "_"]
+                if k
+                not in [
+                    "coefficient_type",
+                    "epistemic_fractiles",
+                    "folded",
+                    "exact_folded",
+                    "multiple_percentiles",
+                    "epistemic",
+                    "epistemic_params",
+                    "fractiles",
+                    "debug",
+                    "override",
+                    "params",
+                    "dist_params",
+                    "scenario_axis",
+                    "as_result",
+                    "n_scenarios",
+                    "scenario_vector",
+                    "_align",
+                    "_",
+                ]
             }
-            return pd.DataFrame.from_dict(result)
-    else:
-        return displ_folded_meters if folded else displ_site_meters
-
-
-# Create an ArgumentParser instance and add specific arguments to the parser
-parser = argparse.ArgumentParser(
-    description=calc_displ_site.__doc__, formatter_class=argparse.RawTextHelpFormatter
-)
-_add_magnitude(parser)
-_add_location(parser)
-_add_style(parser)
-_add_percentile(parser)
-_add_coefficient_type(parser)
-_add_folded_flag(parser)
-_add_debug_flag(parser)
+            # Include the weights of the model coefficients
+            if coefficient_type in ["full", "reduced"]:
+                result["weight"] = _get_weights(style.lower(), coefficient_type)
 
+            # Expand the median-model parameters to the epistemic fractiles
+            result = {
+                k: np.broadcast_to(v, np.shape(model_id)) if np.ndim(v) > 0 else v
+                for k, v in result.items()
+            }
+            import pandas as pd
 
-@_add_arguments(parser)
+            return pd.DataFrame.from_dict(result)
+    else:
+        result = displ_folded_meters if folded else displ_site_meters
+        if multiple_percentiles and coefficient_type not in [
+            "full",
+            "reduced",
+            "parametric",
+            "analytic",
+        ]:
+            return result[..., 0]
+        return result
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_displ_site.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser)
+    _add_location(parser)
+    _add_style(parser)
+    _add_percentile(parser)
+    _add_coefficient_type(parser)
+    _add_folded_flag(parser)
+    _add_exact_folded_flag(parser)
+    _add_debug_flag(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
 def main(**kwargs):
 
     try:
         result = calc_displ_site(**kwargs)
 
         if kwargs.get("debug", True):
-            print(result)
+            _print_result(result)
         else:
             print(
                 f"     Displacement for magnitude {kwargs.get('magnitude')}, "
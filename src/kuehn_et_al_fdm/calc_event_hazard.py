@@ -0,0 +1,290 @@
+"""This module calculates the annual rate of exceedance at sites from a stochastic catalog of
+ruptures. In other words, this module implements an event-based (Monte Carlo) probabilistic fault
+displacement hazard analysis, which can be used to check the hazard integral.
+"""
+
+# Python imports
+import argparse
+import numpy as np
+
+# Module imports
+from kuehn_et_al_fdm.calc_params import _calc_batched_params
+from kuehn_et_al_fdm.load_data import _get_weights
+from kuehn_et_al_fdm.simulate_displ import _get_substream_generator
+from kuehn_et_al_fdm.transformation_functions import _convert_bc_to_meters
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
+
+
+@_profile_stage()
+def _calc_scenario_params(magnitude, location, style, coefficient_type):
+    """
+    Calculate the distribution parameters for all scenario/site pairs at the site and
+    complementary locations.
+
+    Parameters
+    ----------
+    magnitude : numpy.ndarray
+        Earthquake moment magnitude with shape (scenarios,).
+
+    location : numpy.ndarray
+        Normalized location along rupture length with shape (scenarios, sites).
+
+    style : str
+        Style of faulting (case-insensitive).
+
+    coefficient_type : str
+        Model coefficients. Valid options are 'mean', 'median', 'full', or 'reduced'.
+
+    Returns
+    -------
+    tuple
+        - 'bc_param': Box-Cox transformation parameter with shape (models,).
+        - 'site': Mean displacement, within-event standard deviation, and between-event standard
+          deviation in transformed units for the site location, each with shape (scenarios,
+          sites, models).
+        - 'complement': Same as above for the complementary location.
+    """
+    site, complement = _calc_batched_params(
+        magnitude=magnitude[:, np.newaxis, np.newaxis],
+        location=location[..., np.newaxis],
+        style=style,
+        coefficient_type=coefficient_type,
+    )
+    bc_param = site[1]
+
+    shape = location.shape + (np.size(bc_param),)
+    site, complement = [
+        [np.broadcast_to(arr, shape) for arr in (params[2], params[4], params[5])]
+        for params in (site, complement)
+    ]
+
+    return np.atleast_1d(bc_param), site, complement
+
+
+def _accumulate_counts(counts, displ_meters, displacement_array):
+    """
+    Add the simulated displacements to the per-site histogram counters in place.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        Histogram counters with shape (sites, displacements + 1). Bin `i` counts the displacements
+        greater than `displacement_array[i - 1]` and less than or equal to `displacement_array[i]`.
+
+    displ_meters : numpy.ndarray
+        Simulated displacements in meters with shape (events, sites).
+
+    displacement_array : numpy.ndarray
+        Sorted test values of displacement in meters.
+    """
+    n_sites, n_bins = counts.shape
+    bins = np.searchsorted(displacement_array, displ_meters, side="left")
+    index = bins + n_bins * np.arange(n_sites)
+    counts += np.bincount(index.ravel(), minlength=counts.size).reshape(counts.shape)
+
+
+@_profile_stage()
+def calc_event_hazard(
+    *,
+    magnitude,
+    location_array,
+    style,
+    rate,
+    displacement_array,
+    n_events=1_000_000,
+    chunk_size=100_000,
+    coefficient_type="median",
+    folded=True,
+    seed=0,
+):
+    """
+    Calculate the annual rate of exceedance at sites with an event-based (Monte Carlo) approach.
+
+    A stochastic catalog of `n_events` ruptures is sampled from the rupture scenarios in
+    proportion to their annual rates, and one set of model coefficients is sampled for each event
+    in proportion to its weight. For each event, one between-event term is shared by all sites
+    and within-event terms are drawn independently at each site. For the folded location, each
+    event is assigned to the site or complementary location with equal probability (the same for
+    all sites). The events are processed in chunks and added to per-site histogram counters, so
+    the memory use does not depend on `n_events`.
+
+    Parameters
+    ----------
+    magnitude : int or float or ArrayLike
+        Earthquake moment magnitude for each rupture scenario.
+
+    location_array : ArrayLike
+        Normalized location along rupture length, range [0, 1.0], of each site for each rupture
+        scenario. The shape is (scenarios,) for a single site or (scenarios, sites).
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    rate : int or float or ArrayLike
+        Annual rate of each rupture scenario.
+
+    displacement_array : ArrayLike
+        Test values of displacement in meters.
+
+    n_events : int, optional
+        Number of events in the stochastic catalog. Default 1,000,000.
+
+    chunk_size : int, optional
+        Number of events simulated at once. Default 100,000.
+
+    coefficient_type : str, optional
+        Option to run model using full epistemic uncertainty or with point estimates (mean or
+        median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
+        'full', or 'reduced'. For the 'full' and 'reduced' options, the result is the
+        weighted-mean hazard. Default 'median'.
+
+    folded : boolean, optional
+        Return results for the folded location. Default True.
+
+    seed : int, optional
+        Seed for the random number generator. Each chunk uses an independent substream, so
+        results are reproducible for the same `seed` and `chunk_size`. Default 0.
+
+    Returns
+    -------
+    pd.DataFrame
+        A DataFrame with the following columns:
+
+        - **site**: Site index.
+        - **displ_meters**: Test values of displacement in meters.
+        - **n_exceed**: Number of simulated events that exceed the displacement.
+        - **rate_exceed**: Annual rate of exceedance.
+        - **std_error**: Monte Carlo standard error of the annual rate of exceedance.
+
+    Raises
+    ------
+    ValueError
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
+
+    ValueError
+        If `location_array` is not within range [0, 1].
+
+    ValueError
+        If `rate` is negative or does not have one value for each rupture scenario, or if all
+        rates are zero.
+
+    Warns
+    -----
+    UserWarning
+        If `magnitude` is not within the recommended range for that style.
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ kea-event_hazard -m 6.5 7 7.5 -l 0.2 0.3 0.1 -r 1e-3 5e-4 1e-4 -s normal -d 0.1 1 3
+        $ kea-event_hazard -m 7 -l 0.5 -r 1e-3 -s reverse -d 0.1 1 -ne 100000 -ct full
+    """
+    style = style.lower()
+    coefficient_type = coefficient_type.lower()
+
+    magnitude = np.atleast_1d(np.asarray(magnitude, dtype=float))
+    location_array = np.asarray(location_array, dtype=float).reshape(len(magnitude), -1)
+    rate = np.atleast_1d(np.asarray(rate, dtype=float))
+    displacement_array = np.sort(np.atleast_1d(np.asarray(displacement_array, dtype=float)))
+
+    if rate.shape != magnitude.shape or np.any(rate < 0) or not np.any(rate > 0):
+        raise ValueError(
+            "'rate' must have one non-negative value for each rupture scenario, with at least one"
+            " positive value."
+        )
+
+    # Calculate statistical distribution parameter predictions for all scenarios and sites
+    bc_param, site, complement = _calc_scenario_params(
+        magnitude, location_array, style, coefficient_type
+    )
+    mean_site, stdv_within_site, stdv_between_site = site
+    mean_complement, stdv_within_complement, stdv_between_complement = complement
+
+    total_rate = rate.sum()
+    scenario_prob = rate / total_rate
+    model_prob = _get_weights(style, coefficient_type)
+    n_sites = location_array.shape[1]
+    counts = np.zeros((n_sites, len(displacement_array) + 1), dtype=np.int64)
+
+    # Stream through the stochastic catalog in chunks
+    for chunk, start in enumerate(range(0, n_events, chunk_size)):
+        n = min(chunk_size, n_events - start)
+        rng = _get_substream_generator(seed, chunk)
+
+        scenario = rng.choice(len(rate), size=n, p=scenario_prob)
+        model = rng.choice(len(bc_param), size=n, p=model_prob)
+        complement = (rng.random(n) < 0.5) if folded else np.zeros(n, dtype=bool)
+        between = rng.standard_normal((n, 1))
+        within = rng.standard_normal((n, n_sites))
+
+        index = (scenario, slice(None), model)
+        flip = complement[:, np.newaxis]
+        mean = np.where(flip, mean_complement[index], mean_site[index])
+        stdv_within = np.where(flip, stdv_within_complement[index], stdv_within_site[index])
+        stdv_between = np.where(flip, stdv_between_complement[index], stdv_between_site[index])
+
+        Y = mean + stdv_between * between + stdv_within * within
+        displ_meters = _convert_bc_to_meters(Y, bc_param[model][:, np.newaxis])
+        _accumulate_counts(counts, displ_meters, displacement_array)
+
+    # Exceedance counts are the reverse cumulative sums of the histogram counters
+    n_exceed = np.cumsum(counts[:, ::-1], axis=1)[:, ::-1][:, 1:]
+    prob = n_exceed / n_events
+    rate_exceed = total_rate * prob
+    std_error = total_rate * np.sqrt(prob * (1 - prob) / n_events)
+
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "site": np.repeat(np.arange(n_sites), len(displacement_array)),
+            "displ_meters": np.tile(displacement_array, n_sites),
+            "n_exceed": n_exceed.ravel(),
+            "rate_exceed": rate_exceed.ravel(),
+            "std_error": std_error.ravel(),
+        }
+    )
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_event_hazard.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser, nargs="+")
+    _add_location(parser, nargs="+")
+    _add_style(parser)
+    _add_rate(parser)
+    _add_displacement(parser)
+    _add_n_events(parser)
+    _add_chunk_size(parser)
+    _add_coefficient_type(parser)
+    _add_folded_flag(parser)
+    _add_seed(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
+def main(**kwargs):
+
+    try:
+        result = calc_event_hazard(**kwargs)
+
+        print(
+            f"     Annual rate of exceedance for magnitudes {kwargs.get('magnitude')}, "
+            f"locations {kwargs.get('location_array')}, {kwargs.get('style')} faulting:"
+        )
+        _print_result(result)
+
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""This module calculates the probability of exceedance at a site on a fault for magnitudes that are
+modeled as ruptures floating along the fault. Each rupture position gives the site a different
+normalized location along rupture length.
+"""
+
+# Python imports
+import argparse
+import numpy as np
+
+# Module imports
+from kuehn_et_al_fdm.calc_hazard import _calc_scenario_prob_exceed
+from kuehn_et_al_fdm.load_data import _get_weights
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
+
+# Surface rupture length relations, log10(length in km) = a + b * magnitude, from Wells and
+# Coppersmith (1994)
+RUPTURE_LENGTH_COEFFICIENTS = {
+    "strike-slip": (-3.55, 0.74),
+    "reverse": (-2.86, 0.63),
+    "normal": (-2.01, 0.50),
+}
+
+
+def _calc_rupture_length(magnitude, style):
+    """Calculate the median surface rupture length in km from Wells and Coppersmith (1994)."""
+    a, b = RUPTURE_LENGTH_COEFFICIENTS[style.lower()]
+    return np.power(10, a + b * np.asarray(magnitude, dtype=float))
+
+
+@_profile_stage()
+def enumerate_floating_ruptures(
+    *, magnitude, fault_length, site_position, style, position_step=1.0, length_relation=None
+):
+    """
+    Enumerate the floating rupture positions along a fault that include the site.
+
+    For each magnitude, the rupture start positions are 0, `position_step`, ..., up to the fault
+    length minus the rupture length (ruptures longer than the fault are truncated to the fault
+    length), and each position is equally likely. Positions that do not include the site are
+    pruned analytically, so the weights sum to the probability that the rupture includes the site.
+
+    Parameters
+    ----------
+    magnitude : int or float or ArrayLike
+        Earthquake moment magnitude.
+
+    fault_length : float
+        Fault length in km.
+
+    site_position : float
+        Distance along the fault from the fault end to the site in km, range [0, fault_length].
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    position_step : float, optional
+        Spacing of the rupture start positions in km. Default 1.0.
+
+    length_relation : callable, optional
+        Function that returns the rupture length in km for an array of magnitudes. Default is the
+        Wells and Coppersmith (1994) surface rupture length relation for the style of faulting.
+
+    Returns
+    -------
+    tuple
+        - 'magnitude_index': Index into `magnitude` for each rupture position.
+        - 'location': Normalized location of the site along the rupture length.
+        - 'weight': Probability of each rupture position given the magnitude.
+
+    Raises
+    ------
+    ValueError
+        If `site_position` is not within range [0, fault_length] or `position_step` is not
+        positive.
+    """
+    magnitude = np.atleast_1d(np.asarray(magnitude, dtype=float))
+    if not 0 <= site_position <= fault_length:
+        raise ValueError(f"'site_position' must be within range [0, {fault_length}].")
+    if position_step <= 0:
+        raise ValueError("'position_step' must be positive.")
+
+    if length_relation is None:
+        rupture_length = _calc_rupture_length(magnitude, style)
+    else:
+        rupture_length = np.asarray(length_relation(magnitude), dtype=float)
+    rupture_length = np.minimum(rupture_length, fault_length)
+
+    # Start positions k * step for k in [0, n_positions), and those that include the site
+    n_positions = np.floor((fault_length - rupture_length) / position_step + 1e-9).astype(int) + 1
+    k_min = np.maximum(np.ceil((site_position - rupture_length) / position_step - 1e-9), 0)
+    k_max = np.minimum(np.floor(site_position / position_step + 1e-9), n_positions - 1)
+    n_included = np.maximum(k_max - k_min + 1, 0).astype(int)
+
+    # Ragged enumeration of the included positions
+    magnitude_index = np.repeat(np.arange(len(magnitude)), n_included)
+    offset = np.arange(n_included.sum()) - np.repeat(
+        np.cumsum(n_included) - n_included, n_included
+    )
+    start = (k_min[magnitude_index] + offset) * position_step
+
+    length = rupture_length[magnitude_index]
+    location = np.clip((site_position - start) / length, 0, 1)
+    weight = 1 / n_positions[magnitude_index]
+
+    return magnitude_index, location, weight
+
+
+@_profile_stage()
+def calc_floating_prob_exceed(
+    *,
+    magnitude,
+    fault_length,
+    site_position,
+    style,
+    displacement_array,
+    position_step=1.0,
+    length_relation=None,
+    coefficient_type="median",
+    folded=True,
+):
+    """
+    Calculate the probability of exceedance at a site for ruptures floating along a fault.
+
+    The probability of exceedance for each magnitude is the weighted sum over the rupture
+    positions that include the site (see `enumerate_floating_ruptures`); all positions and
+    magnitudes are evaluated in one broadcasted calculation.
+
+    Parameters
+    ----------
+    magnitude : int or float or ArrayLike
+        Earthquake moment magnitude.
+
+    fault_length : float
+        Fault length in km.
+
+    site_position : float
+        Distance along the fault from the fault end to the site in km, range [0, fault_length].
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    displacement_array : ArrayLike
+        Test values of displacement in meters.
+
+    position_step : float, optional
+        Spacing of the rupture start positions in km. Default 1.0.
+
+    length_relation : callable, optional
+        Function that returns the rupture length in km for an array of magnitudes. Default is the
+        Wells and Coppersmith (1994) surface rupture length relation for the style of faulting.
+
+    coefficient_type : str, optional
+        Option to run model using full epistemic uncertainty or with point estimates (mean or
+        median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
+        'full', or 'reduced'. For the 'full' and 'reduced' options, the result is the weighted
+        mean. Default 'median'.
+
+    folded : boolean, optional
+        Return probability of exceedance for the folded location. Default True.
+
+    Returns
+    -------
+    numpy.ndarray
+        Probability of exceedance with shape (magnitudes, displacements), which includes the
+        probability that the rupture includes the site.
+
+    Raises
+    ------
+    ValueError
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
+
+    ValueError
+        If `site_position` is not within range [0, fault_length] or `position_step` is not
+        positive.
+
+    Warns
+    -----
+    UserWarning
+        If `magnitude` is not within the recommended range for that style.
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ kea-floating_prob_exceed -m 6.5 7 7.5 -fl 100 -x 30 -s strike-slip -d 0.1 1 3
+        $ kea-floating_prob_exceed -m 7 -fl 60 -x 5 -s normal -d 0.1 1 -ps 0.5 -ct full
+    """
+    style = style.lower()
+    coefficient_type = coefficient_type.lower()
+    magnitude = np.atleast_1d(np.asarray(magnitude, dtype=float))
+    displacement_array = np.atleast_1d(np.asarray(displacement_array, dtype=float))
+
+    magnitude_index, location, weight = enumerate_floating_ruptures(
+        magnitude=magnitude,
+        fault_length=fault_length,
+        site_position=site_position,
+        style=style,
+        position_step=position_step,
+        length_relation=length_relation,
+    )
+
+    # Probabilities with shape (positions, models, displacements) in one broadcasted call
+    probex = _calc_scenario_prob_exceed(
+        magnitude[magnitude_index], location, style, displacement_array, coefficient_type, folded
+    )
+    probex = np.tensordot(probex, _get_weights(style, coefficient_type), axes=([1], [0]))
+
+    result = np.zeros((len(magnitude), len(displacement_array)))
+    np.add.at(result, magnitude_index, weight[:, np.newaxis] * probex)
+
+    return result
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_floating_prob_exceed.__doc__,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    _add_magnitude(parser, nargs="+")
+    _add_fault_length(parser)
+    _add_site_position(parser)
+    _add_style(parser)
+    _add_displacement(parser)
+    _add_position_step(parser)
+    _add_coefficient_type(parser)
+    _add_folded_flag(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
+def main(**kwargs):
+
+    try:
+        result = calc_floating_prob_exceed(**kwargs)
+
+        print(
+            f"     Probability of exceedance for magnitudes {kwargs.get('magnitude')}, "
+            f"fault length {kwargs.get('fault_length')} km, site position "
+            f"{kwargs.get('site_position')} km, {kwargs.get('style')} faulting:"
+        )
+        print("    ", np.array2string(result, formatter={"float_kind": lambda x: f"{x:.4e}"}))
+
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""This module calculates the annual rate of exceedance at a site from a set of rupture scenarios
+(i.e., the hazard integral in a probabilistic fault displacement hazard analysis), with optional
+disaggregation by magnitude, folded location, style, and model coefficients.
+"""
+
+# Python imports
+import argparse
+import numpy as np
+from scipy import special
+
+# Module imports
+from kuehn_et_al_fdm.calc_params import _calc_batched_params
+from kuehn_et_al_fdm.load_data import _get_coefficients, _get_weights
+from kuehn_et_al_fdm.model import _get_model
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
+
+# Default disaggregation bin widths
+MAGNITUDE_BIN_WIDTH = 0.25
+LOCATION_BIN_EDGES = (0, 0.1, 0.2, 0.3, 0.4, 0.5)
+
+
+def _calc_bin_index(values, edges):
+    """Return the bin index for each value; values outside the edges go to the end bins."""
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+
+
+@_profile_stage()
+def _calc_scenario_prob_exceed(
+    magnitude, location, style, displacement_array, coefficient_type, folded
+):
+    """
+    Calculate the probability of exceedance for a set of scenarios with one style of faulting.
+
+    Parameters
+    ----------
+    magnitude : numpy.ndarray
+        Earthquake moment magnitude with shape (scenarios,).
+
+    location : numpy.ndarray
+        Normalized location along rupture length with shape (scenarios,).
+
+    style : str
+        Style of faulting (case-insensitive).
+
+    displacement_array : numpy.ndarray
+        Test values of displacement in meters.
+
+    coefficient_type : str
+        Model coefficients. Valid options are 'mean', 'median', 'full', or 'reduced'.
+
+    folded : boolean
+        Return probability of exceedance for the folded location.
+
+    Returns
+    -------
+    numpy.ndarray
+        Probability of exceedance with shape (scenarios, models, displacements).
+    """
+    # Use the compiled kernels if available
+    if isinstance(style, str):
+        model = _get_model(style, coefficient_type)
+        probex = model._compiled_prob_exceed(magnitude, location, displacement_array, folded)
+        if probex is not None:
+            return probex
+
+    site, complement = _calc_batched_params(
+        magnitude=magnitude[:, np.newaxis],
+        location=location[:, np.newaxis],
+        style=style,
+        coefficient_type=coefficient_type,
+    )
+    _, bc_param, mean_site, stdv_site, _, _ = site
+    _, _, mean_complement, stdv_complement, _, _ = complement
+
+    bc_param = np.asarray(bc_param)[:, np.newaxis]
+    transformed_displ = (displacement_array**bc_param - 1) / bc_param
+
+    probex = special.ndtr(
+        (mean_site[..., np.newaxis] - transformed_displ) / stdv_site[..., np.newaxis]
+    )
+    if folded:
+        probex_complement = special.ndtr(
+            (mean_complement[..., np.newaxis] - transformed_displ)
+            / stdv_complement[..., np.newaxis]
+        )
+        probex = 0.5 * (probex + probex_complement)
+
+    return probex
+
+
+@_profile_stage()
+def calc_hazard(
+    *,
+    magnitude,
+    location_array,
+    style,
+    rate,
+    displacement_array,
+    coefficient_type="median",
+    folded=True,
+    disaggregation=False,
+    magnitude_bins=None,
+    location_bins=None,
+):
+    """
+    Calculate the annual rate of exceedance at a site by summing the rate-weighted probabilities
+    of exceedance over rupture scenarios (and the weighted model coefficients).
+
+    If `disaggregation` is True, the rate contributions that make up the hazard curve are also
+    accumulated into bins of magnitude, folded location, and style of faulting, and into bins of
+    style of faulting and model coefficients, in the same vectorized pass.
+
+    Parameters
+    ----------
+    magnitude : int or float or ArrayLike
+        Earthquake moment magnitude for each rupture scenario.
+
+    location_array : int or float or ArrayLike
+        Normalized location along rupture length of the site for each rupture scenario, range
+        [0, 1.0].
+
+    style : str or ArrayLike
+        Style of faulting (case-insensitive) for all or each rupture scenario. Valid options are
+        'strike-slip', 'reverse', or 'normal'.
+
+    rate : int or float or ArrayLike
+        Annual rate of each rupture scenario.
+
+    displacement_array : ArrayLike
+        Test values of displacement in meters.
+
+    coefficient_type : str, optional
+        Option to run model using full epistemic uncertainty or with point estimates (mean or
+        median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
+        'full', or 'reduced'. For the 'full' and 'reduced' options, the hazard is the
+        weighted-mean hazard. Default 'median'.
+
+    folded : boolean, optional
+        Return results for the folded location. Default True.
+
+    disaggregation : boolean, optional
+        Option to also return the disaggregation bins. Default False.
+
+    magnitude_bins : ArrayLike, optional
+        Magnitude bin edges. Default is 0.25-unit bins that cover the scenario magnitudes.
+
+    location_bins : ArrayLike, optional
+        Folded location bin edges, range [0, 0.5]. Default (0, 0.1, 0.2, 0.3, 0.4, 0.5).
+
+    Returns
+    -------
+    If disaggregation is False:
+        numpy.ndarray
+            Annual rate of exceedance for each test value of displacement.
+
+    If disaggregation is True:
+        tuple
+            - 'hazard': Annual rate of exceedance for each test value of displacement.
+            - 'disaggregation': dict with the following keys, where the rate contributions sum to
+              the hazard (divide by the hazard for the fractional contributions):
+
+              - **magnitude_bins**: Magnitude bin edges.
+              - **location_bins**: Folded location bin edges.
+              - **styles**: Styles of faulting.
+              - **model_id**: Model coefficient row numbers for each style.
+              - **magnitude_location_style**: Rate contributions with shape (magnitude bins,
+                location bins, styles, displacements).
+              - **style_model**: Rate contributions with shape (styles, models, displacements);
+                models beyond the number of rows for a style are zero.
+
+    Raises
+    ------
+    ValueError
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
+
+    ValueError
+        If `location_array` is not within range [0, 1].
+
+    ValueError
+        If `rate` is negative.
+
+    Warns
+    -----
+    UserWarning
+        If `magnitude` is not within the recommended range for that style.
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ kea-hazard -m 6.5 7 7.5 -l 0.2 0.3 0.1 -r 1e-3 5e-4 1e-4 -s normal -d 0.1 1 3
+        $ kea-hazard -m 6.5 7 7.5 -l 0.2 0.3 0.1 -r 1e-3 5e-4 1e-4 -s normal -d 0.1 1 -ct full
+    """
+    coefficient_type = coefficient_type.lower()
+
+    magnitude, location, rate, style = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(magnitude, dtype=float)),
+        np.asarray(location_array, dtype=float),
+        np.asarray(rate, dtype=float),
+        np.char.lower(np.asarray(style, dtype=str)),
+    )
+    displacement_array = np.atleast_1d(np.asarray(displacement_array, dtype=float))
+
+    if np.any(rate < 0):
+        raise ValueError("'rate' must be non-negative.")
+
+    styles = [str(s) for s in np.unique(style)]
+    weights = {s: _get_weights(s, coefficient_type) for s in styles}
+    hazard = np.zeros(len(displacement_array))
+
+    if disaggregation:
+        if magnitude_bins is None:
+            low = np.floor(magnitude.min() / MAGNITUDE_BIN_WIDTH)
+            high = np.floor(magnitude.max() / MAGNITUDE_BIN_WIDTH) + 1
+            magnitude_bins = np.arange(low, high + 1) * MAGNITUDE_BIN_WIDTH
+        magnitude_bins = np.asarray(magnitude_bins, dtype=float)
+        location_bins = np.asarray(
+            LOCATION_BIN_EDGES if location_bins is None else location_bins, dtype=float
+        )
+        n_models = max(len(w) for w in weights.values())
+        shape = (len(magnitude_bins) - 1, len(location_bins) - 1, len(styles))
+        magnitude_location_style = np.zeros(shape + (len(displacement_array),))
+        style_model = np.zeros((len(styles), n_models, len(displacement_array)))
+
+        # Scenario bins are shared by all displacements and models
+        folded_location = np.minimum(location, 1 - location)
+        scenario_bin = np.ravel_multi_index(
+            (
+                _calc_bin_index(magnitude, magnitude_bins),
+                _calc_bin_index(folded_location, location_bins),
+                np.searchsorted(styles, style),
+            ),
+            shape,
+        )
+
+    # Group the scenarios by style of faulting, which have different model coefficients
+    for i, s in enumerate(styles):
+        members = np.flatnonzero(style == s)
+        probex = _calc_scenario_prob_exceed(
+            magnitude[members], location[members], s, displacement_array, coefficient_type, folded
+        )
+
+        # Rate contributions with shape (scenarios, models, displacements)
+        contribution = rate[members, np.newaxis, np.newaxis] * weights[s][:, np.newaxis] * probex
+        hazard += contribution.sum(axis=(0, 1))
+
+        if disaggregation:
+            by_scenario = contribution.sum(axis=1)
+            np.add.at(
+                magnitude_location_style.reshape(-1, len(displacement_array)),
+                scenario_bin[members],
+                by_scenario,
+            )
+            style_model[i, : probex.shape[1]] = contribution.sum(axis=0)
+
+    if not disaggregation:
+        return hazard
+
+    model_id = {s: _get_coefficients(s, coefficient_type)["model_id"] for s in styles}
+
+    return hazard, {
+        "magnitude_bins": magnitude_bins,
+        "location_bins": location_bins,
+        "styles": styles,
+        "model_id": model_id,
+        "magnitude_location_style": magnitude_location_style,
+        "style_model": style_model,
+    }
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_hazard.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser, nargs="+")
+    _add_location(parser, nargs="+")
+    _add_style(parser)
+    _add_rate(parser)
+    _add_displacement(parser)
+    _add_coefficient_type(parser)
+    _add_folded_flag(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
+def main(**kwargs):
+
+    try:
+        result = calc_hazard(**kwargs)
+
+        print(
+            f"     Annual rate of exceedance for magnitudes {kwargs.get('magnitude')}, "
+            f"locations {kwargs.get('location_array')}, {kwargs.get('style')} faulting:"
+        )
+        print("    ", np.array2string(result, formatter={"float_kind": lambda x: f"{x:.4e}"}))
+
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
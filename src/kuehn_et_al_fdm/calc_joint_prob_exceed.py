@@ -0,0 +1,252 @@
+"""This module calculates the joint probability of exceedance at multiple sites on the same rupture
+for a magnitude/style scenario. For example, one can compute the probability that any or all
+crossings of a pipeline exceed their displacement capacities.
+"""
+
+# Python imports
+import argparse
+import numpy as np
+from scipy import special
+
+# Module imports
+from kuehn_et_al_fdm.calc_params import _calc_batched_params
+from kuehn_et_al_fdm.load_data import _get_weights
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
+
+# Default number of Gauss-Hermite nodes for the integration over the between-event term
+N_NODES = 20
+
+
+@_profile_stage()
+def _calc_log_joint_prob(transformed_displ, mean, stdv_within, stdv_between, nodes, mode):
+    """
+    Calculate the log of the joint probability conditional on the between-event term.
+
+    Parameters
+    ----------
+    transformed_displ : numpy.ndarray
+        Test values of displacement in transformed units with shape (..., sites, models).
+
+    mean : numpy.ndarray
+        Mean displacement in transformed units with shape (sites, models).
+
+    stdv_within : numpy.ndarray
+        Within-event standard deviation in transformed units with shape (sites, models).
+
+    stdv_between : numpy.ndarray
+        Between-event standard deviation in transformed units with shape (sites, models).
+
+    nodes : numpy.ndarray
+        Standard normal values of the between-event term.
+
+    mode : str
+        'all' for the probability that all sites exceed, or 'any' for the probability that no
+        site exceeds (the complement of 'any').
+
+    Returns
+    -------
+    numpy.ndarray
+        Log of the joint probability with shape (nodes, ..., models).
+    """
+    nodes = nodes.reshape((-1,) + (1,) * transformed_displ.ndim)
+    z = (mean + stdv_between * nodes - transformed_displ) / stdv_within
+
+    # Sites are independent given the between-event term, so log-probabilities add
+    if mode == "all":
+        return np.sum(special.log_ndtr(z), axis=-2)
+    return np.sum(special.log_ndtr(-z), axis=-2)
+
+
+@_profile_stage()
+def calc_joint_prob_exceed(
+    *,
+    magnitude,
+    location_array,
+    style,
+    displacement_array,
+    mode="any",
+    coefficient_type="median",
+    folded=True,
+    n_nodes=N_NODES,
+):
+    """
+    Calculate the joint probability of exceedance at multiple sites on the same rupture.
+
+    Displacements at the sites are correlated through the between-event term, which is shared by
+    all sites on the rupture. Given the between-event term, the sites are independent with the
+    within-event standard deviation, and the joint probability is integrated over the
+    between-event term with Gauss-Hermite quadrature. For the folded location, the rupture
+    orientation is shared by all sites, so the result is the average of the joint probabilities
+    for the site and complementary locations.
+
+    Parameters
+    ----------
+    magnitude : int or float or numpy.ndarray with a single element
+        Earthquake moment magnitude.
+
+    location_array : ArrayLike
+        Normalized locations along rupture length of the sites, range [0, 1.0].
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    displacement_array : ArrayLike
+        Test values of displacement in meters (e.g., displacement capacities). The last axis
+        corresponds to the sites (a single value is used for all sites); leading axes are
+        additional sets of test values.
+
+    mode : str, optional
+        'any' for the probability that at least one site exceeds its test value, or 'all' for the
+        probability that all sites exceed their test values (case-insensitive). Default 'any'.
+
+    coefficient_type : str, optional
+        Option to run model using full epistemic uncertainty or with point estimates (mean or
+        median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
+        'full', or 'reduced'. Default 'median'.
+
+    folded : boolean, optional
+        Return probability of exceedance for the folded location. Default True.
+
+    n_nodes : int, optional
+        Number of Gauss-Hermite quadrature nodes. Default 20.
+
+    Returns
+    -------
+    If `coefficient_type` is 'mean' or 'median':
+        numpy.ndarray
+            Joint probability of exceedance with the leading shape of `displacement_array`.
+
+    If `coefficient_type` is 'full' or 'reduced':
+        pandas.DataFrame
+            A DataFrame with the following columns:
+
+            - **model_id**: Model coefficient row number.
+            - **weight**: Weight of the model coefficients.
+            - **set**: Index of the set of test values (flattened leading axes).
+            - **probex_joint**: Joint probability of exceedance.
+
+    Raises
+    ------
+    ValueError
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
+
+    ValueError
+        If `mode` is not 'any' or 'all'.
+
+    ValueError
+        If `location_array` is not within range [0, 1].
+
+    Warns
+    -----
+    UserWarning
+        If `magnitude` is not within the recommended range for that style.
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ kea-joint_prob_exceed -m 7 -l 0.1 0.2 0.3 -s strike-slip -d 0.5
+        $ kea-joint_prob_exceed -m 7 -l 0.1 0.2 0.3 -s strike-slip -d 0.5 1 2 --mode all
+    """
+    mode = mode.lower()
+    if mode not in ["any", "all"]:
+        raise ValueError(f"'{mode}' is an invalid 'mode'; only 'any' or 'all' is allowed.")
+
+    coefficient_type = coefficient_type.lower()
+    location_array = np.atleast_1d(np.asarray(location_array, dtype=float))
+    displacement_array = np.atleast_1d(np.asarray(displacement_array, dtype=float))
+    displacement_array = np.broadcast_to(
+        displacement_array, displacement_array.shape[:-1] + location_array.shape
+    )
+
+    # Calculate statistical distribution parameter predictions with shape (sites, models)
+    site, complement = _calc_batched_params(
+        magnitude=magnitude,
+        location=location_array[:, np.newaxis],
+        style=style,
+        coefficient_type=coefficient_type,
+    )
+    model_id, bc_param, mean_site, _, stdv_within_site, stdv_between_site = site
+    _, _, mean_complement, _, stdv_within_complement, stdv_between_complement = complement
+
+    # Calculate transformed displacements with shape (..., sites, models)
+    bc_param = np.asarray(bc_param)
+    transformed_displ = (displacement_array[..., np.newaxis] ** bc_param - 1) / bc_param
+
+    # Probabilists' Gauss-Hermite nodes; weights are normalized to the standard normal density
+    nodes, weights = np.polynomial.hermite_e.hermegauss(n_nodes)
+    weights = (weights / np.sqrt(2 * np.pi)).reshape((-1,) + (1,) * (transformed_displ.ndim - 1))
+
+    orientations = [(mean_site, stdv_within_site, stdv_between_site)]
+    if folded:
+        orientations.append((mean_complement, stdv_within_complement, stdv_between_complement))
+
+    probex_joint = 0
+    for mean, stdv_within, stdv_between in orientations:
+        shape = transformed_displ.shape[-2:]
+        mean, stdv_within, stdv_between = [
+            np.broadcast_to(arr, shape) for arr in [mean, stdv_within, stdv_between]
+        ]
+        log_prob = _calc_log_joint_prob(
+            transformed_displ, mean, stdv_within, stdv_between, nodes, mode
+        )
+        prob = np.sum(weights * np.exp(log_prob), axis=0)
+        probex_joint = probex_joint + (prob if mode == "all" else 1 - prob) / len(orientations)
+
+    # Use Pandas DataFrame to manage results for the full or reduced set of coefficients
+    if coefficient_type in ["full", "reduced"]:
+        probex_joint = probex_joint.reshape(-1, probex_joint.shape[-1])
+        n_sets, n_models = probex_joint.shape
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "model_id": np.tile(model_id, n_sets),
+                "weight": np.tile(_get_weights(style.lower(), coefficient_type), n_sets),
+                "set": np.repeat(np.arange(n_sets), n_models),
+                "probex_joint": probex_joint.ravel(),
+            }
+        )
+
+    return probex_joint[..., 0]
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_joint_prob_exceed.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser)
+    _add_location(parser, nargs="+")
+    _add_style(parser)
+    _add_displacement(parser)
+    _add_joint_mode(parser)
+    _add_coefficient_type(parser)
+    _add_folded_flag(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
+def main(**kwargs):
+
+    try:
+        result = calc_joint_prob_exceed(**kwargs)
+
+        print(
+            f"     Probability that {kwargs.get('mode')} site(s) exceed for magnitude "
+            f"{kwargs.get('magnitude')}, locations {kwargs.get('location_array')}, "
+            f"{kwargs.get('style')} faulting:"
+        )
+        _print_result(result)
+
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
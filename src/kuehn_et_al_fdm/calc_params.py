@@ -2,18 +2,110 @@
 
 # Python imports
 import argparse
+import contextlib
 import warnings
 import numpy as np
 
 
 # Module imports
-from kuehn_et_al_fdm.load_data import DATA
-from kuehn_et_al_fdm.utilities import _check_type, _check_location_range, _check_magnitude_range
-from kuehn_et_al_fdm.prediction_functions import _func_nm, _func_rv, _func_ss
+from kuehn_et_al_fdm.model import _get_model
+from kuehn_et_al_fdm.utilities import _check_type
+from kuehn_et_al_fdm.profiling import _profile_stage
 from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
 
 
-def _calc_params(*, magnitude, location, style, coefficient_type="median", override=False):
+class DistributionParams:
+    """
+    Predicted statistical distribution parameters for the site and complementary locations.
+
+    The parameters are calculated once with `_calc_params` (with ``as_object=True``) and can be
+    passed to `calc_displ_site`, `calc_prob_exceed`, and `calc_prob_occur` in place of the
+    magnitude, location, and style, so several calculations for the same scenarios share the
+    parameter calculation.
+
+    Attributes
+    ----------
+    magnitude, location : float or numpy.ndarray
+        Earthquake moment magnitude and normalized location along rupture length.
+
+    style : str
+        Style of faulting (lower case).
+
+    coefficient_type : str
+        Model coefficients (lower case).
+
+    override : boolean
+        True if the parameters are for multiple scenarios.
+
+    model_id, bc_param : numpy.ndarray
+        Model coefficient row number or point estimate definition, and Box-Cox transformation
+        parameter (lambda), with shape (models,).
+
+    mean_site, stdv_site, stdv_within_site, stdv_between_site : numpy.ndarray
+        Mean and total, within-event, and between-event standard deviations in transformed units
+        for the site location, with shape (scenarios, models).
+
+    mean_complement, stdv_complement, stdv_within_complement, stdv_between_complement : numpy.ndarray
+        Same as above for the complementary location.
+    """
+
+    __slots__ = (
+        "magnitude",
+        "location",
+        "style",
+        "coefficient_type",
+        "override",
+        "model_id",
+        "bc_param",
+        "mean_site",
+        "stdv_site",
+        "stdv_within_site",
+        "stdv_between_site",
+        "mean_complement",
+        "stdv_complement",
+        "stdv_within_complement",
+        "stdv_between_complement",
+    )
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs[name])
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(style='{self.style}', "
+            f"coefficient_type='{self.coefficient_type}', "
+            f"scenarios={self.mean_site.shape[0]}, models={self.mean_site.shape[1]})"
+        )
+
+    def _check_coefficient_type(self, coefficient_type):
+        """Check that the parameters were calculated with the coefficients for a calculation."""
+        if coefficient_type != self.coefficient_type:
+            raise ValueError(
+                f"The parameters were calculated with the '{self.coefficient_type}' coefficients;"
+                f" '{coefficient_type}' coefficients are required."
+            )
+
+    def _get_arrays(self, scenario_axis=False):
+        """
+        Get the parameters with the shapes returned by `_calc_params`.
+
+        Returns (model_id, bc_param, mean_site, stdv_site, mean_complement, stdv_complement).
+        The arrays have shape (models,) for a single scenario and (scenarios,) for multiple
+        scenarios with point estimates; use `scenario_axis` for (scenarios, models).
+        """
+        arrays = [self.mean_site, self.stdv_site, self.mean_complement, self.stdv_complement]
+        if not self.override:
+            arrays = [arr[0] for arr in arrays]
+        elif not scenario_axis and arrays[0].shape[1] == 1:
+            arrays = [arr[:, 0] for arr in arrays]
+        return (self.model_id, self.bc_param, *arrays)
+
+
+@_profile_stage()
+def _calc_params(
+    *, magnitude, location, style, coefficient_type="median", override=False, as_object=False
+):
     """
     Calculate the predicted statistical distribution parameters.
 
@@ -32,15 +124,26 @@ def _calc_params(*, magnitude, location, style, coefficient_type="median", overr
     coefficient_type : str, optional
         Option to run model using full epistemic uncertainty or with point estimates (mean or
         median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
-        or 'full'. Default 'median'.
+        'full', or 'reduced' (a small weighted set of representative posterior coefficients).
+        Default 'median'.
 
     override : boolean, optional
         Option to override single scenario limitation that is hard-coded. Not recommended for most
         users. Default False.
 
+    as_object : boolean, optional
+        Option to return a `DistributionParams` object with the parameters for the site and
+        complementary locations, which can be passed to the downstream calculations. Default
+        False.
+
     Returns
     -------
+    DistributionParams
+        If `as_object` is True.
+
     tuple
+        If `as_object` is False:
+
         - 'model_id': Model coefficient row number or point estimate definition.
         - 'bc_param': Box-Cox transformation parameter (lambda).
         - 'mean': Mean displacement in transformed units (unfolded).
@@ -51,7 +154,7 @@ def _calc_params(*, magnitude, location, style, coefficient_type="median", overr
     Raises
     ------
     ValueError
-        If `coefficient_type` is not 'mean', 'median', or 'full'.
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
 
     ValueError
         If `location` is not within range [0, 1].
@@ -88,48 +191,97 @@ def _calc_params(*, magnitude, location, style, coefficient_type="median", overr
     style = style.lower()
     coefficient_type = coefficient_type.lower()
 
-    # Check ranges of inputs
-    _check_location_range(location)
-    _check_magnitude_range(magnitude, style)
+    # Calculate parameters for each set of coefficients (or for point estimates of coefficients)
+    # The model with the prepared coefficients is shared between calls
+    model = _get_model(style, coefficient_type)
+    if as_object:
+        return _create_params_object(model, magnitude, location, override)
 
-    function_map = {"strike-slip": _func_ss, "reverse": _func_rv, "normal": _func_nm}
+    model_id, lam, mu, sd_total, sd_u, sd_mode = model.params(magnitude, location)
 
-    # Calculate parameters for each set of coefficients
-    if coefficient_type == "full":
-        coeffs = DATA["full"][style].to_records(index=False)
-        model_id, lam, mu, sd_total, sd_u, sd_mode = function_map[style](
-            coeffs, magnitude, location
-        )
+    return model_id, lam, mu, sd_total, sd_u, sd_mode
 
-    # Calculate parameters for point estimates of coefficients
-    else:
-        if coefficient_type not in ["mean", "median"]:
-            raise ValueError(
-                f"'{coefficient_type}' is an invalid 'coefficient_type';"
-                " only 'mean', 'median', or 'full' is allowed."
-            )
 
-        coeffs = DATA["point"][style]
-        coeffs = coeffs[coeffs["model_id"] == coefficient_type].to_records(index=False)
+@contextlib.contextmanager
+def _ignore_multiple_scenarios_note():
+    """Ignore the note issued with `override`; the scenarios are tracked by the array shapes."""
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=r"\s*\*\*\*Running multiple scenarios")
+        yield
 
-        model_id, lam, mu, sd_total, sd_u, sd_mode = function_map[style](
-            coeffs, magnitude, location
-        )
 
-    return model_id, lam, mu, sd_total, sd_u, sd_mode
+def _calc_batched_params(*, magnitude, location, style, coefficient_type):
+    """
+    Calculate the predicted statistical distribution parameters for arrays of scenarios at the
+    site and complementary locations.
 
+    Parameters
+    ----------
+    magnitude : numpy.ndarray
+        Earthquake moment magnitude, broadcastable with `location`.
+
+    location : numpy.ndarray
+        Normalized location along rupture length, range [0, 1.0].
 
-# Create an ArgumentParser instance and add specific arguments to the parser
-parser = argparse.ArgumentParser(
-    description=_calc_params.__doc__, formatter_class=argparse.RawTextHelpFormatter
-)
-_add_magnitude(parser)
-_add_location(parser)
-_add_style(parser)
-_add_coefficient_type(parser)
+    style : str
+        Style of faulting (case-insensitive).
 
+    coefficient_type : str
+        Model coefficients (case-insensitive).
 
-@_add_arguments(parser)
+    Returns
+    -------
+    tuple
+        - 'site': Parameters from `_calc_params` for the site location.
+        - 'complement': Parameters from `_calc_params` for the complementary location.
+    """
+    params = {"magnitude": magnitude, "style": style, "coefficient_type": coefficient_type}
+    with _ignore_multiple_scenarios_note():
+        site = _calc_params(**params, location=location, override=True)
+        complement = _calc_params(**params, location=1 - location, override=True)
+    return site, complement
+
+
+def _create_params_object(model, magnitude, location, override):
+    """Calculate the parameters for the site and complementary locations on a scenario grid."""
+    magnitude_grid, location_grid = [
+        arr.reshape(-1, 1) for arr in np.broadcast_arrays(magnitude, location)
+    ]
+    site = model.params(magnitude_grid, location_grid)
+    complement = model.params(magnitude_grid, 1 - location_grid)
+    shape = (magnitude_grid.shape[0], model.n_models)
+
+    names = ["mean", "stdv", "stdv_within", "stdv_between"]
+    params = {f"{name}_site": np.broadcast_to(v, shape) for name, v in zip(names, site[2:])}
+    params.update(
+        {f"{name}_complement": np.broadcast_to(v, shape) for name, v in zip(names, complement[2:])}
+    )
+    return DistributionParams(
+        magnitude=magnitude,
+        location=location,
+        style=model.style,
+        coefficient_type=model.coefficient_type,
+        override=override,
+        model_id=site[0],
+        bc_param=np.asarray(site[1]),
+        **params,
+    )
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=_calc_params.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser)
+    _add_location(parser)
+    _add_style(parser)
+    _add_coefficient_type(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
 def main(**kwargs):
 
     try:
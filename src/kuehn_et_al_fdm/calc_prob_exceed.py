@@ -7,16 +7,29 @@ integral in a probabilistic fault displacement hazard analysis.
 import argparse
 import types
 import numpy as np
-import pandas as pd
-from scipy import stats
 
 # Module imports
 from kuehn_et_al_fdm.calc_params import _calc_params
-from kuehn_et_al_fdm._common_args import *  # noqa: F403 * # noqa: F403
+from kuehn_et_al_fdm.load_data import _get_weights
+from kuehn_et_al_fdm.uncertainty_functions import (
+    EPISTEMIC_FRACTILES,
+    POINT_ESTIMATES,
+    _calc_epistemic_params,
+    _calc_fractile_prob_exceed,
+)
+from kuehn_et_al_fdm.transformation_functions import _calc_norm_cdf
+from kuehn_et_al_fdm.cache import _cached
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm.results import CalculationResult
+from kuehn_et_al_fdm.trace import _record_trace, _tracing
+from kuehn_et_al_fdm._common_args import *  # noqa: F403
 
 
+@_profile_stage("dataframe")
 def _create_debug_dataframe(**kwargs):
     """A helper function to create the debugging dataframe."""
+    import pandas as pd
+
     # Create dynamic variables
     ns = types.SimpleNamespace(**kwargs)
 
@@ -75,15 +88,20 @@ def _create_debug_dataframe(**kwargs):
     return datafame.apply(lambda col: col.explode() if col.name in names else col)
 
 
+@_profile_stage()
+@_cached
 def calc_prob_exceed(
     *,
-    magnitude,
-    location,
-    style,
+    magnitude=None,
+    location=None,
+    style=None,
     displacement_array,
     coefficient_type="median",
+    epistemic_fractiles=None,
     folded=True,
     debug=False,
+    params=None,
+    as_result=False,
 ):
     """
     Calculate the probability of exceedance.
@@ -106,7 +124,17 @@ def calc_prob_exceed(
     coefficient_type : str, optional
         Option to run model using full epistemic uncertainty or with point estimates (mean or
         median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
-        or 'full'. Default 'median'.
+        'full', 'reduced', 'parametric', or 'analytic'. The 'reduced' option uses a small weighted
+        set of representative posterior coefficients. The 'parametric' option uses the median
+        coefficients and the tabulated epistemic standard deviations of the mean and total standard
+        deviation to return epistemic fractiles instead of evaluating the full set of coefficients.
+        The 'analytic' option uses the mean coefficients and propagates the covariance of the
+        coefficients to the mean and total standard deviation with the delta method. Default
+        'median'.
+
+    epistemic_fractiles : ArrayLike, optional
+        Epistemic fractiles returned if `coefficient_type` is 'parametric' or 'analytic'. Default
+        (0.05, 0.16, 0.5, 0.84, 0.95).
 
     folded : boolean, optional
         Return probability of exceedance for the folded location. Default True.
@@ -114,6 +142,16 @@ def calc_prob_exceed(
     debug : boolean, optional
         Option to return DataFrame of internal calculations. Default False.
 
+    params : DistributionParams, optional
+        Distribution parameters for a single scenario from `_calc_params` (with
+        ``as_object=True``), used in place of `magnitude`, `location`, and `style`. The
+        coefficients must match `coefficient_type`. Default None.
+
+    as_result : boolean, optional
+        Option to return a `CalculationResult` with the axes ('scenario', 'model',
+        'displacement') for all coefficient types (and the internal calculations as additional variables if `debug` is
+        True). Default False.
+
     Returns
     -------
     If debug is False:
@@ -123,11 +161,14 @@ def calc_prob_exceed(
             probex_site : numpy.ndarray, optional
                 Probability of exceedance for the site location (if folded is False).
 
-        If `coefficient_type` is 'full':
+        If `coefficient_type` is 'full', 'reduced', 'parametric', or 'analytic':
             pandas.DataFrame
                 A DataFrame with the following columns:
 
-                - **model_id**: Model coefficient row number or point estimate definition.
+                - **model_id**: Model coefficient row number or point estimate definition (or
+                  epistemic fractile for the 'parametric' and 'analytic' options).
+                - **weight**: Weight of the model coefficients (only for the 'full' and 'reduced'
+                  options).
                 - **displ_meters**: Test value of displacement in meters.
                 - **transformed_displ**: Test value of displacement in transformed units.
                 - **probex_folded**: Probability of exceedance for the folded location (if folded is True).
@@ -153,10 +194,20 @@ def calc_prob_exceed(
             - **probex_folded**: Probability of exceedance for the folded location.
 
 
+    If as_result is True:
+        CalculationResult
+            Probability of exceedance with the axes ('scenario', 'model', 'displacement') for the
+            single scenario, and the weights of the model coefficients (for the 'full' and
+            'reduced' options) as a variable.
+
     Raises
     ------
     ValueError
-        If `coefficient_type` is not 'mean', 'median', or 'full'.
+        If `coefficient_type` is not 'mean', 'median', 'full', 'reduced', 'parametric', or
+        'analytic'.
+
+    ValueError
+        If `params` are for multiple scenarios or for other coefficients.
 
     Examples
     --------
@@ -166,12 +217,36 @@ def calc_prob_exceed(
 
         $ kea-prob_exceed -m 6 -l 0.2 -s reverse -d .01 0.03 0.1 0.3 1 3 10 30
         $ kea-prob_exceed -m 6 -l 0.2 -s reverse -d .01 0.03 0.1 0.3 1 3 10 30 --debug
+        $ kea-prob_exceed -m 6 -l 0.2 -s reverse -d .01 0.03 0.1 0.3 1 3 10 30 -ct parametric
+        $ kea-prob_exceed -m 6 -l 0.2 -s reverse -d .01 0.03 0.1 0.3 1 3 10 30 -ct analytic
+        $ kea-prob_exceed -m 6 -l 0.2 -s reverse -d .01 0.03 0.1 0.3 1 3 10 30 -ct reduced
     """
     # Calculate statistical distribution parameter predictions
     coefficient_type = coefficient_type.lower()
-    params = {"magnitude": magnitude, "style": style, "coefficient_type": coefficient_type}
-    model_id, bc_param, mean_site, stdv_site, _, _ = _calc_params(**params, location=location)
-    _, _, mean_complement, stdv_complement, _, _ = _calc_params(**params, location=1 - location)
+    epistemic = coefficient_type in POINT_ESTIMATES
+    if params is None:
+        params = {
+            "magnitude": magnitude,
+            "style": style,
+            "coefficient_type": POINT_ESTIMATES.get(coefficient_type, coefficient_type),
+        }
+        model_id, bc_param, mean_site, stdv_site, _, _ = _calc_params(**params, location=location)
+        _, _, mean_complement, stdv_complement, _, _ = _calc_params(
+            **params, location=1 - location
+        )
+    else:
+        if params.override:
+            raise ValueError("The parameters must be for a single scenario.")
+        params._check_coefficient_type(POINT_ESTIMATES.get(coefficient_type, coefficient_type))
+        magnitude, location, style = params.magnitude, params.location, params.style
+        (
+            model_id,
+            bc_param,
+            mean_site,
+            stdv_site,
+            mean_complement,
+            stdv_complement,
+        ) = params._get_arrays()
 
     # Reshape arrays for broadcasting
     arrays = [model_id, bc_param, mean_site, stdv_site, mean_complement, stdv_complement]
@@ -179,33 +254,135 @@ def calc_prob_exceed(
     model_id, bc_param, mean_site, stdv_site, mean_complement, stdv_complement = reshaped_arrays
     del arrays, reshaped_arrays
 
+    # Expand the point-estimate parameters to the epistemic fractiles
+    if epistemic:
+        fractiles = np.asarray(
+            EPISTEMIC_FRACTILES if epistemic_fractiles is None else epistemic_fractiles,
+            dtype=float,
+        )[:, np.newaxis]
+        arrays = [bc_param, mean_site, stdv_site, mean_complement, stdv_complement]
+        reshaped_arrays = [np.broadcast_to(arr, fractiles.shape) for arr in arrays]
+        bc_param, mean_site, stdv_site, mean_complement, stdv_complement = reshaped_arrays
+        model_id = fractiles
+        del arrays, reshaped_arrays
+
     # Calculate transformed displacements
     reshaped_displ = np.tile(np.atleast_1d(displacement_array), (bc_param.shape[0], 1))
     transformed_displ = (reshaped_displ**bc_param - 1) / bc_param
 
     # Calculate probability of exceedances
-    probex_site = 1 - stats.norm.cdf(x=transformed_displ, loc=mean_site, scale=stdv_site)
-    probex_complement = 1 - stats.norm.cdf(
-        x=transformed_displ, loc=mean_complement, scale=stdv_complement
-    )
+    if epistemic:
+        epistemic_params = {"style": style, "coefficient_type": coefficient_type}
+        sd_med_site, sd_sigma_site, corr_site = _calc_epistemic_params(
+            magnitude, location, **epistemic_params
+        )
+        sd_med_complement, sd_sigma_complement, corr_complement = _calc_epistemic_params(
+            magnitude, 1 - location, **epistemic_params
+        )
+        probex_site = _calc_fractile_prob_exceed(
+            transformed_displ,
+            mean_site,
+            stdv_site,
+            sd_med_site,
+            sd_sigma_site,
+            fractiles,
+            corr_site,
+        )
+        probex_complement = _calc_fractile_prob_exceed(
+            transformed_displ,
+            mean_complement,
+            stdv_complement,
+            sd_med_complement,
+            sd_sigma_complement,
+            fractiles,
+            corr_complement,
+        )
+    else:
+        probex_site = 1 - _calc_norm_cdf(transformed_displ, mean_site, stdv_site)
+        probex_complement = 1 - _calc_norm_cdf(transformed_displ, mean_complement, stdv_complement)
     probex_folded = np.mean((probex_site, probex_complement), axis=0)
 
+    # Record the internal calculations on a (scenario, models, displacements) grid
+    if _tracing():
+        _record_trace(
+            "calc_prob_exceed",
+            (1,) + reshaped_displ.shape,
+            {"model_id": model_id, "displ_meters": reshaped_displ[0]},
+            magnitude=magnitude,
+            location=location,
+            style=style,
+            bc_param=bc_param,
+            mean_site=mean_site,
+            stdv_site=stdv_site,
+            mean_complement=mean_complement,
+            stdv_complement=stdv_complement,
+            transformed_displ=transformed_displ,
+            probex_site=probex_site,
+            probex_complement=probex_complement,
+            probex_folded=probex_folded,
+        )
+
     # Collect variables in a dictionary to pass into datafame creator function if needed
     results = {
         k: v
         for k, v in locals().items()
-        if k not in ["displacement_array", "coefficient_type", "folded", "debug", "params", "_"]
+        if k
+        not in [
+            "displacement_array",
+            "coefficient_type",
+            "folded",
+            "debug",
+            "params",
+            "as_result",
+            "_",
+        ]
     }
 
+    # Use array-backed result container for all coefficient types
+    if as_result:
+        name = "probex_folded" if folded else "probex_site"
+        data = {name: probex_folded if folded else probex_site}
+        if debug:
+            data.update(
+                {
+                    "transformed_displ": transformed_displ,
+                    "probex_site": probex_site,
+                    "probex_complement": probex_complement,
+                    "probex_folded": probex_folded,
+                }
+            )
+        # A single scenario, on the same axes as the other calculations
+        dims = ("scenario", "model", "displacement")
+        data = {k: (dims, np.reshape(v, (1,) + np.shape(v))) for k, v in data.items()}
+        if debug:
+            model_params = {
+                "bc_param": bc_param,
+                "mean_site": mean_site,
+                "stdv_site": stdv_site,
+                "mean_complement": mean_complement,
+                "stdv_complement": stdv_complement,
+            }
+            data.update({k: (("model",), np.ravel(v)) for k, v in model_params.items()})
+        if coefficient_type in ["full", "reduced"]:
+            data["weight"] = (("model",), _get_weights(style.lower(), coefficient_type))
+        coords = {"model": np.ravel(model_id), "displacement": reshaped_displ[0]}
+        return CalculationResult(name, data, coords)
+
     # Use Pandas DataFrame to manage results for debugging
     if debug:
         return _create_debug_dataframe(**results)
 
-    # Also use Pandas DataFrame to manage results for full set of coefficients
-    if coefficient_type == "full":
+    # Also use Pandas DataFrame to manage results for full set of coefficients or fractiles
+    if coefficient_type in ["full", "reduced", "parametric", "analytic"]:
         dataframe = _create_debug_dataframe(**results)
         columns = ["model_id", "displ_meters"]
 
+        # Include the weights of the model coefficients
+        if coefficient_type in ["full", "reduced"]:
+            weight = _get_weights(style.lower(), coefficient_type)
+            dataframe["weight"] = np.repeat(weight, reshaped_displ.shape[1])
+            columns.insert(1, "weight")
+
         if folded:
             columns.append("probex_folded")
             return dataframe[columns].copy()
@@ -219,33 +396,36 @@ def calc_prob_exceed(
         if coefficient_type not in ["mean", "median"]:
             raise ValueError(
                 f"'{coefficient_type}' is an invalid 'coefficient_type';"
-                " only 'mean', 'median', or 'full' is allowed."
+                " only 'mean', 'median', 'full', 'reduced', 'parametric', or 'analytic' is allowed."
             )
 
         return probex_folded.squeeze() if folded else probex_site.squeeze()
 
 
-# Create an ArgumentParser instance and add specific arguments to the parser
-parser = argparse.ArgumentParser(
-    description=calc_prob_exceed.__doc__, formatter_class=argparse.RawTextHelpFormatter
-)
-_add_magnitude(parser)
-_add_location(parser)
-_add_style(parser)
-_add_displacement(parser)
-_add_coefficient_type(parser)
-_add_folded_flag(parser)
-_add_debug_flag(parser)
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_prob_exceed.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser)
+    _add_location(parser)
+    _add_style(parser)
+    _add_displacement(parser)
+    _add_coefficient_type(parser)
+    _add_folded_flag(parser)
+    _add_debug_flag(parser)
+
+    return parser
 
 
-@_add_arguments(parser)
+@_add_arguments(_create_parser)
 def main(**kwargs):
 
     try:
         result = calc_prob_exceed(**kwargs)
 
         if kwargs.get("debug", True):
-            print(result)
+            _print_result(result)
         else:
             print(
                 f"     Probability of exceedance for magnitude {kwargs.get('magnitude')}, "
@@ -0,0 +1,249 @@
+"""This module calculates the probability of failure of a structure with a lognormal fragility
+function for magnitude/location/style scenarios. In other words, this module convolves the
+predicted displacement distribution with the fragility function without storing hazard curves.
+"""
+
+# Python imports
+import argparse
+import numpy as np
+from scipy import special
+
+# Module imports
+from kuehn_et_al_fdm.calc_params import _calc_batched_params
+from kuehn_et_al_fdm.load_data import _get_weights
+from kuehn_et_al_fdm.transformation_functions import _convert_bc_to_meters
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
+
+# Default number of Gauss-Hermite nodes for the integration over the displacement distribution
+N_NODES = 64
+
+
+@_profile_stage()
+def _calc_conditional_prob_failure(bc_param, mean, stdv, median_capacity, beta, n_nodes):
+    """
+    Integrate the lognormal fragility function over the Box-Cox normal displacement distribution.
+
+    Parameters
+    ----------
+    bc_param : numpy.ndarray
+        Box-Cox transformation parameter (lambda).
+
+    mean : numpy.ndarray
+        Mean displacement in transformed units.
+
+    stdv : numpy.ndarray
+        Total standard deviation in transformed units.
+
+    median_capacity : numpy.ndarray
+        Median displacement capacity in meters.
+
+    beta : numpy.ndarray
+        Logarithmic standard deviation of the displacement capacity.
+
+    n_nodes : int
+        Number of Gauss-Hermite quadrature nodes.
+
+    Returns
+    -------
+    numpy.ndarray
+        Probability of failure with the broadcasted shape of the inputs.
+    """
+    nodes, weights = np.polynomial.hermite_e.hermegauss(n_nodes)
+    weights = weights / np.sqrt(2 * np.pi)
+
+    # Displacements at the quadrature nodes (last axis); displacements below 1 mm are zero
+    Y = np.asarray(mean)[..., np.newaxis] + np.asarray(stdv)[..., np.newaxis] * nodes
+    displ_meters = _convert_bc_to_meters(Y, np.asarray(bc_param)[..., np.newaxis])
+
+    with np.errstate(divide="ignore"):
+        log_ratio = np.log(displ_meters) - np.log(np.asarray(median_capacity))[..., np.newaxis]
+    fragility = special.ndtr(log_ratio / np.asarray(beta)[..., np.newaxis])
+
+    return np.sum(weights * fragility, axis=-1)
+
+
+@_profile_stage()
+def calc_prob_failure(
+    *,
+    magnitude,
+    location,
+    style,
+    median_capacity,
+    beta,
+    rate=None,
+    coefficient_type="median",
+    folded=True,
+    n_nodes=N_NODES,
+):
+    """
+    Calculate the probability of failure for a lognormal fragility function, or the annual rate
+    of failure if the scenario rates are provided.
+
+    The probability of failure is the expected value of the fragility function, i.e.,
+    Phi(ln(D / median_capacity) / beta), over the predicted displacement D for the scenario.
+    The expectation is integrated with Gauss-Hermite quadrature in transformed units, so no
+    displacement grid or hazard curve is stored. The folded result is the average of the results
+    for the site and complementary locations.
+
+    Parameters
+    ----------
+    magnitude : int or float or ArrayLike
+        Earthquake moment magnitude.
+
+    location : int or float or ArrayLike
+        Normalized location along rupture length, range [0, 1.0].
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    median_capacity : int or float or ArrayLike
+        Median displacement capacity in meters.
+
+    beta : int or float or ArrayLike
+        Logarithmic standard deviation of the displacement capacity. Must be positive.
+
+    rate : int or float or ArrayLike, optional
+        Annual rate of each scenario. If provided, the annual rates of failure are returned
+        (sum over the scenarios that affect a site for the total annual rate). Default None.
+
+    coefficient_type : str, optional
+        Option to run model using full epistemic uncertainty or with point estimates (mean or
+        median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
+        'full', or 'reduced'. Default 'median'.
+
+    folded : boolean, optional
+        Return results for the folded location. Default True.
+
+    n_nodes : int, optional
+        Number of Gauss-Hermite quadrature nodes. Default 64.
+
+    Returns
+    -------
+    If `coefficient_type` is 'mean' or 'median':
+        numpy.ndarray
+            Probability (or annual rate) of failure for each scenario. `magnitude`, `location`,
+            `median_capacity`, `beta`, and `rate` are broadcast to a common scenario shape.
+
+    If `coefficient_type` is 'full' or 'reduced':
+        pandas.DataFrame
+            A DataFrame with the following columns:
+
+            - **scenario**: Scenario index (flattened broadcast shape).
+            - **model_id**: Model coefficient row number.
+            - **weight**: Weight of the model coefficients.
+            - **prob_failure**: Probability of failure (if `rate` is None).
+            - **rate_failure**: Annual rate of failure (if `rate` is provided).
+
+    Raises
+    ------
+    ValueError
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
+
+    ValueError
+        If `location` is not within range [0, 1].
+
+    ValueError
+        If `median_capacity` or `beta` is not positive.
+
+    Warns
+    -----
+    UserWarning
+        If `magnitude` is not within the recommended range for that style.
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ kea-prob_failure -m 7 -l 0.3 -s strike-slip -c 1.0 -b 0.5
+        $ kea-prob_failure -m 7 -l 0.3 -s strike-slip -c 0.5 1 2 -b 0.4 -ct full
+    """
+    coefficient_type = coefficient_type.lower()
+
+    arrays = [magnitude, location, median_capacity, beta] + ([] if rate is None else [rate])
+    arrays = np.broadcast_arrays(*[np.asarray(arr, dtype=float) for arr in arrays])
+    shape = arrays[0].shape
+    magnitude, location, median_capacity, beta = [arr.ravel() for arr in arrays[:4]]
+
+    if np.any(median_capacity <= 0) or np.any(beta <= 0):
+        raise ValueError("'median_capacity' and 'beta' must be positive.")
+
+    # Calculate statistical distribution parameter predictions with shape (scenarios, models)
+    site, complement = _calc_batched_params(
+        magnitude=magnitude[:, np.newaxis],
+        location=location[:, np.newaxis],
+        style=style,
+        coefficient_type=coefficient_type,
+    )
+    model_id, bc_param, mean_site, stdv_site, _, _ = site
+    _, _, mean_complement, stdv_complement, _, _ = complement
+
+    fragility = {"median_capacity": median_capacity[:, np.newaxis], "beta": beta[:, np.newaxis]}
+    prob_failure = _calc_conditional_prob_failure(
+        bc_param, mean_site, stdv_site, **fragility, n_nodes=n_nodes
+    )
+    if folded:
+        prob_complement = _calc_conditional_prob_failure(
+            bc_param, mean_complement, stdv_complement, **fragility, n_nodes=n_nodes
+        )
+        prob_failure = np.mean((prob_failure, prob_complement), axis=0)
+
+    name = "prob_failure"
+    if rate is not None:
+        prob_failure = prob_failure * arrays[4].ravel()[:, np.newaxis]
+        name = "rate_failure"
+
+    # Use Pandas DataFrame to manage results for the full or reduced set of coefficients
+    if coefficient_type in ["full", "reduced"]:
+        n_scenarios, n_models = prob_failure.shape
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "scenario": np.repeat(np.arange(n_scenarios), n_models),
+                "model_id": np.tile(model_id, n_scenarios),
+                "weight": np.tile(_get_weights(style.lower(), coefficient_type), n_scenarios),
+                name: prob_failure.ravel(),
+            }
+        )
+
+    return prob_failure[:, 0].reshape(shape)
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_prob_failure.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser)
+    _add_location(parser)
+    _add_style(parser)
+    _add_median_capacity(parser)
+    _add_beta(parser)
+    _add_coefficient_type(parser)
+    _add_folded_flag(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
+def main(**kwargs):
+
+    try:
+        result = calc_prob_failure(**kwargs)
+
+        print(
+            f"     Probability of failure for magnitude {kwargs.get('magnitude')}, "
+            f"location {kwargs.get('location')}, {kwargs.get('style')} faulting:"
+        )
+        _print_result(result)
+
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,24 @@ predictions.
 import argparse
 import warnings
 import numpy as np
-from scipy import stats
 
 # Module imports
 from kuehn_et_al_fdm.utilities import _check_type
-from kuehn_et_al_fdm.calc_params import _calc_params
+from kuehn_et_al_fdm.model import _get_model
+from kuehn_et_al_fdm.transformation_functions import _calc_norm_cdf
+from kuehn_et_al_fdm.profiling import _profile_stage
 from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
 
 
+@_profile_stage()
 def calc_prob_occur(
-    *, magnitude, location_array, style, displacement_array, coefficient_type="median"
+    *,
+    magnitude=None,
+    location_array=None,
+    style=None,
+    displacement_array,
+    coefficient_type="median",
+    params=None,
 ):
     """
     Calculate the percentile rank of observations.
@@ -43,6 +51,12 @@ def calc_prob_occur(
         insensitive). Valid options are 'mean' or 'median'. (The 'full' option is not enabled for
         this function.) Default 'median'.
 
+    params : DistributionParams, optional
+        Distribution parameters from `_calc_params` (with ``as_object=True`` and
+        ``override=True``) for one magnitude and the locations of the observations, used in place
+        of `magnitude`, `location_array`, and `style`. The coefficients must match
+        `coefficient_type`. Default None.
+
     Returns
     -------
     percentile : numpy.ndarray
@@ -55,6 +69,8 @@ def calc_prob_occur(
 
         If `coefficient_type` is not 'mean' or 'median'.
 
+        If `params` are for other coefficients.
+
     Examples
     --------
     From command line:
@@ -65,10 +81,13 @@ def calc_prob_occur(
     """
     # Only one value is allowed
     msg = "***Note: Only one value is allowed."
-    _check_type(magnitude, "magnitude", (int, float), msg=msg)
+    if params is None:
+        _check_type(magnitude, "magnitude", (int, float), msg=msg)
+        location_array = np.atleast_1d(location_array)
+    else:
+        location_array = np.broadcast_to(params.location, params.mean_site.shape[:1])
 
     # Displacement and location arrays should be the same shape
-    location_array = np.atleast_1d(location_array)
     displacement_array = np.atleast_1d(displacement_array)
     if location_array.shape != displacement_array.shape:
         raise ValueError(
@@ -84,40 +103,35 @@ def calc_prob_occur(
             " only 'mean' or 'median' is allowed."
         )
 
-    # Calculate statistical distribution parameter predictions
-    params = {
-        "magnitude": magnitude,
-        "location": location_array,
-        "style": style,
-        "coefficient_type": coefficient_type,
-    }
-    vectorized_params_calc = np.vectorize(_calc_params)
+    # Use precalculated distribution parameters for the site locations
+    if params is not None:
+        params._check_coefficient_type(coefficient_type)
+        transformed_displ = (displacement_array**params.bc_param - 1) / params.bc_param
+        return _calc_norm_cdf(transformed_displ, params.mean_site[:, 0], params.stdv_site[:, 0])
+
+    # Calculate percentile rank of the observations
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
-        model_id, bc_param, mean_site, stdv_site, _, _ = vectorized_params_calc(
-            **params, override=True
+        return _get_model(style, coefficient_type).prob_occur(
+            magnitude, location_array, displacement_array
         )
-        # override allows multiple locations
-
-    # Calculate transformed displacements
-    transformed_displ = (displacement_array**bc_param - 1) / bc_param
 
-    # Calculate percentile rank of the observations
-    return stats.norm.cdf(x=transformed_displ, loc=mean_site, scale=stdv_site)
 
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=calc_prob_occur.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser)
+    _add_location(parser, nargs="+")
+    _add_style(parser)
+    _add_displacement(parser)
+    _add_coefficient_type(parser)
 
-# Create an ArgumentParser instance and add specific arguments to the parser
-parser = argparse.ArgumentParser(
-    description=calc_prob_occur.__doc__, formatter_class=argparse.RawTextHelpFormatter
-)
-_add_magnitude(parser)
-_add_location(parser, nargs="+")
-_add_style(parser)
-_add_displacement(parser)
-_add_coefficient_type(parser)
+    return parser
 
 
-@_add_arguments(parser)
+@_add_arguments(_create_parser)
 def main(**kwargs):
 
     try:
@@ -0,0 +1,155 @@
+"""This module projects site coordinates onto rupture traces to calculate the normalized location
+along rupture length (and the along-strike and off-fault distances) for many site/rupture pairs.
+The coordinates must be planar or projected (e.g., UTM) and in consistent units.
+"""
+
+# Python imports
+import numpy as np
+
+
+def _flatten_traces(rupture_traces):
+    """
+    Flatten rupture traces (polylines) into segments.
+
+    Parameters
+    ----------
+    rupture_traces : list of ArrayLike
+        Rupture traces, each with shape (vertices, 2).
+
+    Returns
+    -------
+    tuple
+        - 'start': Segment start points with shape (segments, 2).
+        - 'end': Segment end points with shape (segments, 2).
+        - 'rupture': Rupture index of each segment.
+        - 'offset': Length along the trace to the start of each segment.
+        - 'rupture_length': Total length of each rupture trace.
+    """
+    traces = [np.asarray(trace, dtype=float).reshape(-1, 2) for trace in rupture_traces]
+    if any(len(trace) < 2 for trace in traces):
+        raise ValueError("Each rupture trace must have at least two vertices.")
+
+    start = np.concatenate([trace[:-1] for trace in traces])
+    end = np.concatenate([trace[1:] for trace in traces])
+    rupture = np.repeat(np.arange(len(traces)), [len(trace) - 1 for trace in traces])
+
+    # Length along each trace to the start of each segment
+    length = np.hypot(*(end - start).T)
+    cumulative = np.concatenate([[0], np.cumsum(length)])
+    first = np.searchsorted(rupture, np.arange(len(traces)))
+    rupture_length = np.add.reduceat(length, first)
+    offset = cumulative[:-1] - cumulative[first][rupture]
+
+    if np.any(rupture_length <= 0):
+        raise ValueError("Each rupture trace must have a positive length.")
+
+    return start, end, rupture, offset, rupture_length
+
+
+def project_sites(*, site_coordinates, rupture_traces, cutoff_distance=None):
+    """
+    Project sites onto rupture traces and calculate the normalized location along rupture length.
+
+    Each site is projected onto the nearest point of each rupture trace (a multi-segment
+    polyline). The normalized location is the along-strike distance from the first vertex of the
+    trace to the projected point, divided by the trace length. Sites beyond the ends of a trace
+    project onto the nearest end.
+
+    If `cutoff_distance` is provided, a KD-tree of the sites is used to skip site/rupture pairs
+    with an off-fault distance greater than the cutoff, and only the remaining pairs are
+    returned.
+
+    Parameters
+    ----------
+    site_coordinates : ArrayLike
+        Site coordinates (x, y) with shape (sites, 2).
+
+    rupture_traces : list of ArrayLike
+        Rupture traces, each with vertex coordinates (x, y) and shape (vertices, 2).
+
+    cutoff_distance : float, optional
+        Maximum off-fault distance of the returned site/rupture pairs, in coordinate units.
+        Default None (all pairs are returned).
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame with one row per site/rupture pair and the following columns:
+
+        - **site**: Site index.
+        - **rupture**: Rupture index.
+        - **location**: Normalized location along rupture length, range [0, 1.0].
+        - **along_strike**: Distance along the trace from the first vertex to the projected point.
+        - **distance**: Off-fault (shortest) distance from the site to the trace.
+        - **rupture_length**: Length of the rupture trace.
+
+    Raises
+    ------
+    ValueError
+        If a rupture trace has fewer than two vertices or zero length.
+
+    Examples
+    --------
+    The `location` column can be passed directly to the calculation functions, for example:
+
+    .. code-block:: python
+
+        pairs = project_sites(site_coordinates=sites, rupture_traces=traces, cutoff_distance=500)
+        _calc_params(
+            magnitude=magnitudes[pairs["rupture"]],
+            location=pairs["location"].to_numpy(),
+            style="strike-slip",
+            override=True,
+        )
+    """
+    import pandas as pd
+
+    sites = np.asarray(site_coordinates, dtype=float).reshape(-1, 2)
+    start, end, rupture, offset, rupture_length = _flatten_traces(rupture_traces)
+    direction = end - start
+    length = np.hypot(*direction.T)
+
+    # Candidate site/segment pairs
+    if cutoff_distance is None:
+        site_idx, segment_idx = [
+            arr.ravel() for arr in np.meshgrid(np.arange(len(sites)), np.arange(len(start)))
+        ]
+    else:
+        # Any point on a segment is within half its length of the midpoint
+        from scipy.spatial import cKDTree
+
+        tree = cKDTree(sites)
+        neighbors = tree.query_ball_point(0.5 * (start + end), r=cutoff_distance + 0.5 * length)
+        segment_idx = np.repeat(np.arange(len(start)), [len(n) for n in neighbors])
+        site_idx = np.fromiter(
+            (i for n in neighbors for i in n), dtype=int, count=len(segment_idx)
+        )
+
+    # Project sites onto the candidate segments
+    relative = sites[site_idx] - start[segment_idx]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.einsum("ij,ij->i", relative, direction[segment_idx]) / length[segment_idx] ** 2
+    t = np.clip(np.nan_to_num(t), 0, 1)
+    distance = np.hypot(*(relative - t[:, np.newaxis] * direction[segment_idx]).T)
+    along_strike = offset[segment_idx] + t * length[segment_idx]
+
+    # Keep the nearest segment for each site/rupture pair
+    pair = site_idx * len(rupture_length) + rupture[segment_idx]
+    order = np.lexsort((distance, pair))
+    _, first = np.unique(pair[order], return_index=True)
+    nearest = order[first]
+
+    if cutoff_distance is not None:
+        nearest = nearest[distance[nearest] <= cutoff_distance]
+
+    result_rupture = rupture[segment_idx[nearest]]
+    return pd.DataFrame(
+        {
+            "site": site_idx[nearest],
+            "rupture": result_rupture,
+            "location": np.clip(along_strike[nearest] / rupture_length[result_rupture], 0, 1),
+            "along_strike": along_strike[nearest],
+            "distance": distance[nearest],
+            "rupture_length": rupture_length[result_rupture],
+        }
+    )
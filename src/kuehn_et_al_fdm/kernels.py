@@ -0,0 +1,245 @@
+"""This module selects the backend of the prediction and probability hot paths: the NumPy
+functions, or compiled kernels that evaluate the parameter predictions, the Box-Cox
+transformation, and the normal distribution in a single pass over the scenarios, models, and
+displacements (or percentiles).
+
+The compiled backend requires Numba (an optional dependency) and is used by default when Numba is
+installed; otherwise, the NumPy backend is used. The backend can also be selected with
+`set_backend` or the `KEA_BACKEND` environment variable ('numpy' or 'numba'). Calculations with
+fewer than `COMPILED_MIN_SIZE` evaluations always use NumPy, so the package import and the
+startup time of small calculations (e.g., the CLI commands) are not affected, and the result of
+a calculation does not depend on whether the kernels were loaded by an earlier calculation.
+Numba is imported and the kernels are compiled (or loaded from the on-disk cache) by
+`set_backend('numba')` or by the first calculation with at least `COMPILED_MIN_SIZE`
+evaluations.
+
+The compiled backend is used by `FaultDisplacementModel.displ_site` and
+`FaultDisplacementModel.prob_exceed` (for the 'mean', 'median', 'full', 'reduced', and custom
+coefficients) and by the scenario loops of `calc_hazard`, `calc_floating_prob_exceed`, and the
+`kea-serve` batches of `calc_prob_exceed`. The results match the NumPy backend within
+floating-point tolerance.
+"""
+
+# Python imports
+import importlib.util
+import os
+import warnings
+import numpy as np
+from scipy import special
+
+# Backends and the environment variable used to select the backend
+BACKENDS = ["numpy", "numba"]
+BACKEND_ENV_VAR = "KEA_BACKEND"
+
+# Minimum number of evaluations (scenarios x models x displacements or percentiles) to use the
+# compiled kernels; importing Numba takes longer than smaller calculations with NumPy
+COMPILED_MIN_SIZE = 100_000
+
+_BACKEND = None
+_KERNELS = None
+
+
+def _numba_available():
+    """Check if Numba is installed (without importing it)."""
+    return importlib.util.find_spec("numba") is not None
+
+
+def set_backend(backend=None):
+    """
+    Select the backend of the prediction and probability hot paths.
+
+    Parameters
+    ----------
+    backend : str, optional
+        Backend (case-insensitive). Valid options are 'numpy' or 'numba'; the 'numba' option
+        loads the compiled kernels. Default None (the `KEA_BACKEND` environment variable if set,
+        otherwise 'numba' if Numba is installed and 'numpy' if not).
+
+    Returns
+    -------
+    str
+        The selected backend.
+
+    Raises
+    ------
+    ValueError
+        If `backend` is not 'numpy' or 'numba'.
+
+    ImportError
+        If `backend` is 'numba' and Numba is not installed.
+    """
+    global _BACKEND
+    if backend is None:
+        backend = os.environ.get(BACKEND_ENV_VAR, "").lower()
+        if backend == "numba" and not _numba_available():
+            warnings.warn(
+                f"\n***{BACKEND_ENV_VAR}=numba but Numba is not installed; using numpy.\n",
+                UserWarning,
+            )
+            backend = "numpy"
+        elif backend not in BACKENDS:
+            backend = "numba" if _numba_available() else "numpy"
+    else:
+        backend = backend.lower()
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"'{backend}' is an invalid 'backend'; only 'numpy' or 'numba' is allowed."
+            )
+        if backend == "numba" and not _numba_available():
+            raise ImportError("The 'numba' backend requires Numba (pip install numba).")
+        _BACKEND = backend
+        if backend == "numba":
+            _get_kernels()
+        return _BACKEND
+
+    _BACKEND = backend
+    return _BACKEND
+
+
+def get_backend():
+    """
+    Get the backend of the prediction and probability hot paths.
+
+    Returns
+    -------
+    str
+        The selected backend, 'numpy' or 'numba'.
+    """
+    return set_backend() if _BACKEND is None else _BACKEND
+
+
+def _get_kernels(size=None):
+    """
+    Get the compiled kernels, or None if the NumPy backend is selected.
+
+    The kernels are not used (or loaded) for calculations with fewer than `COMPILED_MIN_SIZE`
+    evaluations (`size`), even if they were loaded by an earlier calculation. If the kernels
+    cannot be imported or compiled, a warning is issued and the NumPy backend is selected.
+    """
+    global _KERNELS, _BACKEND
+    if get_backend() != "numba":
+        return None
+    if size is not None and size < COMPILED_MIN_SIZE:
+        return None
+
+    if _KERNELS is None:
+        try:
+            from kuehn_et_al_fdm import _numba_kernels
+
+            # Compile (or load from the on-disk cache) before the first calculation
+            coefficients = np.ones((1, 12))
+            _numba_kernels._prob_exceed(coefficients, 0, np.ones(1), np.ones(1), np.ones(1), True)
+            _numba_kernels._displ_site(
+                coefficients, 0, np.ones(1), np.ones(1), np.zeros(1), np.zeros(1, bool), True
+            )
+        except Exception as e:
+            warnings.warn(
+                f"\n***The compiled kernels are not available ({e}); using numpy.\n", UserWarning
+            )
+            _BACKEND = "numpy"
+            return None
+        _KERNELS = _numba_kernels
+
+    return _KERNELS
+
+
+def _coefficient_matrix(coefficients, names):
+    """Stack the coefficients into a C-contiguous (models, coefficients) matrix."""
+    return np.ascontiguousarray(
+        np.column_stack([np.asarray(coefficients[name], dtype=float) for name in names])
+    )
+
+
+def _calc_prob_exceed(coefficient_matrix, style, magnitude, location, displacement_array, folded):
+    """
+    Calculate the probability of exceedance with the compiled kernels.
+
+    Parameters
+    ----------
+    coefficient_matrix : numpy.ndarray
+        Model coefficients with shape (models, coefficients), with the columns in the order of
+        `model.COMMON_COEFFICIENT_NAMES` and `model.COEFFICIENT_NAMES` for the style.
+
+    style : str
+        Style of faulting (lowercase).
+
+    magnitude, location : ArrayLike
+        Scenarios; broadcast to shape (scenarios,).
+
+    displacement_array : ArrayLike
+        Test values of displacement in meters.
+
+    folded : boolean
+        Return probability of exceedance for the folded location.
+
+    Returns
+    -------
+    numpy.ndarray or None
+        Probability of exceedance with shape (scenarios, models, displacements), or None if the
+        NumPy backend is selected.
+    """
+    kernels = _get_kernels()
+    if kernels is None:
+        return None
+
+    magnitude, location = [
+        np.ascontiguousarray(np.ravel(arr), dtype=float)
+        for arr in np.broadcast_arrays(magnitude, location)
+    ]
+    return kernels._prob_exceed(
+        coefficient_matrix,
+        kernels.STYLE_CODES[style],
+        magnitude,
+        location,
+        np.ascontiguousarray(np.ravel(displacement_array), dtype=float),
+        bool(folded),
+    )
+
+
+def _calc_displ_site(coefficient_matrix, style, magnitude, location, percentile, folded):
+    """
+    Calculate the displacement in meters with the compiled kernels.
+
+    Parameters
+    ----------
+    coefficient_matrix : numpy.ndarray
+        Model coefficients with shape (models, coefficients) (see `_calc_prob_exceed`).
+
+    style : str
+        Style of faulting (lowercase).
+
+    magnitude, location : ArrayLike
+        Scenarios; broadcast to shape (scenarios,).
+
+    percentile : float or ArrayLike
+        Aleatory quantile value(s). Use -1 for mean.
+
+    folded : boolean
+        Return displacement for the folded location.
+
+    Returns
+    -------
+    numpy.ndarray or None
+        Displacement in meters with shape (scenarios, percentiles, models), or None if the
+        NumPy backend is selected.
+    """
+    kernels = _get_kernels()
+    if kernels is None:
+        return None
+
+    magnitude, location = [
+        np.ascontiguousarray(np.ravel(arr), dtype=float)
+        for arr in np.broadcast_arrays(magnitude, location)
+    ]
+    percentile = np.ravel(np.asarray(percentile, dtype=float))
+    is_mean = percentile == -1
+    z = special.ndtri(np.where(is_mean, 0.5, percentile))
+    return kernels._displ_site(
+        coefficient_matrix,
+        kernels.STYLE_CODES[style],
+        magnitude,
+        location,
+        z,
+        is_mean,
+        bool(folded),
+    )
@@ -2,10 +2,17 @@
 
 # Python imports
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
+import csv
 import os
-import pandas as pd
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Module imports
+from kuehn_et_al_fdm.profiling import _profile_stage
 
 # Define paths and files
 dir_data = Path(os.path.join(os.path.dirname(__file__), "data"))
@@ -22,6 +29,18 @@ point_posterior_files = {
     "normal": "coefficients_mean_NM_powtr.csv",
 }
 
+covariance_files = {
+    "strike-slip": "coefficients_covariance_SS_powtr.csv",
+    "reverse": "coefficients_covariance_REV_powtr.csv",
+    "normal": "coefficients_covariance_NM_powtr.csv",
+}
+
+correlation_files = {
+    "strike-slip": "coefficients_correlation_SS_powtr.csv",
+    "reverse": "coefficients_correlation_REV_powtr.csv",
+    "normal": "coefficients_correlation_NM_powtr.csv",
+}
+
 uncertainty_files = {
     "strike-slip": "uncertainty_SS.csv",
     "reverse": "uncertainty_REV.csv",
@@ -30,7 +49,7 @@ uncertainty_files = {
 
 
 # Function to load data
-def _load_data(filepath: Union[str, Path]) -> pd.DataFrame:
+def _load_data(filepath: Union[str, Path]) -> "pd.DataFrame":
     """
     Load model coefficients.
 
@@ -49,6 +68,9 @@ def _load_data(filepath: Union[str, Path]) -> pd.DataFrame:
     FileNotFoundError
         If the file does not exist at the provided filepath.
     """
+    # Pandas is imported on first use so the numerical core does not depend on it
+    import pandas as pd
+
     if not isinstance(filepath, Path):
         filepath = Path(filepath)
 
@@ -60,36 +82,177 @@ def _load_data(filepath: Union[str, Path]) -> pd.DataFrame:
     return data
 
 
-# Import full model coefficients
-full_posterior_ss = _load_data(dir_data / full_posterior_files["strike-slip"])
-full_posterior_rv = _load_data(dir_data / full_posterior_files["reverse"])
-full_posterior_nm = _load_data(dir_data / full_posterior_files["normal"])
+def _load_matrix(filepath: Union[str, Path]) -> "pd.DataFrame":
+    """
+    Load a covariance or correlation matrix of the model coefficients.
+
+    Parameters
+    ----------
+    filepath : Union[str, pathlib.Path]
+        The path to the CSV file containing the matrix.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A square DataFrame indexed by coefficient name. Coefficient names are renamed to match the
+        coefficient files (e.g., 's_m.s1' is renamed to 's_m,s1').
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist at the provided filepath.
+    """
+    data = _load_data(filepath).set_index("model_id")
+    data.index.name = None
+    data = data.rename(index=lambda x: x.replace(".", ","), columns=lambda x: x.replace(".", ","))
+
+    return data
+
+
+def _load_records(filepath: Union[str, Path]) -> np.recarray:
+    """
+    Load model coefficients without pandas.
+
+    Parameters
+    ----------
+    filepath : Union[str, pathlib.Path]
+        The path to the CSV file containing the model coefficients.
+
+    Returns
+    -------
+    numpy.recarray
+        A numpy recarray containing the model coefficients, with the same fields as the
+        DataFrame from `_load_data`.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist at the provided filepath.
+    """
+    filepath = Path(filepath)
+
+    try:
+        with open(filepath, newline="") as f:
+            header, *rows = list(csv.reader(f))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File {filepath.resolve()} not found.")
+
+    columns = list(zip(*rows))
+    try:
+        model_id = np.array(columns[0], dtype=np.int64)
+    except ValueError:
+        model_id = np.array(columns[0], dtype=object)
+
+    arrays = [model_id] + [np.array(column, dtype=float) for column in columns[1:]]
+    return np.rec.fromarrays(arrays, names=["model_id"] + header[1:])
+
 
-# Import point model coefficients
-point_posterior_ss = _load_data(dir_data / point_posterior_files["strike-slip"])
-point_posterior_rv = _load_data(dir_data / point_posterior_files["reverse"])
-point_posterior_nm = _load_data(dir_data / point_posterior_files["normal"])
+class _LazyTables(dict):
+    """Dictionary of data tables by style of faulting, which are loaded on first access."""
 
-# Import epistemic uncertainties
-unc_ss = _load_data(dir_data / uncertainty_files["strike-slip"])
-unc_rv = _load_data(dir_data / uncertainty_files["reverse"])
-unc_nm = _load_data(dir_data / uncertainty_files["normal"])
+    def __init__(self, files, loader):
+        super().__init__()
+        self._files, self._loader = files, loader
 
-# Create data dictionary
+    def __missing__(self, style):
+        self[style] = self._loader(dir_data / self._files[style])
+        return self[style]
+
+
+# Create data dictionary; the CSV files are loaded on first use
 DATA = {
-    "full": {
-        "strike-slip": full_posterior_ss,
-        "reverse": full_posterior_rv,
-        "normal": full_posterior_nm,
-    },
-    "point": {
-        "strike-slip": point_posterior_ss,
-        "reverse": point_posterior_rv,
-        "normal": point_posterior_nm,
-    },
-    "uncertainty": {
-        "strike-slip": unc_ss,
-        "reverse": unc_rv,
-        "normal": unc_nm,
-    },
+    "full": _LazyTables(full_posterior_files, _load_data),
+    "point": _LazyTables(point_posterior_files, _load_data),
+    "covariance": _LazyTables(covariance_files, _load_matrix),
+    "correlation": _LazyTables(correlation_files, _load_matrix),
+    "uncertainty": _LazyTables(uncertainty_files, _load_data),
+    "reduced": {},
 }
+
+# Model coefficients as numpy recarrays for the calculations
+RECORDS = {
+    "full": _LazyTables(full_posterior_files, _load_records),
+    "point": _LazyTables(point_posterior_files, _load_records),
+}
+
+# Reduced coefficient tables and their recarrays, which are converted once for each table
+_REDUCED_RECORDS = {}
+
+
+@_profile_stage("coefficients")
+def _get_coefficients(style, coefficient_type):
+    """
+    Select the model coefficients for a style and coefficient type.
+
+    Parameters
+    ----------
+    style : str
+        Style of faulting (lower case). Valid options are 'strike-slip', 'reverse', or 'normal'.
+
+    coefficient_type : str
+        Coefficient type (lower case). Valid options are 'mean', 'median', 'full', or 'reduced'.
+
+    Returns
+    -------
+    numpy.recarray
+        A numpy recarray containing the model coefficients.
+
+    Raises
+    ------
+    ValueError
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
+
+    Notes
+    ------
+    The default reduced set of coefficients is created on first use and stored in
+    `DATA["reduced"]`. A custom reduced set (e.g., from `reduce_posterior`) can be used by
+    assigning it to `DATA["reduced"][style]`. The recarray is created once for each assigned
+    table, so the table should be replaced rather than modified in place.
+    """
+    if coefficient_type == "full":
+        return RECORDS["full"][style]
+
+    if coefficient_type == "reduced":
+        if style not in DATA["reduced"]:
+            from kuehn_et_al_fdm.reduce_posterior import reduce_posterior
+
+            DATA["reduced"][style], _ = reduce_posterior(style=style)
+        table = DATA["reduced"][style]
+        if style not in _REDUCED_RECORDS or _REDUCED_RECORDS[style][0] is not table:
+            _REDUCED_RECORDS[style] = (table, table.to_records(index=False))
+        return _REDUCED_RECORDS[style][1]
+
+    if coefficient_type not in ["mean", "median"]:
+        raise ValueError(
+            f"'{coefficient_type}' is an invalid 'coefficient_type';"
+            " only 'mean', 'median', 'full', or 'reduced' is allowed."
+        )
+
+    coeffs = RECORDS["point"][style]
+    return coeffs[coeffs["model_id"] == coefficient_type]
+
+
+@_profile_stage("coefficients")
+def _get_weights(style, coefficient_type):
+    """
+    Get the weights of the model coefficients for a style and coefficient type.
+
+    Parameters
+    ----------
+    style : str
+        Style of faulting (lower case). Valid options are 'strike-slip', 'reverse', or 'normal'.
+
+    coefficient_type : str
+        Coefficient type (lower case). Valid options are 'mean', 'median', 'full', or 'reduced'.
+
+    Returns
+    -------
+    numpy.ndarray
+        Weights of the model coefficients, which sum to one. The full set of coefficients is
+        equally weighted.
+    """
+    coeffs = _get_coefficients(style, coefficient_type)
+    if "weight" in coeffs.dtype.names:
+        return np.asarray(coeffs["weight"], dtype=float)
+
+    return np.full(len(coeffs), 1 / len(coeffs))
@@ -0,0 +1,431 @@
+"""This module contains a model object for a style of faulting and a set of model coefficients.
+The model is constructed once, with the coefficients prepared as contiguous arrays and the
+style-specific prediction functions selected, so that repeated calculations skip the per-call
+setup (input type checks, coefficient selection, and dispatching on the style of faulting).
+"""
+
+# Python imports
+import numpy as np
+
+# Module imports
+from kuehn_et_al_fdm.kernels import (
+    _calc_displ_site,
+    _calc_prob_exceed,
+    _coefficient_matrix,
+    _get_kernels,
+)
+from kuehn_et_al_fdm.load_data import _get_coefficients, _get_weights
+from kuehn_et_al_fdm.prediction_functions import _func_nm, _func_rv, _func_ss
+from kuehn_et_al_fdm.transformation_functions import (
+    _calc_analytic_mean,
+    _calc_folded_transformed_displ,
+    _calc_norm_cdf,
+    _calc_transformed_displ,
+    _convert_bc_to_meters,
+)
+from kuehn_et_al_fdm.utilities import _check_location_range, _check_magnitude_range
+
+# Prediction functions and required coefficients for each style of faulting
+FUNCTION_MAP = {"strike-slip": _func_ss, "reverse": _func_rv, "normal": _func_nm}
+COEFFICIENT_NAMES = {
+    "strike-slip": ["s_m,s1", "s_m,s2", "s_m,s3", "s_s1", "s_s2"],
+    "reverse": ["s_m,r", "s_r1", "s_r2"],
+    "normal": ["sigma", "s_m,n1", "s_m,n2", "s_m,n3"],
+}
+COMMON_COEFFICIENT_NAMES = ["c1", "c2", "c3", "alpha", "beta", "gamma", "lambda"]
+
+# Coefficient types that are prepared once and shared
+_MODELS = {}
+
+# Reduced coefficients and their models, which are prepared once for each set of coefficients
+_REDUCED_MODELS = {}
+
+
+class FaultDisplacementModel:
+    """
+    Fault displacement model for a style of faulting and a set of model coefficients.
+
+    The coefficients are selected and prepared once, so the methods skip the per-call setup of
+    the module-level functions. The methods accept a scalar or an array of scenarios; results
+    for coefficient sets with more than one row (e.g., the 'full' coefficients) have a model
+    axis (see the methods). The `displ_site` and `prob_exceed` methods use the compiled kernels
+    for large calculations if Numba is installed (see `kernels`).
+
+    Parameters
+    ----------
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    coefficient_type : str, optional
+        Model coefficients (case-insensitive). Valid options are 'mean', 'median', 'full', or
+        'reduced'. Ignored if `coefficients` is provided. Default 'median'.
+
+    coefficients : Union[pandas.DataFrame, numpy.recarray, dict], optional
+        Custom set of model coefficients with the columns for the style of faulting (and
+        optionally 'model_id' and 'weight'). Default None.
+
+    Raises
+    ------
+    ValueError
+        If `style` is not 'strike-slip', 'reverse', or 'normal'.
+
+    ValueError
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
+
+    KeyError
+        If a required coefficient is not in the custom coefficients.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from kuehn_et_al_fdm.model import FaultDisplacementModel
+
+        model = FaultDisplacementModel("strike-slip")
+        model.displ_site(magnitude=7, location=0.25, percentile=0.84)
+        model.prob_exceed(magnitude=7, location=0.25, displacement_array=[0.1, 1, 3])
+    """
+
+    def __init__(self, style, coefficient_type="median", coefficients=None):
+        style = style.lower()
+        if style not in FUNCTION_MAP:
+            raise ValueError(
+                f"'{style}' is an invalid 'style';"
+                " only 'strike-slip', 'reverse', or 'normal' is allowed."
+            )
+        self.style = style
+
+        if coefficients is None:
+            self.coefficient_type = coefficient_type.lower()
+            coefficients = _get_coefficients(style, self.coefficient_type)
+            weights = _get_weights(style, self.coefficient_type)
+        else:
+            self.coefficient_type = "custom"
+            weights = None
+
+        # Contiguous arrays for each coefficient
+        names = COMMON_COEFFICIENT_NAMES + COEFFICIENT_NAMES[style]
+        self._coefficients = {
+            name: np.ascontiguousarray(coefficients[name], dtype=float) for name in names
+        }
+        n_models = len(self._coefficients["c1"])
+
+        if "model_id" in _get_names(coefficients):
+            self.model_id = np.asarray(coefficients["model_id"])
+        else:
+            self.model_id = np.arange(n_models)
+        self._coefficients["model_id"] = self.model_id
+
+        if weights is None and "weight" in _get_names(coefficients):
+            weights = np.asarray(coefficients["weight"], dtype=float)
+        self.weights = np.full(n_models, 1 / n_models) if weights is None else weights
+
+        self._kernel = FUNCTION_MAP[style]
+
+        # Coefficient matrix for the compiled kernels (see `kernels`)
+        self._matrix = _coefficient_matrix(self._coefficients, names)
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(style='{self.style}', "
+            f"coefficient_type='{self.coefficient_type}', n_models={self.n_models})"
+        )
+
+    @property
+    def n_models(self):
+        """Number of rows in the set of model coefficients."""
+        return len(self.model_id)
+
+    def _model_axis(self, values):
+        """Add a trailing model axis to scenario arrays if there is more than one model."""
+        values = np.asarray(values, dtype=float)
+        return values[..., np.newaxis] if self.n_models > 1 and values.ndim > 0 else values
+
+    def params(self, magnitude, location):
+        """
+        Calculate the predicted statistical distribution parameters.
+
+        The coefficients are broadcast against the magnitude and location, so arrays of
+        scenarios need a trailing model axis if there is more than one model (e.g.,
+        ``magnitude[:, np.newaxis]``).
+
+        Parameters
+        ----------
+        magnitude : ArrayLike
+            Earthquake moment magnitude.
+
+        location : ArrayLike
+            Normalized location along rupture length, range [0, 1.0].
+
+        Returns
+        -------
+        tuple
+            - 'model_id': Model coefficient row number or point estimate definition.
+            - 'bc_param': Box-Cox transformation parameter (lambda).
+            - 'mean': Mean displacement in transformed units (unfolded).
+            - 'stdv_total': Total standard deviation in transformed units (unfolded).
+            - 'stdv_within': Within-event standard deviation in transformed units (unfolded).
+            - 'stdv_between': Between-event standard deviation in transformed units (unfolded).
+
+        Raises
+        ------
+        ValueError
+            If `location` is not within range [0, 1].
+
+        Warns
+        -----
+        UserWarning
+            If `magnitude` is not within the recommended range for that style.
+        """
+        magnitude = np.asarray(magnitude, dtype=float)
+        location = np.asarray(location, dtype=float)
+        _check_location_range(location)
+        _check_magnitude_range(magnitude, self.style)
+        return self._kernel(self._coefficients, magnitude, location)
+
+    def displ_site(self, magnitude, location, percentile, folded=True, exact_folded=False):
+        """
+        Calculate the predicted displacement in meters (see `calc_displ_site`).
+
+        Parameters
+        ----------
+        magnitude : ArrayLike
+            Earthquake moment magnitude.
+
+        location : ArrayLike
+            Normalized location along rupture length, range [0, 1.0].
+
+        percentile : float
+            Aleatory quantile value. Use -1 for mean.
+
+        folded : boolean, optional
+            Return displacement for the folded location. Default True.
+
+        exact_folded : boolean, optional
+            Use the exact percentile of the folded mixture distribution. Default False.
+
+        Returns
+        -------
+        numpy.ndarray
+            Displacement in meters, with the shape of the broadcast magnitude and location (and
+            a trailing model axis for more than one model). A scalar scenario returns an array
+            with one element per model.
+        """
+        if not exact_folded and np.ndim(percentile) == 0:
+            shape = np.broadcast(magnitude, location).shape
+            displ_meters = self._compiled_displ_site(magnitude, location, percentile, folded)
+            if displ_meters is not None:
+                displ_meters = displ_meters[:, 0, :]
+                if not shape:
+                    return displ_meters.reshape(-1)
+                return displ_meters.reshape(shape + ((-1,) if self.n_models > 1 else ()))
+
+        magnitude, location = self._model_axis(magnitude), self._model_axis(location)
+        _, bc_param, mean_site, stdv_site, _, _ = self.params(magnitude, location)
+        Y_site = _calc_transformed_displ(bc_param, mean_site, stdv_site, percentile)
+        if not folded:
+            return _convert_bc_to_meters(Y_site, bc_param)
+
+        _, _, mean_complement, stdv_complement, _, _ = self.params(magnitude, 1 - location)
+        if exact_folded:
+            Y_folded = _calc_folded_transformed_displ(
+                bc_param, mean_site, stdv_site, mean_complement, stdv_complement, percentile
+            )
+        else:
+            Y_complement = _calc_transformed_displ(
+                bc_param, mean_complement, stdv_complement, percentile
+            )
+            Y_folded = np.mean([Y_site, Y_complement], axis=0)
+        return _convert_bc_to_meters(Y_folded, bc_param)
+
+    def displ_profile(self, magnitude, percentile, location_step=0.05, folded=True):
+        """
+        Calculate the predicted displacement profile in meters (see `calc_displ_profile`).
+
+        Parameters
+        ----------
+        magnitude : float
+            Earthquake moment magnitude.
+
+        percentile : float
+            Aleatory quantile value. Use -1 for mean.
+
+        location_step : float, optional
+            Profile location step interval. Default 0.05.
+
+        folded : boolean, optional
+            Return displacement for the folded location. Default True.
+
+        Returns
+        -------
+        tuple
+            - 'locations': Normalized locations along the rupture length.
+            - 'displacements': Displacement in meters for each location (and each model).
+        """
+        locations = np.arange(0, 1 + location_step, location_step)
+        displ_meters = self.displ_site(magnitude, locations, percentile, folded=folded)
+        return locations, displ_meters
+
+    def displ_avg(self, magnitude):
+        """
+        Calculate the median predicted average displacement in meters (see `calc_displ_avg`).
+
+        Parameters
+        ----------
+        magnitude : float
+            Earthquake moment magnitude.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            Average displacement in meters (for each model if there is more than one model).
+        """
+        # Dense location spacing is used to create well-descritized profile for intergration
+        locations = np.arange(0, 1.01, 0.01)
+        _, bc_param, mean, _, stdv_within, _ = self.params(magnitude, self._model_axis(locations))
+
+        # Use within-event variability only for median AD; see manucript for discussion
+        mean_displ_meters = _calc_analytic_mean(bc_param, mean, stdv_within)
+        return np.trapz(mean_displ_meters, locations, axis=0)
+
+    def prob_exceed(self, magnitude, location, displacement_array, folded=True):
+        """
+        Calculate the probability of exceedance (see `calc_prob_exceed`).
+
+        Parameters
+        ----------
+        magnitude : ArrayLike
+            Earthquake moment magnitude.
+
+        location : ArrayLike
+            Normalized location along rupture length, range [0, 1.0].
+
+        displacement_array : ArrayLike
+            Test values of displacement in meters.
+
+        folded : boolean, optional
+            Return probability of exceedance for the folded location. Default True.
+
+        Returns
+        -------
+        numpy.ndarray
+            Probability of exceedance for a scalar scenario, for each displacement (and each
+            model, on the first axis, if there is more than one model). For an array of
+            scenarios, the shape is the broadcast shape of the magnitude and location followed
+            by the model and displacement axes (e.g., (scenarios, models, displacements)).
+        """
+        magnitude = np.asarray(magnitude, dtype=float)
+        location = np.asarray(location, dtype=float)
+        displ = np.atleast_1d(np.asarray(displacement_array, dtype=float))
+        scenario_shape = np.broadcast(magnitude, location).shape
+
+        probex = self._compiled_prob_exceed(magnitude, location, displ, folded)
+        if probex is None:
+            # Scenario axes, then model and displacement axes
+            magnitude, location = magnitude[..., np.newaxis], location[..., np.newaxis]
+            _, bc_param, mean_site, stdv_site, _, _ = self.params(magnitude, location)
+            bc_param = np.asarray(bc_param)[:, np.newaxis]
+            transformed_displ = (displ**bc_param - 1) / bc_param
+
+            probex = 1 - _calc_norm_cdf(
+                transformed_displ, mean_site[..., np.newaxis], stdv_site[..., np.newaxis]
+            )
+            if folded:
+                _, _, mean_complement, stdv_complement, _, _ = self.params(magnitude, 1 - location)
+                probex_complement = 1 - _calc_norm_cdf(
+                    transformed_displ,
+                    mean_complement[..., np.newaxis],
+                    stdv_complement[..., np.newaxis],
+                )
+                probex = np.mean((probex, probex_complement), axis=0)
+
+        if not scenario_shape:
+            return np.reshape(probex, (self.n_models, -1)).squeeze()
+        return np.reshape(probex, scenario_shape + (self.n_models, -1))
+
+    def _compiled_prob_exceed(self, magnitude, location, displacement_array, folded=True):
+        """
+        Calculate the probability of exceedance with shape (scenarios, models, displacements)
+        with the compiled kernels, or return None if the NumPy backend is selected (or the
+        kernels are not loaded for a small calculation).
+        """
+        size = np.broadcast(magnitude, location).size * self.n_models * np.size(displacement_array)
+        if _get_kernels(size) is None:
+            return None
+        _check_location_range(location)
+        _check_magnitude_range(magnitude, self.style)
+        return _calc_prob_exceed(
+            self._matrix, self.style, magnitude, location, displacement_array, folded
+        )
+
+    def _compiled_displ_site(self, magnitude, location, percentile, folded=True):
+        """
+        Calculate the displacement in meters with shape (scenarios, percentiles, models) with the
+        compiled kernels, or return None if the NumPy backend is selected (or the kernels are not
+        loaded for a small calculation).
+        """
+        size = np.broadcast(magnitude, location).size * self.n_models * np.size(percentile)
+        if _get_kernels(size) is None:
+            return None
+        _check_location_range(location)
+        _check_magnitude_range(magnitude, self.style)
+        return _calc_displ_site(self._matrix, self.style, magnitude, location, percentile, folded)
+
+    def prob_occur(self, magnitude, location_array, displacement_array):
+        """
+        Calculate the percentile rank of observations (see `calc_prob_occur`).
+
+        Parameters
+        ----------
+        magnitude : float
+            Earthquake moment magnitude.
+
+        location_array : ArrayLike
+            Normalized locations along rupture length, range [0, 1.0].
+
+        displacement_array : ArrayLike
+            Observed displacements in meters, with the same shape as `location_array`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Percentile rank of each observation (and for each model if there is more than one
+            model).
+        """
+        location_array = self._model_axis(np.atleast_1d(location_array))
+        displacement_array = self._model_axis(np.atleast_1d(displacement_array))
+        _, bc_param, mean_site, stdv_site, _, _ = self.params(magnitude, location_array)
+        transformed_displ = (displacement_array**bc_param - 1) / bc_param
+        return _calc_norm_cdf(transformed_displ, mean_site, stdv_site)
+
+
+def _get_names(coefficients):
+    """Get the column names of a set of coefficients."""
+    if hasattr(coefficients, "columns"):
+        return list(coefficients.columns)
+    if hasattr(coefficients, "dtype"):
+        return list(coefficients.dtype.names)
+    return list(coefficients)
+
+
+def _get_model(style, coefficient_type):
+    """
+    Get the shared model for a style and coefficient type.
+
+    The models for the 'mean', 'median', and 'full' coefficients are created once. The 'reduced'
+    coefficients can be replaced (see `load_data._get_coefficients`), so that model is created
+    once for each set of reduced coefficients.
+    """
+    style, coefficient_type = style.lower(), coefficient_type.lower()
+    if coefficient_type == "reduced":
+        coefficients = _get_coefficients(style, coefficient_type)
+        if style not in _REDUCED_MODELS or _REDUCED_MODELS[style][0] is not coefficients:
+            model = FaultDisplacementModel(style, coefficient_type)
+            _REDUCED_MODELS[style] = (coefficients, model)
+        return _REDUCED_MODELS[style][1]
+
+    key = (style, coefficient_type)
+    if key not in _MODELS:
+        _MODELS[key] = FaultDisplacementModel(style, coefficient_type)
+    return _MODELS[key]
@@ -2,7 +2,9 @@
 
 # Python imports
 import numpy as np
-import pandas as pd
+
+# Module imports
+from kuehn_et_al_fdm.profiling import _profile_stage
 
 # Model constants
 MAG_BREAK, DELTA = 7.0, 0.1
@@ -14,8 +16,9 @@ def _func_mode(coefficients, magnitude):
 
     Parameters
     ----------
-    coefficients : Union[np.recarray, pd.DataFrame]
-        A numpy recarray or a pandas DataFrame containing model coefficients.
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
 
     magnitude : float
         Earthquake moment magnitude.
@@ -35,14 +38,16 @@ def _func_mode(coefficients, magnitude):
     return fm
 
 
+@_profile_stage("mean")
 def _func_mu(coefficients, magnitude, location):
     """
     Calculate mean prediction in transformed units.
 
     Parameters
     ----------
-    coefficients : Union[np.recarray, pd.DataFrame]
-        A numpy recarray or a pandas DataFrame containing model coefficients.
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
 
     magnitude : float
         Earthquake moment magnitude.
@@ -69,14 +74,16 @@ def _func_mu(coefficients, magnitude, location):
     return np.asarray(mu)
 
 
+@_profile_stage("stdv")
 def _func_sd_mode_bilinear(coefficients, magnitude):
     """
     Calculate standard deviation of the mode in transformed units.
 
     Parameters
     ----------
-    coefficients : Union[np.recarray, pd.DataFrame]
-        A numpy recarray or a pandas DataFrame containing model coefficients.
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
 
     magnitude : float
         Earthquake moment magnitude.
@@ -100,14 +107,16 @@ def _func_sd_mode_bilinear(coefficients, magnitude):
     return np.asarray(sd)
 
 
+@_profile_stage("stdv")
 def _func_sd_mode_sigmoid(coefficients, magnitude):
     """
     Calculate standard deviation of the mode in transformed units.
 
     Parameters
     ----------
-    coefficients : Union[np.recarray, pd.DataFrame]
-        A numpy recarray or a pandas DataFrame containing model coefficients.
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
 
     magnitude : float
         Earthquake moment magnitude.
@@ -127,14 +136,16 @@ def _func_sd_mode_sigmoid(coefficients, magnitude):
     return np.asarray(sd)
 
 
+@_profile_stage("stdv")
 def _func_sd_u(coefficients, location):
     """
     Calculate standard deviation of the location in transformed units.
 
     Parameters
     ----------
-    coefficients : Union[np.recarray, pd.DataFrame]
-        A numpy recarray or a pandas DataFrame containing model coefficients.
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
 
     location : float
         Normalized location along rupture length, range [0, 1.0].
@@ -149,15 +160,20 @@ def _func_sd_u(coefficients, location):
     Used only for strike-slip and reverse faulting.
     """
     # Column name2 for stdv coefficients "s_" varies for style of faulting, fix that here
-    if isinstance(coefficients, pd.DataFrame):
+    # Duck-typed so pandas is not required for the numerical core
+    if hasattr(coefficients, "columns"):
         s_1 = coefficients["s_s1"] if "s_s1" in coefficients.columns else coefficients["s_r1"]
         s_2 = coefficients["s_s2"] if "s_s2" in coefficients.columns else coefficients["s_r2"]
     elif isinstance(coefficients, np.recarray):
         s_1 = coefficients["s_s1"] if "s_s1" in coefficients.dtype.names else coefficients["s_r1"]
         s_2 = coefficients["s_s2"] if "s_s2" in coefficients.dtype.names else coefficients["s_r2"]
+    elif isinstance(coefficients, dict):
+        s_1 = coefficients["s_s1"] if "s_s1" in coefficients else coefficients["s_r1"]
+        s_2 = coefficients["s_s2"] if "s_s2" in coefficients else coefficients["s_r2"]
     else:
         raise TypeError(
-            "Function argument for model coefficients must be pandas DataFrame or numpy recarray."
+            "Function argument for model coefficients must be pandas DataFrame, numpy recarray,"
+            " or dictionary of arrays."
         )
 
     alpha = coefficients["alpha"]
@@ -174,8 +190,9 @@ def _func_ss(coefficients, magnitude, location):
 
     Parameters
     ----------
-    coefficients : Union[np.recarray, pd.DataFrame]
-        A numpy recarray or a pandas DataFrame containing model coefficients.
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
 
     magnitude : float
         Earthquake moment magnitude.
@@ -217,8 +234,9 @@ def _func_nm(coefficients, magnitude, location):
 
     Parameters
     ----------
-    coefficients : Union[np.recarray, pd.DataFrame]
-        A numpy recarray or a pandas DataFrame containing model coefficients.
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
 
     magnitude : float
         Earthquake moment magnitude.
@@ -241,7 +259,7 @@ def _func_nm(coefficients, magnitude, location):
 
     # Calculate standard deviations
     sd_mode = _func_sd_mode_sigmoid(coefficients, magnitude)
-    sd_u = np.full(len(mu), coefficients["sigma"])
+    sd_u = np.full(np.shape(mu), coefficients["sigma"])
     sd_total = np.sqrt(np.power(sd_mode, 2) + np.power(sd_u, 2))
 
     # Transformation parameter
@@ -260,8 +278,9 @@ def _func_rv(coefficients, magnitude, location):
 
     Parameters
     ----------
-    coefficients : Union[np.recarray, pd.DataFrame]
-        A numpy recarray or a pandas DataFrame containing model coefficients.
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
 
     magnitude : float
         Earthquake moment magnitude.
@@ -283,7 +302,7 @@ def _func_rv(coefficients, magnitude, location):
     mu = _func_mu(coefficients, magnitude, location)
 
     # Calculate standard deviations
-    sd_mode = np.full(len(mu), coefficients["s_m,r"])
+    sd_mode = np.full(np.shape(mu), coefficients["s_m,r"])
     sd_u = _func_sd_u(coefficients, location)
     sd_total = np.sqrt(np.power(sd_mode, 2) + np.power(sd_u, 2))
 
@@ -294,3 +313,297 @@ def _func_rv(coefficients, magnitude, location):
     model_id = coefficients["model_id"]
 
     return model_id, lam, mu, sd_total, sd_u, sd_mode
+
+
+def _grad_func_mode(coefficients, magnitude):
+    """
+    Calculate the gradient of the magnitude scaling with respect to the model coefficients.
+
+    Parameters
+    ----------
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
+
+    magnitude : float
+        Earthquake moment magnitude.
+
+    Returns
+    -------
+    dict
+        Partial derivatives of the mode in transformed units, keyed by coefficient name.
+    """
+    softplus = DELTA * np.log(1 + np.exp((magnitude - MAG_BREAK) / DELTA))
+    ones = np.ones_like(coefficients["c1"], dtype=float)
+
+    return {
+        "c1": ones,
+        "c2": (magnitude - MAG_BREAK) - softplus,
+        "c3": softplus * ones,
+    }
+
+
+def _grad_func_mu(coefficients, magnitude, location):
+    """
+    Calculate the gradient of the mean prediction with respect to the model coefficients.
+
+    Parameters
+    ----------
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
+
+    magnitude : float
+        Earthquake moment magnitude.
+
+    location : np.array
+        Normalized location along rupture length, range [0, 1.0].
+
+    Returns
+    -------
+    dict
+        Partial derivatives of the mean prediction in transformed units, keyed by coefficient name.
+    """
+    alpha = coefficients["alpha"]
+    beta = coefficients["beta"]
+    gamma = coefficients["gamma"]
+
+    peak = np.power(alpha / (alpha + beta), alpha) * np.power(beta / (alpha + beta), beta)
+    shape = np.power(location, alpha) * np.power(1 - location, beta)
+
+    # The shape function and its derivatives vanish at the rupture ends
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d_shape_alpha = np.where(shape > 0, shape * np.log(location), 0)
+        d_shape_beta = np.where(shape > 0, shape * np.log(1 - location), 0)
+
+    grad = _grad_func_mode(coefficients, magnitude)
+    grad.update(
+        {
+            "alpha": gamma * (d_shape_alpha - peak * np.log(alpha / (alpha + beta))),
+            "beta": gamma * (d_shape_beta - peak * np.log(beta / (alpha + beta))),
+            "gamma": shape - peak,
+        }
+    )
+    return grad
+
+
+def _grad_func_sd_mode_bilinear(coefficients, magnitude):
+    """
+    Calculate the gradient of the bilinear standard deviation of the mode with respect to the
+    model coefficients.
+
+    Parameters
+    ----------
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
+
+    magnitude : float
+        Earthquake moment magnitude.
+
+    Returns
+    -------
+    dict
+        Partial derivatives of the standard deviation of the mode, keyed by coefficient name.
+    """
+    x = (magnitude - coefficients["s_m,s3"]) / DELTA
+    softplus = DELTA * np.log(1 + np.exp(x))
+    sigmoid = 1 / (1 + np.exp(-x))
+
+    return {
+        "s_m,s1": np.ones_like(x, dtype=float),
+        "s_m,s2": (magnitude - coefficients["s_m,s3"]) - softplus,
+        "s_m,s3": -coefficients["s_m,s2"] * (1 - sigmoid),
+    }
+
+
+def _grad_func_sd_mode_sigmoid(coefficients, magnitude):
+    """
+    Calculate the gradient of the sigmoidal standard deviation of the mode with respect to the
+    model coefficients.
+
+    Parameters
+    ----------
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
+
+    magnitude : float
+        Earthquake moment magnitude.
+
+    Returns
+    -------
+    dict
+        Partial derivatives of the standard deviation of the mode, keyed by coefficient name.
+    """
+    sigmoid = 1 / (1 + np.exp(-1 * coefficients["s_m,n3"] * (magnitude - MAG_BREAK)))
+
+    return {
+        "s_m,n1": np.ones_like(sigmoid, dtype=float),
+        "s_m,n2": -sigmoid,
+        "s_m,n3": -coefficients["s_m,n2"] * sigmoid * (1 - sigmoid) * (magnitude - MAG_BREAK),
+    }
+
+
+def _grad_func_sd_u(coefficients, location):
+    """
+    Calculate the gradient of the standard deviation of the location with respect to the model
+    coefficients.
+
+    Parameters
+    ----------
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
+
+    location : float
+        Normalized location along rupture length, range [0, 1.0].
+
+    Returns
+    -------
+    dict
+        Partial derivatives of the standard deviation of the location, keyed by coefficient name.
+
+    Notes
+    ------
+    Used only for strike-slip and reverse faulting.
+    """
+    names = coefficients.columns if hasattr(coefficients, "columns") else coefficients.dtype.names
+    prefix = "s_s" if "s_s1" in names else "s_r"
+
+    alpha = coefficients["alpha"]
+    beta = coefficients["beta"]
+    offset = location - alpha / (alpha + beta)
+    s_2 = coefficients[f"{prefix}2"]
+
+    return {
+        f"{prefix}1": np.ones_like(offset, dtype=float),
+        f"{prefix}2": np.power(offset, 2),
+        "alpha": -2 * s_2 * offset * beta / np.power(alpha + beta, 2),
+        "beta": 2 * s_2 * offset * alpha / np.power(alpha + beta, 2),
+    }
+
+
+def _grad_func_sd_total(sd_mode, sd_u, grad_sd_mode, grad_sd_u):
+    """Combine the gradients of the between- and within-event standard deviations."""
+    sd_total = np.sqrt(np.power(sd_mode, 2) + np.power(sd_u, 2))
+    grad = {}
+    for name, value in grad_sd_mode.items():
+        grad[name] = grad.get(name, 0) + sd_mode * value / sd_total
+    for name, value in grad_sd_u.items():
+        grad[name] = grad.get(name, 0) + sd_u * value / sd_total
+    return grad
+
+
+def _grad_func_ss(coefficients, magnitude, location):
+    """
+    Calculate the gradients of the mean prediction and total standard deviation (in transformed
+    units) with respect to the model coefficients for strike-slip faulting.
+
+    Parameters
+    ----------
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
+
+    magnitude : float
+        Earthquake moment magnitude.
+
+    location : float
+        Normalized location along rupture length, range [0, 1.0].
+
+    Returns
+    -------
+    Tuple[dict, dict]
+        - 'grad_mu' : Partial derivatives of the mean prediction, keyed by coefficient name.
+        - 'grad_sd_total' : Partial derivatives of the total standard deviation, keyed by
+          coefficient name.
+    """
+    grad_mu = _grad_func_mu(coefficients, magnitude, location)
+
+    sd_mode = _func_sd_mode_bilinear(coefficients, magnitude)
+    sd_u = _func_sd_u(coefficients, location)
+    grad_sd_total = _grad_func_sd_total(
+        sd_mode,
+        sd_u,
+        _grad_func_sd_mode_bilinear(coefficients, magnitude),
+        _grad_func_sd_u(coefficients, location),
+    )
+
+    return grad_mu, grad_sd_total
+
+
+def _grad_func_nm(coefficients, magnitude, location):
+    """
+    Calculate the gradients of the mean prediction and total standard deviation (in transformed
+    units) with respect to the model coefficients for normal faulting.
+
+    Parameters
+    ----------
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
+
+    magnitude : float
+        Earthquake moment magnitude.
+
+    location : float
+        Normalized location along rupture length, range [0, 1.0].
+
+    Returns
+    -------
+    Tuple[dict, dict]
+        - 'grad_mu' : Partial derivatives of the mean prediction, keyed by coefficient name.
+        - 'grad_sd_total' : Partial derivatives of the total standard deviation, keyed by
+          coefficient name.
+    """
+    grad_mu = _grad_func_mu(coefficients, magnitude, location)
+
+    sd_mode = _func_sd_mode_sigmoid(coefficients, magnitude)
+    sd_u = np.full(np.shape(sd_mode), coefficients["sigma"])
+    grad_sd_total = _grad_func_sd_total(
+        sd_mode,
+        sd_u,
+        _grad_func_sd_mode_sigmoid(coefficients, magnitude),
+        {"sigma": np.ones_like(sd_u, dtype=float)},
+    )
+
+    return grad_mu, grad_sd_total
+
+
+def _grad_func_rv(coefficients, magnitude, location):
+    """
+    Calculate the gradients of the mean prediction and total standard deviation (in transformed
+    units) with respect to the model coefficients for reverse faulting.
+
+    Parameters
+    ----------
+    coefficients : Union[np.recarray, pd.DataFrame, dict]
+        A numpy recarray, a pandas DataFrame, or a dictionary of arrays containing model
+        coefficients.
+
+    magnitude : float
+        Earthquake moment magnitude.
+
+    location : float
+        Normalized location along rupture length, range [0, 1.0].
+
+    Returns
+    -------
+    Tuple[dict, dict]
+        - 'grad_mu' : Partial derivatives of the mean prediction, keyed by coefficient name.
+        - 'grad_sd_total' : Partial derivatives of the total standard deviation, keyed by
+          coefficient name.
+    """
+    grad_mu = _grad_func_mu(coefficients, magnitude, location)
+
+    sd_u = _func_sd_u(coefficients, location)
+    sd_mode = np.full(np.shape(sd_u), coefficients["s_m,r"])
+    grad_sd_total = _grad_func_sd_total(
+        sd_mode,
+        sd_u,
+        {"s_m,r": np.ones_like(sd_mode, dtype=float)},
+        _grad_func_sd_u(coefficients, location),
+    )
+
+    return grad_mu, grad_sd_total
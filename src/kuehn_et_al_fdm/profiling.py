@@ -0,0 +1,231 @@
+"""This module provides opt-in profiling of the calculation stages (e.g., coefficient extraction,
+mean and standard deviation predictions, distribution calls, back-transformation, and DataFrame
+construction). Profiling is enabled with the `profile` context manager or by setting the
+`KEA_PROFILE` environment variable to the path of a JSON report.
+
+When profiling is disabled, the instrumented functions are the original, unwrapped functions, so
+there is no overhead.
+"""
+
+# Python imports
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Environment variable with the path of the JSON report written at exit
+PROFILE_ENV_VAR = "KEA_PROFILE"
+
+# Instrumented functions and their stage names; wrappers are created when profiling is enabled
+_REGISTRY = {}
+_WRAPPERS = {}
+_ACTIVE = None
+
+
+class Profiler:
+    """
+    Record the call counts, wall times, and array sizes for each calculation stage.
+
+    Wall times are recorded both inclusive (`wall_time_s`) and exclusive (`self_time_s`) of the
+    nested instrumented stages. Array sizes are the number of elements in the returned values.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._child_times = []
+
+    def _record(self, stage, func, *args, **kwargs):
+        """Call the function and record its statistics under the stage name."""
+        self._child_times.append(0.0)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            child_time = self._child_times.pop()
+            if self._child_times:
+                self._child_times[-1] += elapsed
+
+        stats = self.stages.setdefault(
+            stage,
+            {"calls": 0, "wall_time_s": 0.0, "self_time_s": 0.0, "elements": 0, "max_elements": 0},
+        )
+        n_elements = _count_elements(result)
+        stats["calls"] += 1
+        stats["wall_time_s"] += elapsed
+        stats["self_time_s"] += elapsed - child_time
+        stats["elements"] += n_elements
+        stats["max_elements"] = max(stats["max_elements"], n_elements)
+
+        return result
+
+    def report(self):
+        """
+        Return the profiling report.
+
+        Returns
+        -------
+        dict
+            Statistics for each stage (sorted by decreasing self time) with the keys 'calls',
+            'wall_time_s', 'self_time_s', 'elements', and 'max_elements'.
+        """
+        order = sorted(self.stages, key=lambda s: self.stages[s]["self_time_s"], reverse=True)
+        return {stage: dict(self.stages[stage]) for stage in order}
+
+    def to_json(self, filepath):
+        """Write the profiling report to a JSON file."""
+        with open(filepath, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def _count_elements(value):
+    """Count the number of array elements in a returned value."""
+    if isinstance(value, (tuple, list)):
+        return sum(_count_elements(v) for v in value)
+    size = getattr(value, "size", None)
+    return size if isinstance(size, int) else 1
+
+
+def _profile_stage(stage=None):
+    """
+    Decorator to register a function as a profiling stage.
+
+    The function is returned unchanged, so there is no overhead when profiling is disabled. The
+    stage name defaults to the function name.
+    """
+
+    def decorator(func):
+        _REGISTRY[func] = stage or func.__name__
+        # Functions defined while profiling is enabled (e.g., lazy imports) are wrapped directly
+        return _get_wrapper(func) if _ACTIVE is not None else func
+
+    return decorator
+
+
+def _get_wrapper(func):
+    """Get the profiling wrapper for a registered function."""
+    if func not in _WRAPPERS:
+        stage = _REGISTRY[func]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE is None:
+                return func(*args, **kwargs)
+            return _ACTIVE._record(stage, func, *args, **kwargs)
+
+        _WRAPPERS[func] = wrapper
+
+    return _WRAPPERS[func]
+
+
+def _swap_functions(mapping):
+    """Replace functions in the namespaces of the imported package modules."""
+    package = __name__.rpartition(".")[0]
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == package or name.startswith(package + ".")):
+            continue
+        namespace = vars(module)
+        for attr, value in list(namespace.items()):
+            try:
+                replacement = mapping.get(value)
+            except TypeError:  # unhashable module attributes
+                continue
+            if replacement is not None:
+                namespace[attr] = replacement
+
+
+def enable_profiling():
+    """
+    Enable profiling of the calculation stages.
+
+    Returns
+    -------
+    Profiler
+        The profiler that records the statistics.
+
+    Raises
+    ------
+    RuntimeError
+        If profiling is already enabled.
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        raise RuntimeError("Profiling is already enabled.")
+
+    _ACTIVE = Profiler()
+    _swap_functions({func: _get_wrapper(func) for func in _REGISTRY})
+    return _ACTIVE
+
+
+def disable_profiling():
+    """
+    Disable profiling and restore the original functions.
+
+    Returns
+    -------
+    Profiler or None
+        The profiler that recorded the statistics, or None if profiling was not enabled.
+    """
+    global _ACTIVE
+    profiler, _ACTIVE = _ACTIVE, None
+    _swap_functions({wrapper: func for func, wrapper in _WRAPPERS.items()})
+    return profiler
+
+
+@contextmanager
+def profile(filepath=None):
+    """
+    Context manager to profile the calculation stages.
+
+    Functions imported directly from the package modules before profiling is enabled (e.g.,
+    ``from kuehn_et_al_fdm import calc_prob_exceed``) are not recorded as a stage, but the stages
+    they call are. Use the module attributes (e.g., ``kea.calc_prob_exceed``) to record both.
+
+    Parameters
+    ----------
+    filepath : Union[str, pathlib.Path], optional
+        Path of a JSON report written when the context exits. Default None.
+
+    Yields
+    ------
+    Profiler
+        The profiler; use `Profiler.report` for the statistics for each stage.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        import kuehn_et_al_fdm as kea
+        from kuehn_et_al_fdm.profiling import profile
+
+        with profile("profile.json") as profiler:
+            kea.calc_prob_exceed(
+                magnitude=7, location=0.3, style="normal", displacement_array=[0.1, 1],
+                coefficient_type="full",
+            )
+        print(profiler.report())
+
+    From command line, set the environment variable to profile a whole run:
+
+    .. code-block:: console
+
+        $ KEA_PROFILE=profile.json kea-prob_exceed -m 7 -l 0.3 -s normal -d 0.1 1 -ct full
+    """
+    profiler = enable_profiling()
+    try:
+        yield profiler
+    finally:
+        disable_profiling()
+        if filepath is not None:
+            profiler.to_json(filepath)
+
+
+def _enable_from_environment():
+    """Enable profiling for the whole process if the environment variable is set."""
+    filepath = os.environ.get(PROFILE_ENV_VAR)
+    if filepath and _ACTIVE is None:
+        profiler = enable_profiling()
+        atexit.register(profiler.to_json, filepath)
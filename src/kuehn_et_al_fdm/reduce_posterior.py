@@ -0,0 +1,295 @@
+"""This module reduces the full set of posterior model coefficients to a small weighted set of
+representative coefficients (i.e., a compact logic tree) for a style of faulting.
+"""
+
+# Python imports
+import argparse
+import numpy as np
+from scipy import special
+
+# Module imports
+from kuehn_et_al_fdm.load_data import DATA
+from kuehn_et_al_fdm.utilities import MAG_RANGES, _calc_weighted_mean, _calc_weighted_quantile
+from kuehn_et_al_fdm.prediction_functions import _func_nm, _func_rv, _func_ss
+from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
+
+# Reference scenarios used to compare the predicted hazard of each set of coefficients
+REFERENCE_LOCATIONS = (0.05, 0.15, 0.3, 0.5)
+REFERENCE_DISPLACEMENTS = tuple(np.logspace(-2, 1.5, 15))
+REFERENCE_MAGNITUDE_STEP = 0.25
+
+# Penalty on the deviation from the cluster weights in the moment-matching step
+WEIGHT_PENALTY = 0.1
+
+# Scale of the sum-to-one constraint in the moment-matching step
+WEIGHT_SUM_SCALE = 1e3
+
+# Probabilities are floored before taking logarithms
+PROB_FLOOR = 1e-6
+
+# Relative errors are only reported where the full-set statistic is at least this value
+ERROR_FLOOR = 1e-3
+
+
+def _calc_reference_hazard(coefficients, style):
+    """
+    Calculate the folded probability of exceedance for the reference scenarios.
+
+    Parameters
+    ----------
+    coefficients : numpy.recarray
+        A numpy recarray containing model coefficients.
+
+    style : str
+        Style of faulting (lower case).
+
+    Returns
+    -------
+    numpy.ndarray
+        Folded probability of exceedance with shape (models, scenarios x displacements).
+    """
+    function_map = {"strike-slip": _func_ss, "reverse": _func_rv, "normal": _func_nm}
+
+    # Contiguous arrays for each coefficient; with strided recarray fields, the last bit of NumPy's
+    # vectorized power function depends on memory alignment and can differ between calls
+    n_models = len(coefficients)
+    coefficients = {
+        name: np.ascontiguousarray(coefficients[name]) for name in coefficients.dtype.names
+    }
+
+    min_mag, max_mag = MAG_RANGES[style]
+    magnitudes = np.arange(min_mag, max_mag + 1e-9, REFERENCE_MAGNITUDE_STEP)
+    magnitude, location = np.meshgrid(magnitudes, REFERENCE_LOCATIONS, indexing="ij")
+    magnitude, location = magnitude.reshape(-1, 1), location.reshape(-1, 1)
+
+    # Parameters have shape (scenarios, models)
+    _, lam, mean_site, stdv_site, _, _ = function_map[style](coefficients, magnitude, location)
+    _, _, mean_complement, stdv_complement, _, _ = function_map[style](
+        coefficients, magnitude, 1 - location
+    )
+
+    # Probabilities have shape (scenarios, models, displacements)
+    displ = np.asarray(REFERENCE_DISPLACEMENTS)
+    lam = np.asarray(lam)[:, np.newaxis]
+    transformed_displ = (np.power(displ, lam) - 1) / lam
+    probex_folded = 0.5 * (
+        special.ndtr((mean_site[..., np.newaxis] - transformed_displ) / stdv_site[..., np.newaxis])
+        + special.ndtr(
+            (mean_complement[..., np.newaxis] - transformed_displ)
+            / stdv_complement[..., np.newaxis]
+        )
+    )
+
+    return np.moveaxis(probex_folded, 1, 0).reshape(n_models, -1)
+
+
+def _kmeans(features, n_clusters, rng, max_iter=100):
+    """
+    Cluster the rows of a feature array with k-means (k-means++ initialization).
+
+    Parameters
+    ----------
+    features : numpy.ndarray
+        Feature array with shape (samples, features).
+
+    n_clusters : int
+        Number of clusters.
+
+    rng : numpy.random.Generator
+        Random number generator used for the initialization.
+
+    max_iter : int, optional
+        Maximum number of iterations. Default 100.
+
+    Returns
+    -------
+    tuple
+        - 'labels': Cluster index for each sample.
+        - 'centroids': Cluster centroids with shape (clusters, features).
+    """
+    n_samples = len(features)
+
+    # k-means++ initialization
+    centroids = np.empty((n_clusters, features.shape[1]))
+    centroids[0] = features[rng.integers(n_samples)]
+    distance = np.sum((features - centroids[0]) ** 2, axis=1)
+    for k in range(1, n_clusters):
+        centroids[k] = features[rng.choice(n_samples, p=distance / distance.sum())]
+        distance = np.minimum(distance, np.sum((features - centroids[k]) ** 2, axis=1))
+
+    labels = np.full(n_samples, -1)
+    norms = np.sum(features**2, axis=1)[:, np.newaxis]
+    for _ in range(max_iter):
+        distances = norms - 2 * features @ centroids.T + np.sum(centroids**2, axis=1)
+        updated = np.argmin(distances, axis=1)
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+        for k in range(n_clusters):
+            members = labels == k
+            if np.any(members):
+                centroids[k] = features[members].mean(axis=0)
+            else:
+                # Re-seed an empty cluster with the worst-represented sample
+                centroids[k] = features[np.argmax(np.min(distances, axis=1))]
+
+    return labels, centroids
+
+
+def reduce_posterior(
+    *, style, n_models=20, seed=0, fractiles=(0.05, 0.16, 0.5, 0.84, 0.95), max_iter=100
+):
+    """
+    Reduce the full set of posterior model coefficients to a small weighted set of representative
+    coefficients.
+
+    The coefficient rows are clustered (k-means) on their predicted folded probabilities of
+    exceedance for a set of reference scenarios (magnitudes within the recommended range,
+    locations, and displacements). The representative of each cluster is the member nearest to
+    the cluster centroid. The weights start from the fraction of the full set in each cluster and
+    are then adjusted (non-negative least squares) to match the mean reference hazard of the full
+    set.
+
+    Parameters
+    ----------
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    n_models : int, optional
+        Number of clusters, which is the maximum number of representative coefficient rows
+        (representatives without weight after the moment matching are dropped). Default 20.
+
+    seed : int, optional
+        Seed for the random number generator used in the clustering initialization. Default 0.
+
+    fractiles : ArrayLike, optional
+        Epistemic fractiles used to report the reduction error. Default
+        (0.05, 0.16, 0.5, 0.84, 0.95).
+
+    max_iter : int, optional
+        Maximum number of k-means iterations. Default 100.
+
+    Returns
+    -------
+    tuple
+        - 'coefficients': pandas.DataFrame of the representative coefficients, including the
+          original `model_id` and a `weight` column. It can be used as `coefficient_type='reduced'`
+          in the calculation functions by assigning it to `DATA["reduced"][style]`.
+        - 'report': pandas.DataFrame of the maximum absolute and relative errors in the weighted
+          mean and fractiles of the reference hazard compared to the full set. Relative errors are
+          only calculated where the full-set statistic is at least 1e-3.
+
+    Raises
+    ------
+    ValueError
+        If `n_models` is not within range [1, number of posterior coefficient rows].
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ kea-reduce_posterior -s strike-slip -n 20
+        $ kea-reduce_posterior -s normal -n 50 --seed 1 -o reduced_normal.csv
+    """
+    import pandas as pd
+    from scipy.optimize import nnls
+
+    style = style.lower()
+    full = DATA["full"][style]
+
+    if not 1 <= n_models <= len(full):
+        raise ValueError(f"'n_models' must be within range [1, {len(full)}].")
+
+    # Cluster on the log of the predicted hazard
+    hazard = _calc_reference_hazard(full.to_records(index=False), style)
+    features = np.log10(np.maximum(hazard, PROB_FLOOR))
+    labels, centroids = _kmeans(features, n_models, np.random.default_rng(seed), max_iter)
+
+    # Representative member nearest to each centroid
+    rows, weights = [], []
+    for k in np.unique(labels):
+        members = np.flatnonzero(labels == k)
+        distance = np.sum((features[members] - centroids[k]) ** 2, axis=1)
+        rows.append(members[np.argmin(distance)])
+        weights.append(len(members) / len(full))
+
+    # Moment matching of the mean hazard, penalized toward the cluster weights
+    n_rows = len(rows)
+    matrix = np.vstack(
+        [
+            hazard[rows].T,
+            np.sqrt(WEIGHT_PENALTY) * np.eye(n_rows),
+            np.full((1, n_rows), WEIGHT_SUM_SCALE),
+        ]
+    )
+    target = np.concatenate(
+        [hazard.mean(axis=0), np.sqrt(WEIGHT_PENALTY) * np.asarray(weights), [WEIGHT_SUM_SCALE]]
+    )
+    weights, _ = nnls(matrix, target)
+
+    # Drop representatives without weight
+    rows, weights = np.asarray(rows)[weights > 0], weights[weights > 0]
+    weights = weights / weights.sum()
+
+    coefficients = full.iloc[rows].reset_index(drop=True)
+    coefficients.insert(1, "weight", weights)
+
+    # Compare summaries of the reference hazard
+    reduced_hazard = hazard[rows]
+    statistics = {"mean": (hazard.mean(axis=0), _calc_weighted_mean(reduced_hazard, weights))}
+    full_fractiles = _calc_weighted_quantile(hazard, np.ones(len(full)), fractiles)
+    reduced_fractiles = _calc_weighted_quantile(reduced_hazard, weights, fractiles)
+    for fractile, expected, computed in zip(fractiles, full_fractiles, reduced_fractiles):
+        statistics[f"fractile_{fractile}"] = (expected, computed)
+
+    report = {}
+    for name, (expected, computed) in statistics.items():
+        error = np.abs(computed - expected)
+        relative = error[expected >= ERROR_FLOOR] / expected[expected >= ERROR_FLOOR]
+        report[name] = {
+            "max_abs_error": error.max(),
+            "max_rel_error": relative.max() if relative.size else np.nan,
+        }
+
+    return coefficients, pd.DataFrame.from_dict(report, orient="index")
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=reduce_posterior.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_style(parser)
+    _add_n_models(parser)
+    _add_seed(parser)
+    _add_output_file(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
+def main(**kwargs):
+
+    try:
+        output_file = kwargs.pop("output_file")
+        coefficients, report = reduce_posterior(**kwargs)
+
+        print(f"     Reduced coefficients for {kwargs.get('style')} faulting:")
+        _print_result(coefficients)
+        print("     Error in the reference hazard compared to the full set of coefficients:")
+        _print_result(report)
+
+        if output_file:
+            coefficients.to_csv(output_file, index=False)
+            print(f"     Saved to {output_file}")
+
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""This module contains compact result containers backed by NumPy arrays with named axes (e.g.,
+'scenario', 'percentile', 'model', and 'displacement'). The containers have the same structure
+regardless of the coefficient type, convert to NumPy without copying, and create pandas
+DataFrames only when requested.
+"""
+
+# Python imports
+import numpy as np
+
+
+class CalculationResult:
+    """
+    Calculation result with named axes.
+
+    Parameters
+    ----------
+    name : str
+        Name of the main variable.
+
+    data : dict
+        Variables keyed by name; each value is a tuple of (axis names, numpy.ndarray). The main
+        variable uses all axes, and the other variables use a subset of them (in order). The
+        arrays are stored as C-contiguous arrays (broadcast views are copied).
+
+    coords : dict, optional
+        Coordinate values for the axes, keyed by axis name. Default None (row numbers).
+
+    Examples
+    --------
+    .. code-block:: python
+
+        import kuehn_et_al_fdm as kea
+
+        result = kea.calc_prob_exceed(
+            magnitude=7, location=0.3, style="normal", displacement_array=[0.1, 1],
+            coefficient_type="full", as_result=True,
+        )
+        result.dims  # ('scenario', 'model', 'displacement')
+        result.to_numpy()  # array with shape (1, 1000, 2)
+        result.to_frame()  # long-form DataFrame with one row per model and displacement
+    """
+
+    __slots__ = ("name", "data", "dims", "coords", "_frame")
+
+    def __init__(self, name, data, coords=None):
+        self.name = name
+        self.data = {k: (tuple(dims), np.ascontiguousarray(v)) for k, (dims, v) in data.items()}
+        self.dims, values = self.data[name]
+        for key, (dims, value) in self.data.items():
+            if value.shape != tuple(self.sizes[d] for d in dims):
+                raise ValueError(f"Variable '{key}' does not match the axes {dims}.")
+
+        coords = {} if coords is None else coords
+        self.coords = {
+            d: np.asarray(coords[d]) if d in coords else np.arange(n)
+            for d, n in self.sizes.items()
+        }
+        self._frame = None
+
+    def __repr__(self):
+        sizes = ", ".join(f"{d}: {n}" for d, n in self.sizes.items())
+        return f"{type(self).__name__}('{self.name}', {{{sizes}}}, variables={list(self.data)})"
+
+    def __array__(self, dtype=None):
+        values = self.to_numpy()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def __getitem__(self, name):
+        return self.to_numpy(name)
+
+    @property
+    def sizes(self):
+        """Length of each axis, keyed by axis name."""
+        dims, values = self.data[self.name]
+        return dict(zip(dims, values.shape))
+
+    @property
+    def shape(self):
+        """Shape of the main variable."""
+        return self.data[self.name][1].shape
+
+    @property
+    def size(self):
+        """Number of elements in the main variable."""
+        return self.data[self.name][1].size
+
+    @property
+    def nbytes(self):
+        """Memory used by the variables in bytes."""
+        return sum(value.nbytes for _, value in self.data.values())
+
+    def copy(self):
+        """Return a copy of the result with copies of the arrays."""
+        data = {k: (dims, value.copy()) for k, (dims, value) in self.data.items()}
+        return type(self)(self.name, data, {d: c.copy() for d, c in self.coords.items()})
+
+    def to_numpy(self, name=None):
+        """
+        Return a variable as a NumPy array (without copying).
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the variable. Default None (the main variable).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array with the axes of the variable.
+        """
+        return self.data[self.name if name is None else name][1]
+
+    def to_frame(self):
+        """
+        Return the result as a long-form pandas DataFrame, with one column for the coordinates of
+        each axis and for each variable. The DataFrame is created on the first call.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A DataFrame with one row per element of the main variable.
+        """
+        if self._frame is None:
+            import pandas as pd
+
+            grids = np.meshgrid(*(self.coords[d] for d in self.dims), indexing="ij")
+            columns = {d: grid.ravel() for d, grid in zip(self.dims, grids)}
+            for key, (dims, value) in self.data.items():
+                expanded = np.expand_dims(
+                    value, [i for i, d in enumerate(self.dims) if d not in dims]
+                )
+                columns[key] = np.broadcast_to(expanded, self.shape).ravel()
+            self._frame = pd.DataFrame(columns)
+
+        return self._frame.copy()
@@ -0,0 +1,643 @@
+"""This module runs a long-running worker that evaluates calculations from JSON requests. In stdio
+mode, the worker reads one JSON request per line and writes one JSON response per line, in the same
+order. The model coefficients stay loaded between requests, and consecutive requests of the same
+kind are micro-batched into one vectorized evaluation.
+
+In HTTP mode, the worker is a local HTTP service. Concurrent requests that arrive within a short
+time window are gathered into one batch, and the latency and batch-size histograms are available
+from the service.
+"""
+
+# Python imports
+import argparse
+import bisect
+import json
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+# Module imports
+from kuehn_et_al_fdm.calc_params import _calc_params, _ignore_multiple_scenarios_note
+from kuehn_et_al_fdm.calc_displ_avg import calc_displ_avg
+from kuehn_et_al_fdm.calc_displ_profile import calc_displ_profile
+from kuehn_et_al_fdm.calc_displ_site import calc_displ_site
+from kuehn_et_al_fdm.calc_hazard import _calc_scenario_prob_exceed, calc_hazard
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+from kuehn_et_al_fdm.calc_prob_occur import calc_prob_occur
+from kuehn_et_al_fdm.model import _get_model
+from kuehn_et_al_fdm.utilities import _check_location_range
+from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
+
+# Default batching settings
+MAX_BATCH_SIZE = 256
+BATCH_WINDOW = 0.002  # seconds
+
+# Upper bounds of the histogram bins for the HTTP service
+LATENCY_BINS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5]  # seconds
+BATCH_SIZE_BINS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+
+# Calculations available to the worker
+CALCULATIONS = {
+    "calc_params": _calc_params,
+    "calc_displ_site": calc_displ_site,
+    "calc_displ_avg": calc_displ_avg,
+    "calc_displ_profile": calc_displ_profile,
+    "calc_prob_exceed": calc_prob_exceed,
+    "calc_prob_occur": calc_prob_occur,
+    "calc_hazard": calc_hazard,
+}
+
+# Arguments that can be micro-batched for each calculation; other arguments are evaluated singly
+_BATCH_ARGUMENTS = {
+    "calc_displ_site": {
+        "magnitude",
+        "location",
+        "style",
+        "percentile",
+        "coefficient_type",
+        "folded",
+        "exact_folded",
+    },
+    "calc_prob_exceed": {
+        "magnitude",
+        "location",
+        "style",
+        "displacement_array",
+        "coefficient_type",
+        "folded",
+    },
+}
+
+
+def _to_json(value):
+    """Convert a result to JSON-compatible types."""
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [_to_json(v) for v in value]
+    if hasattr(value, "to_dict"):  # pandas DataFrame
+        return _to_json(value.to_dict(orient="list"))
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def _is_scalar_number(value):
+    """Check that the value is a scalar int or float."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _get_batch_key(request):
+    """
+    Get the key of a request that can be micro-batched, or None if it is evaluated singly.
+
+    Requests with the same key differ only in the scenario magnitude and location.
+    """
+    name, arguments = request.get("calculation"), request.get("arguments", {})
+    if not isinstance(name, str) or name not in _BATCH_ARGUMENTS:
+        return None
+    if not isinstance(arguments, dict):
+        return None
+    if not set(arguments) <= _BATCH_ARGUMENTS[name]:
+        return None
+
+    magnitude, location = arguments.get("magnitude"), arguments.get("location")
+    style = arguments.get("style")
+    coefficient_type = str(arguments.get("coefficient_type", "median")).lower()
+    if not (_is_scalar_number(magnitude) and _is_scalar_number(location)):
+        return None
+    if not isinstance(style, str) or coefficient_type not in ["mean", "median"]:
+        return None
+
+    folded = bool(arguments.get("folded", True))
+    if name == "calc_displ_site":
+        percentile = arguments.get("percentile")
+        if not _is_scalar_number(percentile):
+            return None
+        exact_folded = bool(arguments.get("exact_folded", False))
+        return name, style.lower(), coefficient_type, folded, float(percentile), exact_folded
+
+    try:
+        displacement_array = np.atleast_1d(np.asarray(arguments["displacement_array"], float))
+    except (KeyError, TypeError, ValueError):
+        return None
+    if displacement_array.ndim != 1:
+        return None
+    return name, style.lower(), coefficient_type, folded, tuple(displacement_array.tolist())
+
+
+def _evaluate_batch(key, magnitude, location):
+    """
+    Evaluate micro-batched requests in one vectorized calculation.
+
+    Parameters
+    ----------
+    key : tuple
+        Batch key from `_get_batch_key`.
+
+    magnitude : numpy.ndarray
+        Earthquake moment magnitude for each request.
+
+    location : numpy.ndarray
+        Normalized location along rupture length for each request.
+
+    Returns
+    -------
+    list
+        Result for each request, with the same shape as an unbatched calculation.
+    """
+    name, style, coefficient_type, folded = key[:4]
+    _check_location_range(location)
+
+    if name == "calc_displ_site":
+        percentile, exact_folded = key[4:]
+        with _ignore_multiple_scenarios_note():
+            result = calc_displ_site(
+                magnitude=magnitude,
+                location=location,
+                style=style,
+                percentile=percentile,
+                coefficient_type=coefficient_type,
+                folded=folded,
+                exact_folded=exact_folded,
+                override=True,
+            )
+        return [np.atleast_1d(row) for row in np.reshape(result, (len(magnitude), -1))]
+
+    displacement_array = np.asarray(key[4], dtype=float)
+    probex = _calc_scenario_prob_exceed(
+        magnitude, location, style, displacement_array, coefficient_type, folded
+    )
+    return [row.squeeze() for row in probex[:, 0, :]]
+
+
+def _evaluate(request):
+    """Evaluate a single request."""
+    if isinstance(request, Exception):
+        raise request
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object.")
+
+    name, arguments = request.get("calculation"), request.get("arguments", {})
+    if not isinstance(name, str) or name not in CALCULATIONS:
+        raise ValueError(
+            f"'{name}' is an invalid 'calculation'; only {', '.join(CALCULATIONS)} is allowed."
+        )
+    if name == "calc_params":
+        arguments = {"override": True, **arguments}
+    return CALCULATIONS[name](**arguments)
+
+
+def _respond(request, result=None, error=None):
+    """Create the response for a request."""
+    response = {"id": request.get("id") if isinstance(request, dict) else None}
+    if error is None:
+        response["result"] = _to_json(result)
+    else:
+        response["error"] = f"{type(error).__name__}: {error}"
+    return response
+
+
+def evaluate_requests(requests):
+    """
+    Evaluate requests, micro-batching consecutive requests of the same kind.
+
+    Consecutive `calc_displ_site` or `calc_prob_exceed` requests with scalar magnitude and
+    location that share all other arguments (and use the 'mean' or 'median' coefficients) are
+    evaluated in one vectorized calculation. If a batched calculation fails, its requests are
+    evaluated singly so the error is reported only for the offending requests.
+
+    Parameters
+    ----------
+    requests : list of dict
+        Requests (JSON objects) with the keys 'id' (optional, returned in the response),
+        'calculation' (one of the keys of `CALCULATIONS`), and 'arguments' (keyword arguments of
+        the calculation).
+
+    Returns
+    -------
+    tuple
+        - 'responses': Response for each request, in order, with the keys 'id' and either
+          'result' or 'error'.
+        - 'n_evaluations': Number of calculations (batched or single) that were evaluated.
+    """
+    responses, n_evaluations = [], 0
+    keys = [_get_batch_key(r) if isinstance(r, dict) else None for r in requests]
+
+    start = 0
+    while start < len(requests):
+        # Group consecutive requests with the same batch key
+        stop = start + 1
+        if keys[start] is not None:
+            while stop < len(requests) and keys[stop] == keys[start]:
+                stop += 1
+        group = requests[start:stop]
+
+        results = None
+        if len(group) > 1:
+            magnitude = np.array([r["arguments"]["magnitude"] for r in group], dtype=float)
+            location = np.array([r["arguments"]["location"] for r in group], dtype=float)
+            try:
+                results = _evaluate_batch(keys[start], magnitude, location)
+                n_evaluations += 1
+                responses.extend(_respond(r, result) for r, result in zip(group, results))
+            except Exception:
+                results = None
+
+        if results is None:
+            for request in group:
+                n_evaluations += 1
+                try:
+                    responses.append(_respond(request, _evaluate(request)))
+                except Exception as e:
+                    responses.append(_respond(request, error=e))
+
+        start = stop
+
+    return responses, n_evaluations
+
+
+def _read_lines(stream, lines):
+    """Put the lines of a stream in a queue, followed by None at the end of the stream."""
+    for line in stream:
+        if line.strip():
+            lines.put(line)
+    lines.put(None)
+
+
+def _parse_request(line):
+    """Parse a JSON request; invalid lines return the error, which is raised on evaluation."""
+    try:
+        return json.loads(line)
+    except ValueError as e:  # includes invalid JSON and undecodable bytes
+        return ValueError(f"Invalid JSON: {e}")
+
+
+def _warm_up():
+    """Prepare the point-estimate models for all styles of faulting."""
+    for style in ["strike-slip", "reverse", "normal"]:
+        for coefficient_type in ["mean", "median"]:
+            _get_model(style, coefficient_type)
+
+
+def serve_stdio(
+    *,
+    input_stream=None,
+    output_stream=None,
+    max_batch_size=MAX_BATCH_SIZE,
+    batch_window=BATCH_WINDOW,
+):
+    """
+    Evaluate JSON requests (one per line) from an input stream and write JSON responses (one per
+    line) to an output stream, until the end of the input stream.
+
+    Requests that arrive within `batch_window` seconds of the first request in a batch (up to
+    `max_batch_size` requests) are evaluated together (see `evaluate_requests`).
+
+    Parameters
+    ----------
+    input_stream : file-like, optional
+        Stream of JSON requests. Default is the standard input.
+
+    output_stream : file-like, optional
+        Stream for the JSON responses. Default is the standard output.
+
+    max_batch_size : int, optional
+        Maximum number of requests in a batch. Default 256.
+
+    batch_window : float, optional
+        Time in seconds to wait for more requests after the first request in a batch. Default
+        0.002.
+
+    Returns
+    -------
+    dict
+        Summary with the number of 'requests', 'batches', and 'evaluations'.
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ echo '{"id": 1, "calculation": "calc_displ_site", "arguments": {"magnitude": 7, "location": 0.3, "style": "normal", "percentile": 0.5}}' | kea-serve --stdio
+        {"id": 1, "result": [1.1666774...]}
+    """
+    input_stream = sys.stdin if input_stream is None else input_stream
+    output_stream = sys.stdout if output_stream is None else output_stream
+    _warm_up()
+
+    lines = queue.Queue()
+    reader = threading.Thread(target=_read_lines, args=(input_stream, lines), daemon=True)
+    reader.start()
+
+    summary = {"requests": 0, "batches": 0, "evaluations": 0}
+    end_of_stream = False
+    while not end_of_stream:
+        line = lines.get()
+        if line is None:
+            break
+
+        # Gather the requests that arrive within the batch window
+        batch = [line]
+        deadline = time.monotonic() + batch_window
+        while len(batch) < max_batch_size:
+            try:
+                line = lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if line is None:
+                end_of_stream = True
+                break
+            batch.append(line)
+
+        responses, n_evaluations = evaluate_requests([_parse_request(line) for line in batch])
+        for response in responses:
+            output_stream.write(json.dumps(response) + "\n")
+        output_stream.flush()
+
+        summary["requests"] += len(batch)
+        summary["batches"] += 1
+        summary["evaluations"] += n_evaluations
+
+    return summary
+
+
+class Histogram:
+    """
+    Count values in bins with the given upper bounds (inclusive); larger values are counted in an
+    overflow bin.
+    """
+
+    def __init__(self, bins):
+        self.bins = list(bins)
+        self.counts = [0] * (len(self.bins) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, value):
+        """Add a value to the histogram."""
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bins, value)] += 1
+            self.count += 1
+            self.total += value
+
+    def to_dict(self):
+        """Return the bin upper bounds ('inf' for the overflow bin), counts, and mean value."""
+        with self._lock:
+            return {
+                "bins": self.bins + ["inf"],
+                "counts": list(self.counts),
+                "count": self.count,
+                "mean": self.total / self.count if self.count else None,
+            }
+
+
+def _order_by_batch_key(requests):
+    """Order requests so that requests with the same batch key are consecutive."""
+    groups = {}
+    for i, request in enumerate(requests):
+        key = _get_batch_key(request) if isinstance(request, dict) else None
+        groups.setdefault(("single", i) if key is None else key, []).append(i)
+    return [i for group in groups.values() for i in group]
+
+
+class BatchingService:
+    """
+    Gather concurrent requests within a time window and evaluate them in one batch.
+
+    Requests are submitted from any thread with `submit`, which blocks until the response is
+    available. A single worker thread evaluates the batches (see `evaluate_requests`); requests
+    of the same kind in a batch are evaluated together regardless of their arrival order.
+
+    Parameters
+    ----------
+    max_batch_size : int, optional
+        Maximum number of requests in a batch. Default 256.
+
+    batch_window : float, optional
+        Time in seconds to wait for more requests after the first request in a batch. Default
+        0.002.
+    """
+
+    def __init__(self, *, max_batch_size=MAX_BATCH_SIZE, batch_window=BATCH_WINDOW):
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.latency = Histogram(LATENCY_BINS)
+        self.batch_size = Histogram(BATCH_SIZE_BINS)
+        self.evaluations = 0
+        self._pending = queue.Queue()
+        self._worker = None
+
+    def start(self):
+        """Load the coefficients and start the worker thread."""
+        _warm_up()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        """Stop the worker thread after the pending requests are evaluated."""
+        if self._worker is not None:
+            self._pending.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def submit(self, request):
+        """
+        Submit a request and wait for its response.
+
+        Parameters
+        ----------
+        request : dict
+            Request with the keys 'id' (optional), 'calculation', and 'arguments' (see
+            `evaluate_requests`).
+
+        Returns
+        -------
+        dict
+            Response with the keys 'id' and either 'result' or 'error'.
+        """
+        start = time.perf_counter()
+        item = {"request": request, "done": threading.Event(), "response": None}
+        self._pending.put(item)
+        item["done"].wait()
+        self.latency.add(time.perf_counter() - start)
+        return item["response"]
+
+    def stats(self):
+        """Return the number of evaluations and the latency and batch-size histograms."""
+        return {
+            "requests": self.latency.count,
+            "batches": self.batch_size.count,
+            "evaluations": self.evaluations,
+            "latency_s": self.latency.to_dict(),
+            "batch_size": self.batch_size.to_dict(),
+        }
+
+    def _run(self):
+        """Gather and evaluate batches until the service is stopped."""
+        stopping = False
+        while not stopping:
+            item = self._pending.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._pending.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # Any error must not stop the worker, or the pending requests would wait forever
+            try:
+                order = _order_by_batch_key([item["request"] for item in batch])
+                batch = [batch[i] for i in order]
+                responses, n_evaluations = evaluate_requests([item["request"] for item in batch])
+            except Exception as e:
+                responses = [_respond(item["request"], error=e) for item in batch]
+                n_evaluations = 0
+            self.evaluations += n_evaluations
+            self.batch_size.add(len(batch))
+            for item, response in zip(batch, responses):
+                item["response"] = response
+                item["done"].set()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handle HTTP requests for a `BatchingService` (attached to the server as `service`)."""
+
+    def _send_json(self, status, content):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.server.service.stats())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown path '{self.path}'."})
+
+    def do_POST(self):
+        if self.path != "/evaluate":
+            self._send_json(404, {"error": f"Unknown path '{self.path}'."})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {"error": "Invalid 'Content-Length' header."})
+            return
+        response = self.server.service.submit(_parse_request(self.rfile.read(length)))
+        self._send_json(200 if "result" in response else 400, response)
+
+    def log_message(self, format, *args):
+        """Do not log each request."""
+
+
+def create_http_server(
+    *, host="127.0.0.1", port=8000, max_batch_size=MAX_BATCH_SIZE, batch_window=BATCH_WINDOW
+):
+    """
+    Create a local HTTP service that evaluates JSON requests in micro-batches.
+
+    The service accepts a JSON request (see `evaluate_requests`) posted to ``/evaluate`` and
+    returns the JSON response (status 400 if the request fails). The latency and batch-size
+    histograms are returned from ``/stats``.
+
+    Parameters
+    ----------
+    host : str, optional
+        Host name or address. Default '127.0.0.1'.
+
+    port : int, optional
+        Port number; use 0 for any free port. Default 8000.
+
+    max_batch_size : int, optional
+        Maximum number of requests in a batch. Default 256.
+
+    batch_window : float, optional
+        Time in seconds to wait for more requests after the first request in a batch. Default
+        0.002.
+
+    Returns
+    -------
+    http.server.ThreadingHTTPServer
+        The server, with the started `BatchingService` as the `service` attribute. Use
+        `serve_forever` to run it, and `shutdown`, `server_close`, and `service.stop` to stop it.
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ kea-serve --http --port 8000
+        $ curl -d '{"calculation": "calc_displ_site", "arguments": {"magnitude": 7, "location": 0.3, "style": "normal", "percentile": 0.5}}' localhost:8000/evaluate
+        {"id": null, "result": [1.1666774...]}
+        $ curl localhost:8000/stats
+    """
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.daemon_threads = True
+    server.service = BatchingService(max_batch_size=max_batch_size, batch_window=batch_window)
+    server.service.start()
+    return server
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=serve_stdio.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_stdio_flag(parser)
+    _add_http_flag(parser)
+    _add_host(parser)
+    _add_port(parser)
+    _add_max_batch_size(parser)
+    _add_batch_window(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
+def main(**kwargs):
+
+    stdio, http = kwargs.pop("stdio"), kwargs.pop("http")
+    host, port = kwargs.pop("host"), kwargs.pop("port")
+
+    if stdio:
+        serve_stdio(**kwargs)
+
+    elif http:
+        server = create_http_server(host=host, port=port, **kwargs)
+        print(f"     Serving on http://{host}:{server.server_port}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            server.service.stop()
+
+    else:
+        print("     Use --stdio or --http to choose how requests are read.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""This module simulates displacement realizations along the rupture length for magnitude/style
+scenarios. The between-event term is shared by all locations on a rupture, so the simulated
+displacements are correlated along strike.
+"""
+
+# Python imports
+import argparse
+import numpy as np
+
+# Module imports
+from kuehn_et_al_fdm.load_data import _get_coefficients
+from kuehn_et_al_fdm.utilities import _check_location_range, _check_magnitude_range
+from kuehn_et_al_fdm.prediction_functions import _func_nm, _func_rv, _func_ss
+from kuehn_et_al_fdm.transformation_functions import _convert_bc_to_meters
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm._common_args import *  # noqa: F403 *
+
+
+def _get_substream_generator(seed, key):
+    """
+    Create the random number generator for an independent substream (e.g., of a rupture).
+
+    Parameters
+    ----------
+    seed : int
+        Seed for the random number generator.
+
+    key : int
+        Non-negative substream identifier.
+
+    Returns
+    -------
+    numpy.random.Generator
+        Generator for the substream, which is the same as the `key`-th child of
+        `numpy.random.SeedSequence(seed).spawn()`.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(int(key),)))
+
+
+def _draw_standard_normals(seed, rupture_ids, n_realizations, n_models, n_locations):
+    """
+    Draw the standard normal between-event and within-event terms for each rupture from its own
+    substream.
+
+    Parameters
+    ----------
+    seed : int
+        Seed for the random number generator.
+
+    rupture_ids : ArrayLike
+        Non-negative rupture identifiers.
+
+    n_realizations : int
+        Number of realizations per rupture.
+
+    n_models : int
+        Number of model coefficient rows.
+
+    n_locations : int
+        Number of locations.
+
+    Returns
+    -------
+    tuple
+        - 'between': Between-event terms with shape (ruptures, realizations, models, 1).
+        - 'within': Within-event terms with shape (ruptures, realizations, models, locations).
+    """
+    between = np.empty((len(rupture_ids), n_realizations, n_models, 1))
+    within = np.empty((len(rupture_ids), n_realizations, n_models, n_locations))
+
+    # The draw order within a substream is fixed, so results do not depend on the chunking
+    for i, rupture_id in enumerate(rupture_ids):
+        rng = _get_substream_generator(seed, rupture_id)
+        between[i] = rng.standard_normal((n_realizations, n_models, 1))
+        within[i] = rng.standard_normal((n_realizations, n_models, n_locations))
+
+    return between, within
+
+
+@_profile_stage()
+def simulate_displ(
+    *,
+    magnitude,
+    location_array,
+    style,
+    n_realizations=1,
+    coefficient_type="median",
+    seed=0,
+    rupture_id=None,
+):
+    """
+    Simulate displacement realizations in meters along the rupture length. If displacement is
+    less than 1 mm (0.001 m), returns zero.
+
+    For each rupture, realization, and model coefficient row, one between-event term is drawn
+    and scaled by the between-event standard deviation; within-event terms are drawn
+    independently at each location and scaled by the within-event standard deviation. The sum
+    with the mean prediction is back-transformed to meters.
+
+    Each rupture draws from an independent substream keyed by `seed` and its rupture identifier,
+    so any subset of ruptures (e.g., chunks run serially or in parallel processes) reproduces the
+    same realizations as a single run when the same `rupture_id` values are used.
+
+    Parameters
+    ----------
+    magnitude : int or float or ArrayLike
+        Earthquake moment magnitude for each rupture.
+
+    location_array : ArrayLike
+        Normalized locations along rupture length, range [0, 1.0]. The locations are not folded.
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    n_realizations : int, optional
+        Number of realizations per rupture. Default 1.
+
+    coefficient_type : str, optional
+        Option to run model using full epistemic uncertainty or with point estimates (mean or
+        median) of the model coefficients (case-insensitive). Valid options are 'mean', 'median',
+        'full', or 'reduced'. Default 'median'.
+
+    seed : int, optional
+        Seed for the random number generator. Default 0.
+
+    rupture_id : ArrayLike, optional
+        Non-negative identifier for each rupture, which selects its random substream. Default is
+        the rupture index (0, 1, 2, ...).
+
+    Returns
+    -------
+    numpy.ndarray
+        Displacement in meters with shape (ruptures, realizations, models, locations). The model
+        axis contains a single element for point estimates of the coefficients.
+
+    Raises
+    ------
+    ValueError
+        If `coefficient_type` is not 'mean', 'median', 'full', or 'reduced'.
+
+    ValueError
+        If `location_array` is not within range [0, 1].
+
+    ValueError
+        If `rupture_id` does not have one non-negative value for each rupture.
+
+    Warns
+    -----
+    UserWarning
+        If `magnitude` is not within the recommended range for that style.
+
+    Examples
+    --------
+    From command line:
+
+    .. code-block:: console
+
+        $ kea-simulate_displ -m 7 7.5 -l 0.1 0.3 0.5 -s strike-slip -n 5
+        $ kea-simulate_displ -m 6.5 -l 0.1 0.5 0.9 -s reverse -n 100 -ct full --seed 1
+    """
+    style = style.lower()
+    coefficient_type = coefficient_type.lower()
+
+    magnitude = np.atleast_1d(np.asarray(magnitude, dtype=float))
+    location_array = np.atleast_1d(np.asarray(location_array, dtype=float))
+
+    if rupture_id is None:
+        rupture_id = np.arange(len(magnitude))
+    rupture_id = np.atleast_1d(rupture_id)
+    if rupture_id.shape != magnitude.shape or np.any(rupture_id < 0):
+        raise ValueError("'rupture_id' must have one non-negative value for each rupture.")
+
+    # Check ranges of inputs
+    _check_location_range(location_array)
+    _check_magnitude_range(magnitude, style)
+
+    function_map = {"strike-slip": _func_ss, "reverse": _func_rv, "normal": _func_nm}
+
+    # Parameters have shape (ruptures, locations, models)
+    coeffs = _get_coefficients(style, coefficient_type)
+    _, lam, mu, _, sd_u, sd_mode = function_map[style](
+        coeffs, magnitude[:, np.newaxis, np.newaxis], location_array[:, np.newaxis]
+    )
+    shape = (len(magnitude), len(location_array), len(coeffs))
+    mu, sd_u, sd_mode = [np.moveaxis(np.broadcast_to(a, shape), 1, 2) for a in [mu, sd_u, sd_mode]]
+
+    between, within = _draw_standard_normals(
+        seed, rupture_id, n_realizations, len(coeffs), len(location_array)
+    )
+
+    # Realizations have shape (ruptures, realizations, models, locations)
+    Y = mu[:, np.newaxis] + sd_mode[:, np.newaxis] * between + sd_u[:, np.newaxis] * within
+
+    return _convert_bc_to_meters(Y, np.asarray(lam)[:, np.newaxis])
+
+
+def _create_parser():
+    """Create an ArgumentParser instance and add specific arguments to the parser."""
+    parser = argparse.ArgumentParser(
+        description=simulate_displ.__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    _add_magnitude(parser, nargs="+")
+    _add_location(parser, nargs="+")
+    _add_style(parser)
+    _add_n_realizations(parser)
+    _add_coefficient_type(parser)
+    _add_seed(parser)
+
+    return parser
+
+
+@_add_arguments(_create_parser)
+def main(**kwargs):
+
+    try:
+        result = simulate_displ(**kwargs)
+
+        print(
+            f"     Simulated displacements for magnitude {kwargs.get('magnitude')}, "
+            f"{kwargs.get('style')} faulting (ruptures, realizations, models, locations):"
+        )
+        print(f"     {np.round(result.squeeze(), 3)} meters")
+
+        print("     Locations:")
+        print(f"     {kwargs.get('location_array')} ")
+
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""This module records the internal calculations (e.g., the distribution parameters, transformed
+displacements, and probabilities of exceedance) of `calc_displ_site` and `calc_prob_exceed` for
+every scenario in a batch. Tracing is enabled with the `trace` context manager.
+
+Unlike the `debug` option, which returns a DataFrame for a single scenario, the trace recorder
+captures only the selected fields as arrays and expands them to aligned columns (one row per
+scenario, percentile or displacement, and model) when the trace is requested. When tracing is
+disabled, the calculation functions only check a module flag.
+"""
+
+# Python imports
+from contextlib import contextmanager
+import numpy as np
+
+# Index columns, coordinate columns, and selectable fields for each traced function
+INDEX_COLUMNS = ["call", "scenario"]
+COORDINATES = {
+    "calc_displ_site": ["percentile", "model_id"],
+    "calc_prob_exceed": ["model_id", "displ_meters"],
+}
+FIELDS = {
+    "calc_displ_site": [
+        "magnitude",
+        "location",
+        "style",
+        "bc_param",
+        "mean_site",
+        "stdv_site",
+        "mean_complement",
+        "stdv_complement",
+        "Y_site",
+        "Y_complement",
+        "Y_folded",
+        "displ_site_meters",
+        "displ_complement_meters",
+        "displ_folded_meters",
+    ],
+    "calc_prob_exceed": [
+        "magnitude",
+        "location",
+        "style",
+        "bc_param",
+        "mean_site",
+        "stdv_site",
+        "mean_complement",
+        "stdv_complement",
+        "transformed_displ",
+        "probex_site",
+        "probex_complement",
+        "probex_folded",
+    ],
+}
+
+_ACTIVE = None
+
+
+class TraceRecorder:
+    """
+    Record the selected internal calculations for each call of the traced functions.
+
+    Each call is stored with the arrays before broadcasting; the aligned columns are created by
+    `to_arrays` or `to_frame`.
+
+    Parameters
+    ----------
+    fields : ArrayLike, optional
+        Names of the fields to record (see `FIELDS`). The index and coordinate columns are always
+        recorded. Default None (all fields).
+
+    Raises
+    ------
+    ValueError
+        If a field is not in `FIELDS`.
+    """
+
+    __slots__ = ("fields", "_records")
+
+    def __init__(self, fields=None):
+        if fields is not None:
+            fields = [fields] if isinstance(fields, str) else list(fields)
+            valid = {f for names in FIELDS.values() for f in names}
+            invalid = [f for f in fields if f not in valid]
+            if invalid:
+                raise ValueError(
+                    f"{invalid} are invalid 'fields'; only {sorted(valid)} are allowed."
+                )
+        self.fields = fields
+        self._records = {}
+
+    def __repr__(self):
+        calls = ", ".join(f"{stage}={len(records)}" for stage, records in self._records.items())
+        return f"{type(self).__name__}(fields={self.fields}, calls: {calls or 'none'})"
+
+    @property
+    def stages(self):
+        """Names of the functions with recorded calls."""
+        return list(self._records)
+
+    def _record(self, stage, shape, coords, values):
+        """Store the coordinates and the selected values (aligned for broadcasting to shape)."""
+        if self.fields is not None:
+            values = {k: v for k, v in values.items() if k in self.fields}
+        arrays = {k: np.array(v) for k, v in {**coords, **values}.items()}
+        self._records.setdefault(stage, []).append((tuple(shape), arrays))
+
+    def n_rows(self, stage):
+        """Return the number of rows in the trace of a function."""
+        return sum(int(np.prod(shape)) for shape, _ in self._records.get(stage, []))
+
+    def to_arrays(self, stage):
+        """
+        Return the trace of a function as aligned columns.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the traced function, 'calc_displ_site' or 'calc_prob_exceed'.
+
+        Returns
+        -------
+        dict
+            One-dimensional arrays of equal length keyed by column name:
+
+            - **call**: Call number of the function (from zero).
+            - **scenario**: Scenario number within the call (from zero).
+            - The coordinate columns (see `COORDINATES`) and the selected fields.
+        """
+        columns = {name: [] for name in INDEX_COLUMNS}
+        for call, (shape, arrays) in enumerate(self._records.get(stage, [])):
+            n_rows = int(np.prod(shape))
+            columns["call"].append(np.full(n_rows, call))
+            columns["scenario"].append(np.repeat(np.arange(shape[0]), int(np.prod(shape[1:]))))
+            for name, value in arrays.items():
+                columns.setdefault(name, []).append(np.broadcast_to(value, shape).ravel())
+
+        return {
+            name: np.concatenate(values) if values else np.array([], dtype=int)
+            for name, values in columns.items()
+        }
+
+    def to_frame(self, stage):
+        """
+        Return the trace of a function as a pandas DataFrame (see `to_arrays`).
+
+        Parameters
+        ----------
+        stage : str
+            Name of the traced function, 'calc_displ_site' or 'calc_prob_exceed'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A DataFrame with one row per scenario, percentile or displacement, and model.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.to_arrays(stage))
+
+    def clear(self):
+        """Remove the recorded calls."""
+        self._records.clear()
+
+
+def _tracing():
+    """Check if tracing is enabled."""
+    return _ACTIVE is not None
+
+
+def _record_trace(stage, shape, coords, **values):
+    """Record the values of a traced function if tracing is enabled."""
+    if _ACTIVE is not None:
+        _ACTIVE._record(stage, shape, coords, values)
+
+
+def enable_tracing(fields=None):
+    """
+    Enable tracing of the internal calculations.
+
+    The in-memory and on-disk result caches are bypassed while tracing is enabled, so that every
+    call is recorded.
+
+    Parameters
+    ----------
+    fields : ArrayLike, optional
+        Names of the fields to record (see `FIELDS`). Default None (all fields).
+
+    Returns
+    -------
+    TraceRecorder
+        The recorder of the internal calculations.
+
+    Raises
+    ------
+    RuntimeError
+        If tracing is already enabled.
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        raise RuntimeError("Tracing is already enabled.")
+
+    _ACTIVE = TraceRecorder(fields)
+    return _ACTIVE
+
+
+def disable_tracing():
+    """
+    Disable tracing.
+
+    Returns
+    -------
+    TraceRecorder or None
+        The recorder of the internal calculations, or None if tracing was not enabled.
+    """
+    global _ACTIVE
+    recorder, _ACTIVE = _ACTIVE, None
+    return recorder
+
+
+@contextmanager
+def trace(fields=None):
+    """
+    Context manager to record the internal calculations of `calc_displ_site` and
+    `calc_prob_exceed`, including runs of multiple scenarios with `override=True`.
+
+    Parameters
+    ----------
+    fields : ArrayLike, optional
+        Names of the fields to record (see `FIELDS`). Default None (all fields).
+
+    Yields
+    ------
+    TraceRecorder
+        The recorder; use `TraceRecorder.to_arrays` or `TraceRecorder.to_frame` for the trace.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        import numpy as np
+        import kuehn_et_al_fdm as kea
+        from kuehn_et_al_fdm.trace import trace
+
+        with trace(["mean_site", "stdv_complement", "Y_folded"]) as recorder:
+            kea.calc_displ_site(
+                magnitude=np.array([6.5, 7, 7.5]), location=np.array([0.1, 0.3, 0.5]),
+                style="strike-slip", percentile=0.84, override=True,
+            )
+        columns = recorder.to_arrays("calc_displ_site")
+        columns["Y_folded"]  # array with one element per scenario
+    """
+    recorder = enable_tracing(fields)
+    try:
+        yield recorder
+    finally:
+        disable_tracing()
@@ -2,9 +2,16 @@
 
 # Python imports
 import numpy as np
-from scipy import stats
+from scipy import special
 
+# Module imports
+from kuehn_et_al_fdm.profiling import _profile_stage
 
+# Solver settings for the folded (site/complement mixture) quantile
+FOLDED_TOL, FOLDED_MAX_ITER = 1e-10, 50
+
+
+@_profile_stage("back_transform")
 def _calc_analytic_mean(bc_parameter, mean, stdv):
     """
     Helper function to calculate the back-transformed predicted mean displacement in meters
@@ -33,6 +40,7 @@ def _calc_analytic_mean(bc_parameter, mean, stdv):
     )
 
 
+@_profile_stage("distribution")
 def _calc_transformed_displ(bc_parameter, mean, stdv, quantile):
     """
     Helper function to calculate predicted displacement in transformed units
@@ -40,34 +48,161 @@ def _calc_transformed_displ(bc_parameter, mean, stdv, quantile):
 
     Parameters
     ----------
-    bc_parameter : int or float or numpy.ndarray with a single element
+    bc_parameter : ArrayLike
         Box-Cox transformation parameter "lambda".
 
-    mean : int or float or numpy.ndarray with a single element
+    mean : ArrayLike
         Mean displacement in transformed units.
 
-    stdv : int or float or numpy.ndarray with a single element
+    stdv : ArrayLike
         Standard deviation of displacement in transformed units.
 
-    quantile : int or float or numpy.ndarray with a single element
-        Aleatory quantile value. Use -1 for mean.
+    quantile : ArrayLike
+        Aleatory quantile value(s). Use -1 for mean. Arrays can mix the mean and regular quantiles
+        and must be broadcastable with the model parameters.
 
     Returns
     -------
-    displ_bc : int or float or numpy.ndarray with a single element
+    displ_bc : numpy.ndarray
         Predicted displacement in transformed units.
     """
-    if quantile == -1:
+    is_mean = np.asarray(quantile) == -1
+
+    if np.all(is_mean):
         # Compute the back-transformed mean
         displ_meters = _calc_analytic_mean(bc_parameter, mean, stdv)
-        displ_bc = (np.power(displ_meters, bc_parameter) - 1) / bc_parameter
+        return (np.power(displ_meters, bc_parameter) - 1) / bc_parameter
+
+    displ_bc = mean + special.ndtri(np.where(is_mean, 0.5, quantile)) * stdv
 
-    else:
-        displ_bc = stats.norm.ppf(quantile, loc=mean, scale=stdv)
+    if np.any(is_mean):
+        displ_meters = _calc_analytic_mean(bc_parameter, mean, stdv)
+        displ_mean = (np.power(displ_meters, bc_parameter) - 1) / bc_parameter
+        displ_bc = np.where(is_mean, displ_mean, displ_bc)
 
     return displ_bc
 
 
+@_profile_stage("distribution")
+def _calc_folded_transformed_displ(
+    bc_parameter, mean_site, stdv_site, mean_complement, stdv_complement, quantile
+):
+    """
+    Helper function to calculate the exact folded displacement in transformed units using the
+    model parameters for the site and complementary locations.
+
+    The folded distribution is the 50/50 mixture of the site and complementary distributions (i.e.,
+    the distribution used for the folded probability of exceedance). The mixture quantile is
+    found by solving the mixture CDF with a bracketed Newton-Raphson iteration, which is fully
+    vectorized over all array elements. The quantiles of the two components bracket the solution.
+
+    Parameters
+    ----------
+    bc_parameter : ArrayLike
+        Box-Cox transformation parameter "lambda".
+
+    mean_site : ArrayLike
+        Mean displacement in transformed units for the site location.
+
+    stdv_site : ArrayLike
+        Standard deviation of displacement in transformed units for the site location.
+
+    mean_complement : ArrayLike
+        Mean displacement in transformed units for the complementary location.
+
+    stdv_complement : ArrayLike
+        Standard deviation of displacement in transformed units for the complementary location.
+
+    quantile : ArrayLike
+        Aleatory quantile value. Use -1 for mean.
+
+    Returns
+    -------
+    displ_bc : numpy.ndarray
+        Predicted folded displacement in transformed units.
+    """
+    mean_site, stdv_site, mean_complement, stdv_complement, quantile = np.broadcast_arrays(
+        mean_site, stdv_site, mean_complement, stdv_complement, quantile
+    )
+
+    # The mean of the mixture is the average of the back-transformed means
+    is_mean = quantile == -1
+    if np.any(is_mean):
+        displ_meters = 0.5 * (
+            _calc_analytic_mean(bc_parameter, mean_site, stdv_site)
+            + _calc_analytic_mean(bc_parameter, mean_complement, stdv_complement)
+        )
+        displ_mean = (np.power(displ_meters, bc_parameter) - 1) / bc_parameter
+        if np.all(is_mean):
+            return displ_mean
+        quantile = np.where(is_mean, 0.5, quantile)
+
+    # Component quantiles bracket the mixture quantile
+    z = special.ndtri(quantile)
+    y_site, y_complement = mean_site + z * stdv_site, mean_complement + z * stdv_complement
+    lower, upper = np.minimum(y_site, y_complement), np.maximum(y_site, y_complement)
+
+    # Quantiles of 0 or 1 are infinite for both components
+    infinite = ~np.isfinite(z)
+    lower, upper = np.where(infinite, 0, lower), np.where(infinite, 0, upper)
+
+    displ_bc = 0.5 * (lower + upper)
+    for _ in range(FOLDED_MAX_ITER):
+        z_site = (displ_bc - mean_site) / stdv_site
+        z_complement = (displ_bc - mean_complement) / stdv_complement
+        residual = 0.5 * (special.ndtr(z_site) + special.ndtr(z_complement)) - quantile
+        slope = (
+            0.5
+            * (
+                np.exp(-0.5 * z_site**2) / stdv_site
+                + np.exp(-0.5 * z_complement**2) / stdv_complement
+            )
+            / np.sqrt(2 * np.pi)
+        )
+
+        # Shrink the bracket, then take a Newton step (or bisect if the step leaves the bracket)
+        upper = np.where(residual > 0, displ_bc, upper)
+        lower = np.where(residual > 0, lower, displ_bc)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            updated = displ_bc - residual / slope
+        outside = ~((updated > lower) & (updated < upper))
+        updated = np.where(outside, 0.5 * (lower + upper), updated)
+
+        converged = np.abs(updated - displ_bc) <= FOLDED_TOL * (1 + np.abs(displ_bc))
+        displ_bc = updated
+        if np.all(converged):
+            break
+
+    displ_bc = np.where(infinite, z, displ_bc)
+
+    return np.where(is_mean, displ_mean, displ_bc) if np.any(is_mean) else displ_bc
+
+
+@_profile_stage("distribution")
+def _calc_norm_cdf(x, mean, stdv):
+    """
+    Helper function to calculate the normal cumulative distribution function in transformed units.
+
+    Parameters
+    ----------
+    x : ArrayLike
+        Displacement in transformed units.
+
+    mean : ArrayLike
+        Mean displacement in transformed units.
+
+    stdv : ArrayLike
+        Standard deviation of displacement in transformed units.
+
+    Returns
+    -------
+    numpy.ndarray
+        Probability that the displacement is less than or equal to `x`.
+    """
+    return special.ndtr((np.asarray(x) - mean) / stdv)
+
+
+@_profile_stage("back_transform")
 def _convert_bc_to_meters(Y_value, bc_parameter):
     """
     Helper function to convert from transformed units (Y) to arithmetic units (meters).
@@ -0,0 +1,297 @@
+"""This module contains various private helper functions used to calculate the epistemic uncertainty
+of the model predictions in transformed units.
+"""
+
+# Python imports
+import numpy as np
+from scipy import special
+
+# Module imports
+from kuehn_et_al_fdm.load_data import DATA
+from kuehn_et_al_fdm.profiling import _profile_stage
+from kuehn_et_al_fdm.prediction_functions import _grad_func_nm, _grad_func_rv, _grad_func_ss
+
+# Default epistemic fractiles for the parametric epistemic mode
+EPISTEMIC_FRACTILES = (0.05, 0.16, 0.5, 0.84, 0.95)
+
+# Point estimates of the model coefficients used for each epistemic mode
+POINT_ESTIMATES = {"parametric": "median", "analytic": "mean"}
+
+# Interpolators are built once per style on first use
+_INTERPOLATORS = {}
+
+
+def _get_uncertainty_interpolator(style):
+    """
+    Build (or retrieve) the interpolator for the tabulated epistemic uncertainties.
+
+    Parameters
+    ----------
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    Returns
+    -------
+    scipy.interpolate.RegularGridInterpolator
+        Linear interpolator over (magnitude, location) that returns the epistemic standard
+        deviations of the median and the total standard deviation (last axis).
+    """
+    style = style.lower()
+
+    if style not in _INTERPOLATORS:
+        # Imported on first use to keep the package fast to import
+        from scipy.interpolate import RegularGridInterpolator
+
+        table = DATA["uncertainty"][style]
+        magnitudes, mag_idx = np.unique(table["M"].to_numpy(), return_inverse=True)
+        locations, loc_idx = np.unique(table["Ustar"].to_numpy(), return_inverse=True)
+
+        values = np.full((len(magnitudes), len(locations), 2), np.nan)
+        values[mag_idx, loc_idx] = table[["sd_med", "sd_sigma_T"]].to_numpy()
+
+        _INTERPOLATORS[style] = RegularGridInterpolator((magnitudes, locations), values)
+
+    return _INTERPOLATORS[style]
+
+
+def _calc_epistemic_stdv(magnitude, location, style):
+    """
+    Calculate the epistemic standard deviations from the tabulated uncertainty grids.
+
+    Parameters
+    ----------
+    magnitude : ArrayLike
+        Earthquake moment magnitude.
+
+    location : ArrayLike
+        Normalized location along rupture length, range [0, 1.0].
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    Returns
+    -------
+    tuple
+        - 'sd_med': Epistemic standard deviation of the mean in transformed units.
+        - 'sd_sigma': Epistemic standard deviation of the total standard deviation in transformed
+          units.
+
+    Notes
+    ------
+    Magnitudes outside of the tabulated range are clipped to the nearest tabulated magnitude.
+    """
+    interpolator = _get_uncertainty_interpolator(style)
+    magnitudes, locations = interpolator.grid
+
+    magnitude, location = np.broadcast_arrays(magnitude, location)
+    points = np.stack(
+        [
+            np.clip(magnitude, magnitudes[0], magnitudes[-1]),
+            np.clip(location, locations[0], locations[-1]),
+        ],
+        axis=-1,
+    )
+    values = interpolator(points)
+
+    return values[..., 0], values[..., 1]
+
+
+def _calc_delta_method_stdv(magnitude, location, style, coefficient_type="mean"):
+    """
+    Calculate the epistemic standard deviations by propagating the covariance of the model
+    coefficients with the delta method (i.e., first-order Taylor expansion).
+
+    Parameters
+    ----------
+    magnitude : ArrayLike
+        Earthquake moment magnitude.
+
+    location : ArrayLike
+        Normalized location along rupture length, range [0, 1.0].
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    coefficient_type : str, optional
+        Point estimate of the model coefficients used to evaluate the gradients. Valid options are
+        'mean' or 'median'. Default 'mean'.
+
+    Returns
+    -------
+    tuple
+        - 'sd_med': Epistemic standard deviation of the mean in transformed units.
+        - 'sd_sigma': Epistemic standard deviation of the total standard deviation in transformed
+          units.
+        - 'correlation': Epistemic correlation between the mean and total standard deviation.
+    """
+    style = style.lower()
+    function_map = {
+        "strike-slip": _grad_func_ss,
+        "reverse": _grad_func_rv,
+        "normal": _grad_func_nm,
+    }
+
+    coeffs = DATA["point"][style]
+    coeffs = coeffs[coeffs["model_id"] == coefficient_type].to_records(index=False)
+    grad_mu, grad_sd = function_map[style](coeffs, np.asarray(magnitude), np.asarray(location))
+
+    # Assemble Jacobians (scenarios x coefficients); the Box-Cox parameter has no effect
+    covariance = DATA["covariance"][style]
+    names = covariance.columns
+    n_names = len(names)
+    gradients = np.broadcast_arrays(
+        *[grad.get(n, 0.0) for grad in [grad_mu, grad_sd] for n in names]
+    )
+    jacobian_mu = np.stack(gradients[:n_names], axis=-1)
+    jacobian_sd = np.stack(gradients[n_names:], axis=-1)
+    covariance = covariance.to_numpy()
+
+    var_mu = np.einsum("...i,ij,...j->...", jacobian_mu, covariance, jacobian_mu)
+    var_sd = np.einsum("...i,ij,...j->...", jacobian_sd, covariance, jacobian_sd)
+    cov_mu_sd = np.einsum("...i,ij,...j->...", jacobian_mu, covariance, jacobian_sd)
+
+    sd_med, sd_sigma = np.sqrt(var_mu), np.sqrt(var_sd)
+    return sd_med, sd_sigma, cov_mu_sd / (sd_med * sd_sigma)
+
+
+@_profile_stage("epistemic")
+def _calc_epistemic_params(magnitude, location, style, coefficient_type):
+    """
+    Calculate the epistemic standard deviations for the 'parametric' or 'analytic' epistemic modes.
+
+    Parameters
+    ----------
+    magnitude : ArrayLike
+        Earthquake moment magnitude.
+
+    location : ArrayLike
+        Normalized location along rupture length, range [0, 1.0].
+
+    style : str
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    coefficient_type : str
+        Epistemic mode. Valid options are 'parametric' (tabulated uncertainty grids) or 'analytic'
+        (delta method with the coefficient covariance).
+
+    Returns
+    -------
+    tuple
+        - 'sd_med': Epistemic standard deviation of the mean in transformed units.
+        - 'sd_sigma': Epistemic standard deviation of the total standard deviation in transformed
+          units.
+        - 'correlation': Epistemic correlation between the mean and total standard deviation.
+    """
+    if coefficient_type == "analytic":
+        return _calc_delta_method_stdv(
+            magnitude, location, style, POINT_ESTIMATES[coefficient_type]
+        )
+
+    sd_med, sd_sigma = _calc_epistemic_stdv(magnitude, location, style)
+    return sd_med, sd_sigma, 0
+
+
+@_profile_stage("distribution")
+def _calc_fractile_transformed_displ(
+    displ_bc, stdv_mean, stdv_sigma, quantile, fractiles, correlation=0
+):
+    """
+    Calculate epistemic fractiles of the predicted displacement in transformed units.
+
+    The displacement for aleatory quantile `p` is Y = mean + z_p * stdv, so its epistemic variance
+    is stdv_mean^2 + z_p^2 * stdv_sigma^2 + 2 * z_p * correlation * stdv_mean * stdv_sigma. Only the
+    uncertainty of the mean is used for the mean displacement (quantile -1).
+
+    Parameters
+    ----------
+    displ_bc : ArrayLike
+        Predicted displacement in transformed units from the median model. The last axis must be a
+        model axis with a single element; it is replaced by the epistemic fractiles.
+
+    stdv_mean : ArrayLike
+        Epistemic standard deviation of the mean in transformed units.
+
+    stdv_sigma : ArrayLike
+        Epistemic standard deviation of the total standard deviation in transformed units.
+
+    quantile : ArrayLike
+        Aleatory quantile value(s). Use -1 for mean.
+
+    fractiles : ArrayLike
+        Epistemic fractiles.
+
+    correlation : ArrayLike, optional
+        Epistemic correlation between the mean and total standard deviation. Default 0.
+
+    Returns
+    -------
+    numpy.ndarray
+        Epistemic fractiles of the predicted displacement in transformed units.
+    """
+    quantile = np.asarray(quantile, dtype=float)
+    z_aleatory = np.where(
+        quantile == -1, 0, special.ndtri(np.where(quantile == -1, 0.5, quantile))
+    )
+    stdv = np.sqrt(
+        np.power(stdv_mean, 2)
+        + np.power(z_aleatory * stdv_sigma, 2)
+        + 2 * z_aleatory * correlation * stdv_mean * stdv_sigma
+    )
+
+    return displ_bc + special.ndtri(np.asarray(fractiles, dtype=float)) * stdv
+
+
+@_profile_stage("distribution")
+def _calc_fractile_prob_exceed(
+    transformed_displ, mean, stdv, stdv_mean, stdv_sigma, fractiles, correlation=0
+):
+    """
+    Calculate epistemic fractiles of the probability of exceedance.
+
+    The exceedance probability is a monotonic function of the standardized displacement
+    t = (y - mean) / stdv, and the epistemic variance of t is approximated to first order with
+    (stdv_mean^2 + t^2 * stdv_sigma^2 + 2 * t * correlation * stdv_mean * stdv_sigma) / stdv^2.
+
+    Parameters
+    ----------
+    transformed_displ : ArrayLike
+        Test values of displacement in transformed units.
+
+    mean : ArrayLike
+        Mean displacement in transformed units from the median model.
+
+    stdv : ArrayLike
+        Total standard deviation in transformed units from the median model.
+
+    stdv_mean : ArrayLike
+        Epistemic standard deviation of the mean in transformed units.
+
+    stdv_sigma : ArrayLike
+        Epistemic standard deviation of the total standard deviation in transformed units.
+
+    fractiles : ArrayLike
+        Epistemic fractiles, which must be broadcastable with the other inputs.
+
+    correlation : ArrayLike, optional
+        Epistemic correlation between the mean and total standard deviation. Default 0.
+
+    Returns
+    -------
+    numpy.ndarray
+        Epistemic fractiles of the probability of exceedance.
+    """
+    t = (transformed_displ - mean) / stdv
+    stdv_t = (
+        np.sqrt(
+            np.power(stdv_mean, 2)
+            + np.power(t * stdv_sigma, 2)
+            + 2 * t * correlation * stdv_mean * stdv_sigma
+        )
+        / stdv
+    )
+
+    return special.ndtr(special.ndtri(np.asarray(fractiles, dtype=float)) * stdv_t - t)
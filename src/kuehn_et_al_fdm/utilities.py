@@ -3,6 +3,9 @@
 import numpy as np
 import warnings
 
+# Module imports
+from kuehn_et_al_fdm.profiling import _profile_stage
+
 # Define recommended magnitude ranges
 MAG_RANGES = {"strike-slip": [6, 8], "reverse": [5, 8], "normal": [6, 8]}
 
@@ -23,6 +26,7 @@ def _check_type(param, param_name, *expected_types, msg=None):
         raise TypeError(error_message)
 
 
+@_profile_stage("validation")
 def _check_location_range(location):
     """Check that the location is within the allowable range."""
     min_val, max_val = 0, 1
@@ -34,6 +38,7 @@ def _check_location_range(location):
         )
 
 
+@_profile_stage("validation")
 def _check_magnitude_range(magnitude, style, ranges_dict=MAG_RANGES):
     """Check that the magnitude is within the allowable range for the style."""
     style = style.lower()
@@ -46,3 +51,54 @@ def _check_magnitude_range(magnitude, style, ranges_dict=MAG_RANGES):
             f"{style} faulting, which is [{min_val}, {max_val}]."
         )
         warnings.warn(warning_message, UserWarning)
+
+
+def _calc_weighted_mean(values, weights, axis=0):
+    """Calculate the weighted mean along an axis."""
+    values = np.moveaxis(np.asarray(values, dtype=float), axis, -1)
+    weights = np.asarray(weights, dtype=float)
+    return values @ (weights / weights.sum())
+
+
+def _calc_weighted_quantile(values, weights, quantiles, axis=0):
+    """
+    Calculate weighted quantiles along an axis.
+
+    The quantiles are linearly interpolated between the midpoints of the cumulative weights, which
+    reduces to the Hazen definition of sample quantiles for equal weights.
+
+    Parameters
+    ----------
+    values : ArrayLike
+        Values to summarize.
+
+    weights : ArrayLike
+        Weights with the same length as `values` along `axis`.
+
+    quantiles : ArrayLike
+        Quantiles to compute, range [0, 1.0].
+
+    axis : int, optional
+        Axis along which the quantiles are computed. Default 0.
+
+    Returns
+    -------
+    numpy.ndarray
+        Weighted quantiles. The first axis corresponds to `quantiles` and the remaining axes
+        correspond to the other axes of `values`.
+    """
+    values = np.moveaxis(np.asarray(values, dtype=float), axis, -1)
+    weights = np.asarray(weights, dtype=float)
+    quantiles = np.atleast_1d(quantiles)
+
+    order = np.argsort(values, axis=-1)
+    sorted_values = np.take_along_axis(values, order, axis=-1)
+    sorted_weights = weights[order]
+    cumulative = np.cumsum(sorted_weights, axis=-1) - 0.5 * sorted_weights
+    cumulative /= np.sum(sorted_weights, axis=-1, keepdims=True)
+
+    flat_values = sorted_values.reshape(-1, sorted_values.shape[-1])
+    flat_cumulative = cumulative.reshape(-1, cumulative.shape[-1])
+    result = np.array([np.interp(quantiles, c, v) for c, v in zip(flat_cumulative, flat_values)])
+
+    return np.moveaxis(result.reshape(values.shape[:-1] + quantiles.shape), -1, 0)
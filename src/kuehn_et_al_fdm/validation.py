@@ -0,0 +1,189 @@
+"""This module validates a batch of scenarios (magnitude, location, and style of faulting) in one
+vectorized pass. Unlike the scalar checks used by the calculation functions, which raise on the
+first invalid value or warn on every call, the batch validation reports the indices of all
+offending rows and emits at most one aggregated warning.
+"""
+
+# Python imports
+import warnings
+import numpy as np
+
+# Module imports
+from kuehn_et_al_fdm.utilities import MAG_RANGES
+from kuehn_et_al_fdm.profiling import _profile_stage
+
+# Validation policies
+POLICIES = ["raise", "drop", "flag"]
+
+# Maximum number of row indices shown for each check in messages
+_MAX_SHOWN = 10
+
+
+class ScenarioValidation:
+    """
+    Result of the batch validation of scenarios.
+
+    Attributes
+    ----------
+    magnitude, location, style : numpy.ndarray
+        Scenarios, broadcast to one row each. Only the valid rows are included if the policy is
+        'drop'.
+
+    mask : numpy.ndarray
+        Boolean mask of the valid rows of the input scenarios.
+
+    report : dict
+        Row indices (of the input scenarios) that fail each check:
+
+        - **invalid_magnitude**: Magnitude is not a finite number.
+        - **invalid_location**: Location is not a finite number within the range [0, 1].
+        - **unknown_style**: Style is not 'strike-slip', 'reverse', or 'normal'.
+        - **magnitude_out_of_range**: Magnitude is not within the recommended range for the
+          style. These rows are valid (as in the calculation functions), but are included in
+          the warning.
+    """
+
+    __slots__ = ("magnitude", "location", "style", "mask", "report")
+
+    def __init__(self, magnitude, location, style, mask, report):
+        self.magnitude = magnitude
+        self.location = location
+        self.style = style
+        self.mask = mask
+        self.report = report
+
+    def __repr__(self):
+        counts = ", ".join(f"{k}={len(v)}" for k, v in self.report.items())
+        return f"{type(self).__name__}(rows={self.mask.size}, valid={self.mask.sum()}, {counts})"
+
+    def summary(self):
+        """Return a one-line summary of the offending rows for each check."""
+        return _summarize(self.report)
+
+
+def _summarize(report):
+    """Summarize the number and first indices of the offending rows for each check."""
+    parts = []
+    for check, rows in report.items():
+        if len(rows) == 0:
+            continue
+        shown = ", ".join(str(i) for i in rows[:_MAX_SHOWN])
+        more = ", ..." if len(rows) > _MAX_SHOWN else ""
+        parts.append(f"{check}: {len(rows)} rows [{shown}{more}]")
+    return "; ".join(parts)
+
+
+@_profile_stage("validation")
+def validate_scenarios(*, magnitude, location, style, policy="flag"):
+    """
+    Validate a batch of scenarios in one vectorized pass.
+
+    Parameters
+    ----------
+    magnitude : ArrayLike
+        Earthquake moment magnitude.
+
+    location : ArrayLike
+        Normalized location along rupture length, range [0, 1.0].
+
+    style : str or ArrayLike
+        Style of faulting (case-insensitive). Valid options are 'strike-slip', 'reverse', or
+        'normal'.
+
+    policy : str, optional
+        Option for the invalid rows (case-insensitive). Valid options are 'raise' (raise an
+        error), 'drop' (exclude the rows from the returned scenarios), or 'flag' (keep the rows
+        and mark them in the mask). Default 'flag'.
+
+    Returns
+    -------
+    ScenarioValidation
+        The broadcast scenarios, the mask of the valid rows, and the report of the offending
+        row indices for each check.
+
+    Raises
+    ------
+    ValueError
+        If `policy` is not 'raise', 'drop', or 'flag'.
+
+    ValueError
+        If `policy` is 'raise' and one or more rows are invalid.
+
+    Warns
+    -----
+    UserWarning
+        One aggregated warning if rows are dropped or flagged or if magnitudes are not within the
+        recommended range for the style.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from kuehn_et_al_fdm.validation import validate_scenarios
+
+        result = validate_scenarios(
+            magnitude=[7, 5.5, 7], location=[0.2, 0.5, 1.2], style="normal", policy="drop"
+        )
+        result.mask  # array([ True,  True, False])
+        result.report["invalid_location"]  # array([2])
+    """
+    policy = policy.lower()
+    if policy not in POLICIES:
+        raise ValueError(
+            f"'{policy}' is an invalid 'policy'; only 'raise', 'drop', or 'flag' is allowed."
+        )
+
+    # Look up the magnitude range from the unique styles (before broadcasting to rows)
+    style = np.asarray(style)
+    unique_styles, inverse = np.unique(style, return_inverse=True)
+    inverse = inverse.reshape(style.shape)
+    lower_styles = [str(s).lower() for s in unique_styles]
+    known = np.array([s in MAG_RANGES for s in lower_styles], dtype=bool)
+    ranges = np.array([MAG_RANGES.get(s, [np.nan, np.nan]) for s in lower_styles], dtype=float)
+
+    magnitude, location, style, inverse = [
+        np.ravel(arr)
+        for arr in np.broadcast_arrays(
+            np.asarray(magnitude, dtype=float), np.asarray(location, dtype=float), style, inverse
+        )
+    ]
+    min_magnitude, max_magnitude = ranges[inverse].T
+
+    invalid_magnitude = ~np.isfinite(magnitude)
+    invalid_location = ~(np.isfinite(location) & (location >= 0) & (location <= 1))
+    unknown_style = ~known[inverse]
+    with np.errstate(invalid="ignore"):
+        out_of_range = ~(invalid_magnitude | unknown_style) & (
+            (magnitude < min_magnitude) | (magnitude > max_magnitude)
+        )
+
+    mask = ~(invalid_magnitude | invalid_location | unknown_style)
+    report = {
+        "invalid_magnitude": np.flatnonzero(invalid_magnitude),
+        "invalid_location": np.flatnonzero(invalid_location),
+        "unknown_style": np.flatnonzero(unknown_style),
+        "magnitude_out_of_range": np.flatnonzero(out_of_range),
+    }
+
+    n_invalid = mask.size - np.count_nonzero(mask)
+    if n_invalid and policy == "raise":
+        raise ValueError(
+            f"{n_invalid} of {mask.size} scenarios are invalid: {_summarize(report)}."
+        )
+
+    n_out_of_range = len(report["magnitude_out_of_range"])
+    if n_invalid or n_out_of_range:
+        messages = []
+        if n_invalid:
+            action = "dropped" if policy == "drop" else "flagged"
+            messages.append(f"{n_invalid} of {mask.size} scenarios are invalid and were {action}")
+        if n_out_of_range:
+            messages.append(
+                f"{n_out_of_range} magnitudes are not within the recommended range for the style"
+            )
+        warnings.warn(f"\n***{'; '.join(messages)} ({_summarize(report)}).", UserWarning)
+
+    if policy == "drop":
+        magnitude, location, style = magnitude[mask], location[mask], style[mask]
+
+    return ScenarioValidation(magnitude, location, style, mask, report)
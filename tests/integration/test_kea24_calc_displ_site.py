@@ -5,6 +5,7 @@ import numpy as np
 
 
 from kuehn_et_al_fdm.calc_displ_site import calc_displ_site
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
 
 
 # Test setup
@@ -135,3 +136,111 @@ def test_calc_displ_site_full_model(load_expected):
         rtol=RTOL,
         err_msg=f"Expected: {expected}, Computed: {computed}",
     )
+
+
+def test_calc_displ_site_exact_folded():
+    """The exact folded displacement should be consistent with the folded exceedance probability."""
+
+    # Inputs
+    magnitude = 7
+    location = 0.15
+    style = "reverse"
+
+    for percentile in [0.16, 0.5, 0.84]:
+        # Computed
+        displ = calc_displ_site(
+            magnitude=magnitude,
+            location=location,
+            style=style,
+            percentile=percentile,
+            exact_folded=True,
+        )
+        probex = calc_prob_exceed(
+            magnitude=magnitude, location=location, style=style, displacement_array=displ
+        )
+
+        # Checks
+        np.testing.assert_allclose(
+            1 - percentile,
+            probex,
+            rtol=1e-6,
+            err_msg=f"Percentile {percentile}, Computed exceedance: {probex}",
+        )
+
+
+def test_calc_displ_site_exact_folded_full_model():
+    """The exact folded displacement should be bounded by the site and complement values."""
+
+    # Inputs
+    params = {"magnitude": 7, "style": "normal", "percentile": 0.84, "coefficient_type": "full"}
+
+    # Computed
+    results = calc_displ_site(**params, location=0.2, exact_folded=True, debug=True)
+    lower = np.minimum(results["Y_site"], results["Y_complement"])
+    upper = np.maximum(results["Y_site"], results["Y_complement"])
+
+    # Checks
+    assert len(results) == 1000
+    assert np.all((results["Y_folded"] >= lower) & (results["Y_folded"] <= upper))
+
+
+def test_calc_displ_site_percentile_array():
+    """An array of percentiles should match repeated calls with single percentiles."""
+
+    # Inputs
+    percentiles = [-1, 0.16, 0.5, 0.84]
+    magnitudes = [6.5, 7.5]
+    params = {"location": 0.3, "style": "strike-slip"}
+
+    for coefficient_type, n_models in [("median", None), ("full", 1000)]:
+        # Computed
+        with pytest.warns(UserWarning):
+            computed = calc_displ_site(
+                **params,
+                magnitude=magnitudes,
+                percentile=percentiles,
+                coefficient_type=coefficient_type,
+                override=True,
+            )
+
+        # Checks
+        expected_shape = (len(magnitudes), len(percentiles))
+        expected_shape += (n_models,) if n_models else ()
+        assert computed.shape == expected_shape
+
+        for i, magnitude in enumerate(magnitudes):
+            for j, percentile in enumerate(percentiles):
+                expected = calc_displ_site(
+                    **params,
+                    magnitude=magnitude,
+                    percentile=percentile,
+                    coefficient_type=coefficient_type,
+                )
+                np.testing.assert_allclose(
+                    expected.squeeze(),
+                    computed[i, j],
+                    rtol=1e-10,
+                    err_msg=f"Mag {magnitude}, percentile {percentile}, {coefficient_type}",
+                )
+
+
+def test_calc_displ_site_parametric():
+    """The parametric epistemic fractiles should approximate the full model fractiles."""
+
+    # Inputs
+    params = {"magnitude": 7, "location": 0.2, "style": "reverse", "percentile": 0.84}
+    fractiles = [0.05, 0.16, 0.5, 0.84, 0.95]
+
+    # Computed
+    computed = calc_displ_site(
+        **params, coefficient_type="parametric", epistemic_fractiles=fractiles
+    )
+    full = calc_displ_site(**params, coefficient_type="full")
+
+    # Checks
+    np.testing.assert_allclose(
+        np.quantile(full, fractiles),
+        computed,
+        rtol=5e-2,
+        err_msg=f"Full: {np.quantile(full, fractiles)}, Parametric: {computed}",
+    )
@@ -0,0 +1,92 @@
+""" """
+
+import pytest
+import numpy as np
+
+
+from kuehn_et_al_fdm.calc_event_hazard import calc_event_hazard
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+
+
+MAGNITUDES = [6.5, 7, 7.5]
+LOCATIONS = np.array([[0.2, 0.5], [0.3, 0.05], [0.1, 0.9]])
+RATES = [1e-3, 5e-4, 1e-4]
+DISPLACEMENTS = [0.1, 1, 3]
+
+
+def _calc_analytic_hazard(style, site, coefficient_type="median"):
+    """Hazard integral over the rupture scenarios for one site."""
+    hazard = 0
+    for magnitude, location, rate in zip(MAGNITUDES, LOCATIONS[:, site], RATES):
+        probex = calc_prob_exceed(
+            magnitude=magnitude,
+            location=float(location),
+            style=style,
+            displacement_array=DISPLACEMENTS,
+            coefficient_type=coefficient_type,
+        )
+        if coefficient_type != "median":
+            probex = probex.groupby("displ_meters").apply(
+                lambda df: np.average(df["probex_folded"].astype(float), weights=df["weight"])
+            )
+        hazard += rate * np.asarray(probex)
+    return hazard
+
+
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+def test_calc_event_hazard_vs_analytic(style):
+    # Monte Carlo estimates are within a few standard errors of the hazard integral
+    computed = calc_event_hazard(
+        magnitude=MAGNITUDES,
+        location_array=LOCATIONS,
+        style=style,
+        rate=RATES,
+        displacement_array=DISPLACEMENTS,
+        n_events=200_000,
+        chunk_size=30_000,
+    )
+    for site in range(2):
+        rows = computed[computed["site"] == site]
+        expected = _calc_analytic_hazard(style, site)
+        assert np.all(np.abs(rows["rate_exceed"] - expected) < 5 * rows["std_error"])
+
+
+def test_calc_event_hazard_reduced():
+    computed = calc_event_hazard(
+        magnitude=MAGNITUDES,
+        location_array=LOCATIONS[:, 0],
+        style="reverse",
+        rate=RATES,
+        displacement_array=DISPLACEMENTS,
+        n_events=200_000,
+        coefficient_type="reduced",
+    )
+    expected = _calc_analytic_hazard("reverse", 0, "reduced")
+    assert np.all(np.abs(computed["rate_exceed"] - expected) < 5 * computed["std_error"])
+
+
+def test_calc_event_hazard_reproducible():
+    params = {
+        "magnitude": 7,
+        "location_array": 0.3,
+        "style": "normal",
+        "rate": 1e-3,
+        "displacement_array": DISPLACEMENTS,
+        "n_events": 50_000,
+        "chunk_size": 10_000,
+    }
+    first = calc_event_hazard(**params, seed=2)
+    second = calc_event_hazard(**params, seed=2)
+    assert first.equals(second)
+    assert np.all(np.diff(first["n_exceed"]) <= 0)
+
+
+def test_calc_event_hazard_invalid_rate():
+    with pytest.raises(ValueError):
+        calc_event_hazard(
+            magnitude=[7, 7.5],
+            location_array=[0.2, 0.3],
+            style="normal",
+            rate=[1e-3],
+            displacement_array=DISPLACEMENTS,
+        )
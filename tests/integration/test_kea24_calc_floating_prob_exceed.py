@@ -0,0 +1,69 @@
+""" """
+
+import pytest
+import numpy as np
+
+
+from kuehn_et_al_fdm.calc_floating_prob_exceed import (
+    _calc_rupture_length,
+    calc_floating_prob_exceed,
+    enumerate_floating_ruptures,
+)
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+
+
+@pytest.mark.parametrize("site_position", [0, 12.5, 30, 100])
+def test_enumerate_floating_ruptures(site_position):
+    # Closed-form pruning matches a brute-force enumeration of all positions
+    magnitudes = [6.5, 7, 7.5, 8.5]
+    computed = enumerate_floating_ruptures(
+        magnitude=magnitudes, fault_length=100, site_position=site_position, style="strike-slip"
+    )
+
+    for i, magnitude in enumerate(magnitudes):
+        length = min(_calc_rupture_length(magnitude, "strike-slip"), 100)
+        start = np.arange(0, 100 - length + 1e-9, 1.0)
+        included = (start <= site_position) & (start + length >= site_position)
+
+        members = computed[0] == i
+        assert computed[2][members].sum() == pytest.approx(included.mean())
+        np.testing.assert_allclose(
+            np.sort(computed[1][members]), np.sort((site_position - start[included]) / length)
+        )
+
+
+def test_calc_floating_prob_exceed():
+    # The result is the weighted sum over the included rupture positions
+    params = {"style": "reverse", "displacement_array": [0.1, 1]}
+    computed = calc_floating_prob_exceed(
+        **params, magnitude=[6.5, 7], fault_length=80, site_position=20
+    )
+    magnitude_index, location, weight = enumerate_floating_ruptures(
+        magnitude=[6.5, 7], fault_length=80, site_position=20, style="reverse"
+    )
+    expected = np.zeros((2, 2))
+    for i, u, w in zip(magnitude_index, location, weight):
+        expected[i] += w * calc_prob_exceed(**params, magnitude=[6.5, 7][i], location=float(u))
+
+    np.testing.assert_allclose(computed, expected)
+
+
+def test_calc_floating_prob_exceed_length_relation():
+    # A site beyond the reach of every rupture has zero probability
+    computed = calc_floating_prob_exceed(
+        magnitude=7,
+        fault_length=100,
+        site_position=100,
+        style="normal",
+        displacement_array=[0.1],
+        position_step=3,
+        length_relation=lambda magnitude: np.full(np.shape(magnitude), 0.5),
+    )
+    np.testing.assert_array_equal(computed, [[0]])
+
+
+def test_calc_floating_prob_exceed_invalid_site():
+    with pytest.raises(ValueError):
+        calc_floating_prob_exceed(
+            magnitude=7, fault_length=50, site_position=60, style="normal", displacement_array=[1]
+        )
@@ -0,0 +1,75 @@
+""" """
+
+import pytest
+import numpy as np
+
+
+from kuehn_et_al_fdm.calc_hazard import calc_hazard
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+
+
+MAGNITUDES = [6.5, 7, 7.5]
+LOCATIONS = [0.25, 0.3, 0.85]
+RATES = [1e-3, 5e-4, 1e-4]
+DISPLACEMENTS = [0.1, 1, 3]
+
+
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+def test_calc_hazard(style):
+    # The hazard is the rate-weighted sum of the probabilities of exceedance
+    computed = calc_hazard(
+        magnitude=MAGNITUDES,
+        location_array=LOCATIONS,
+        style=style,
+        rate=RATES,
+        displacement_array=DISPLACEMENTS,
+    )
+    expected = sum(
+        rate
+        * calc_prob_exceed(
+            magnitude=magnitude, location=location, style=style, displacement_array=DISPLACEMENTS
+        )
+        for magnitude, location, rate in zip(MAGNITUDES, LOCATIONS, RATES)
+    )
+    np.testing.assert_allclose(computed, expected)
+
+
+def test_calc_hazard_disaggregation():
+    # Disaggregation bins sum to the hazard and identify the scenario bins
+    params = {
+        "magnitude": MAGNITUDES,
+        "location_array": LOCATIONS,
+        "style": ["Normal", "reverse", "normal"],
+        "rate": RATES,
+        "displacement_array": DISPLACEMENTS,
+        "coefficient_type": "reduced",
+    }
+    hazard = calc_hazard(**params)
+    computed, disaggregation = calc_hazard(**params, disaggregation=True)
+    np.testing.assert_allclose(computed, hazard)
+
+    by_bin = disaggregation["magnitude_location_style"]
+    np.testing.assert_allclose(by_bin.sum(axis=(0, 1, 2)), hazard)
+    np.testing.assert_allclose(disaggregation["style_model"].sum(axis=(0, 1)), hazard)
+    assert disaggregation["styles"] == ["normal", "reverse"]
+
+    # Scenario bins by magnitude, folded location, and style
+    magnitude_bins = disaggregation["magnitude_bins"]
+    nonzero = np.argwhere(by_bin[..., 0] > 0)
+    expected = [
+        [np.searchsorted(magnitude_bins, 6.5), 2, 0],
+        [np.searchsorted(magnitude_bins, 7.0), 3, 1],
+        [np.searchsorted(magnitude_bins, 7.5), 1, 0],
+    ]
+    np.testing.assert_array_equal(nonzero, expected)
+
+
+def test_calc_hazard_invalid_rate():
+    with pytest.raises(ValueError):
+        calc_hazard(
+            magnitude=7,
+            location_array=0.3,
+            style="normal",
+            rate=-1,
+            displacement_array=DISPLACEMENTS,
+        )
@@ -0,0 +1,72 @@
+""" """
+
+import pytest
+import numpy as np
+
+
+from kuehn_et_al_fdm.calc_joint_prob_exceed import calc_joint_prob_exceed
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+from kuehn_et_al_fdm.simulate_displ import simulate_displ
+
+
+LOCATIONS = [0.1, 0.2, 0.3, 0.6]
+DISPLACEMENTS = [1, 1.5, 1, 2]
+
+
+@pytest.mark.parametrize("folded", [True, False])
+def test_calc_joint_prob_exceed_single_site(folded):
+    # A single site reproduces the marginal probability of exceedance
+    params = {"magnitude": 7, "style": "reverse", "folded": folded}
+    displ = [0.1, 0.5, 1, 3]
+    computed = calc_joint_prob_exceed(
+        **params, location_array=[0.3], displacement_array=np.reshape(displ, (-1, 1))
+    )
+    expected = calc_prob_exceed(**params, location=0.3, displacement_array=displ)
+    np.testing.assert_allclose(computed, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+def test_calc_joint_prob_exceed_vs_simulation(style):
+    # Quadrature agrees with Monte Carlo realizations sharing the between-event term
+    simulated = simulate_displ(
+        magnitude=7, location_array=LOCATIONS, style=style, n_realizations=200_000, seed=3
+    )[0, :, 0]
+    params = {"magnitude": 7, "location_array": LOCATIONS, "style": style, "folded": False}
+
+    computed = calc_joint_prob_exceed(**params, displacement_array=DISPLACEMENTS, mode="any")
+    assert computed == pytest.approx(np.mean(np.any(simulated > DISPLACEMENTS, axis=1)), abs=0.005)
+
+    computed = calc_joint_prob_exceed(**params, displacement_array=DISPLACEMENTS, mode="all")
+    assert computed == pytest.approx(np.mean(np.all(simulated > DISPLACEMENTS, axis=1)), abs=0.005)
+
+
+def test_calc_joint_prob_exceed_bounds():
+    # Any is at least the largest marginal and all is at most the smallest marginal
+    params = {"magnitude": 7, "location_array": LOCATIONS, "style": "normal"}
+    marginal = [
+        calc_prob_exceed(magnitude=7, location=u, style="normal", displacement_array=[d])
+        for u, d in zip(LOCATIONS, DISPLACEMENTS)
+    ]
+    any_ = calc_joint_prob_exceed(**params, displacement_array=DISPLACEMENTS, mode="any")
+    all_ = calc_joint_prob_exceed(**params, displacement_array=DISPLACEMENTS, mode="all")
+    assert max(marginal) <= any_ <= 1
+    assert 0 <= all_ <= min(marginal)
+
+
+def test_calc_joint_prob_exceed_full():
+    computed = calc_joint_prob_exceed(
+        magnitude=7,
+        location_array=np.linspace(0.01, 0.99, 200),
+        style="strike-slip",
+        displacement_array=[[1], [2]],
+        coefficient_type="full",
+    )
+    assert len(computed) == 2000
+    assert computed["probex_joint"].between(0, 1).all()
+
+
+def test_calc_joint_prob_exceed_invalid_mode():
+    with pytest.raises(ValueError):
+        calc_joint_prob_exceed(
+            magnitude=7, location_array=LOCATIONS, style="normal", displacement_array=1, mode="x"
+        )
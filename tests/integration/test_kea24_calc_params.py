@@ -4,6 +4,9 @@ import pytest
 import numpy as np
 
 from kuehn_et_al_fdm.calc_params import _calc_params
+from kuehn_et_al_fdm.calc_displ_site import calc_displ_site
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+from kuehn_et_al_fdm.calc_prob_occur import calc_prob_occur
 
 
 # Test setup
@@ -92,3 +95,53 @@ def test__calc_params_mean_model(load_expected):
                 rtol=RTOL,
                 err_msg=f"Mag {magnitude}, u-star {location}, {key}, Expected: {expected}, Computed: {computed}",
             )
+
+
+@pytest.mark.parametrize("coefficient_type", ["median", "full"])
+def test__calc_params_object(coefficient_type):
+    # The parameter object replaces the scenario in the downstream calculations
+    scenario = {"magnitude": 7, "location": 0.3, "style": "reverse"}
+    params = _calc_params(**scenario, coefficient_type=coefficient_type, as_object=True)
+    model_id, bc_param, mean, stdv_total, stdv_within, stdv_between = _calc_params(
+        **scenario, coefficient_type=coefficient_type
+    )
+    assert params.mean_site.shape == (1, len(model_id))
+    np.testing.assert_array_equal(params.mean_site[0], mean)
+    np.testing.assert_array_equal(params.stdv_between_site[0], stdv_between)
+
+    kwargs = {"coefficient_type": coefficient_type, "percentile": [0.5, 0.84]}
+    np.testing.assert_array_equal(
+        calc_displ_site(params=params, **kwargs), calc_displ_site(**scenario, **kwargs)
+    )
+    kwargs = {
+        "coefficient_type": coefficient_type,
+        "displacement_array": [0.1, 1],
+        "folded": False,
+    }
+    expected = calc_prob_exceed(**scenario, **kwargs)
+    computed = calc_prob_exceed(params=params, **kwargs)
+    np.testing.assert_array_equal(np.asarray(computed), np.asarray(expected))
+
+    with pytest.raises(ValueError):
+        calc_displ_site(params=params, coefficient_type="mean", percentile=0.5)
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test__calc_params_object_multiple_locations():
+    location, displacement = np.array([0.1, 0.4, 0.6]), np.array([1, 0.5, 2])
+    params = _calc_params(
+        magnitude=7, location=location, style="normal", override=True, as_object=True
+    )
+
+    np.testing.assert_array_equal(
+        calc_prob_occur(params=params, displacement_array=displacement),
+        calc_prob_occur(
+            magnitude=7, location_array=location, style="normal", displacement_array=displacement
+        ),
+    )
+    np.testing.assert_array_equal(
+        calc_displ_site(params=params, percentile=0.84),
+        calc_displ_site(
+            magnitude=7, location=location, style="normal", percentile=0.84, override=True
+        ),
+    )
@@ -60,3 +60,63 @@ def test_calc_prob_exceed_mean_model(load_expected):
         rtol=RTOL,
         err_msg=f"For the unfolded case, Expected: {expected_site}, Computed: {computed_site}",
     )
+
+
+def test_calc_prob_exceed_parametric():
+    """The parametric epistemic fractiles should approximate the full model fractiles."""
+
+    # Inputs
+    params = {
+        "magnitude": 7,
+        "location": 0.2,
+        "style": "normal",
+        "displacement_array": [0.1, 1, 3],
+    }
+    fractiles = [0.16, 0.5, 0.84]
+
+    # Computed
+    computed = calc_prob_exceed(
+        **params, coefficient_type="parametric", epistemic_fractiles=fractiles
+    )
+    full = calc_prob_exceed(**params, coefficient_type="full")
+
+    computed = computed["probex_folded"].to_numpy(dtype=float).reshape(len(fractiles), -1)
+    full = full["probex_folded"].to_numpy(dtype=float).reshape(1000, -1)
+
+    # Checks
+    np.testing.assert_allclose(
+        np.quantile(full, fractiles, axis=0),
+        computed,
+        rtol=5e-2,
+        err_msg=f"Full: {np.quantile(full, fractiles, axis=0)}, Parametric: {computed}",
+    )
+
+
+def test_calc_prob_exceed_analytic():
+    """The delta-method epistemic fractiles should approximate the full model fractiles."""
+
+    # Inputs
+    params = {
+        "magnitude": 7.2,
+        "location": 0.4,
+        "style": "reverse",
+        "displacement_array": [0.1, 1, 3],
+    }
+    fractiles = [0.16, 0.5, 0.84]
+
+    # Computed
+    computed = calc_prob_exceed(
+        **params, coefficient_type="analytic", epistemic_fractiles=fractiles
+    )
+    full = calc_prob_exceed(**params, coefficient_type="full")
+
+    computed = computed["probex_folded"].to_numpy(dtype=float).reshape(len(fractiles), -1)
+    full = full["probex_folded"].to_numpy(dtype=float).reshape(1000, -1)
+
+    # Checks
+    np.testing.assert_allclose(
+        np.quantile(full, fractiles, axis=0),
+        computed,
+        rtol=5e-2,
+        err_msg=f"Full: {np.quantile(full, fractiles, axis=0)}, Analytic: {computed}",
+    )
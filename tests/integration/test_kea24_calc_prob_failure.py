@@ -0,0 +1,66 @@
+""" """
+
+import pytest
+import numpy as np
+from scipy import stats
+
+
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+from kuehn_et_al_fdm.calc_prob_failure import calc_prob_failure
+
+
+SCENARIOS = [(7, 0.3, 1, 0.5), (6.5, 0.1, 0.2, 0.3), (7.5, 0.5, 5, 0.6)]
+
+
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+@pytest.mark.parametrize("magnitude, location, median_capacity, beta", SCENARIOS)
+def test_calc_prob_failure_vs_hazard_curve(style, magnitude, location, median_capacity, beta):
+    # Quadrature agrees with integrating the fragility density against a dense hazard curve
+    displ = np.logspace(-4, 2.5, 20000)
+    probex = calc_prob_exceed(
+        magnitude=magnitude, location=location, style=style, displacement_array=displ
+    )
+    density = stats.norm.pdf(np.log(displ / median_capacity) / beta) / (beta * displ)
+    expected = np.trapz(density * probex, displ)
+
+    computed = calc_prob_failure(
+        magnitude=magnitude,
+        location=location,
+        style=style,
+        median_capacity=median_capacity,
+        beta=beta,
+    )
+    assert computed == pytest.approx(expected, abs=1e-3)
+
+
+def test_calc_prob_failure_broadcasting():
+    # Scenarios and fragility parameters broadcast, and rates scale the result
+    params = {"magnitude": [6.5, 7, 7.5], "location": 0.3, "style": "normal", "beta": 0.4}
+    computed = calc_prob_failure(**params, median_capacity=[[0.5], [1]])
+    rate = calc_prob_failure(**params, median_capacity=[[0.5], [1]], rate=1e-3)
+
+    assert computed.shape == (2, 3)
+    assert np.all(np.diff(computed, axis=0) < 0)
+    np.testing.assert_allclose(rate, 1e-3 * computed)
+
+
+def test_calc_prob_failure_full():
+    computed = calc_prob_failure(
+        magnitude=[7, 7.5],
+        location=0.3,
+        style="reverse",
+        median_capacity=1,
+        beta=0.5,
+        coefficient_type="full",
+    )
+    assert len(computed) == 2000
+    expected = calc_prob_failure(
+        magnitude=7, location=0.3, style="reverse", median_capacity=1, beta=0.5
+    )
+    mean = np.average(computed["prob_failure"][:1000], weights=computed["weight"][:1000])
+    assert mean == pytest.approx(expected, abs=0.05)
+
+
+def test_calc_prob_failure_invalid_beta():
+    with pytest.raises(ValueError):
+        calc_prob_failure(magnitude=7, location=0.3, style="normal", median_capacity=1, beta=0)
@@ -0,0 +1,102 @@
+""" """
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import kuehn_et_al_fdm as kea
+from kuehn_et_al_fdm.load_data import _get_coefficients
+from kuehn_et_al_fdm.model import FaultDisplacementModel, _get_model
+
+STYLES = ["strike-slip", "reverse", "normal"]
+
+
+@pytest.mark.parametrize("style", STYLES)
+def test_model_methods(style):
+    # Methods match the module-level functions
+    model = FaultDisplacementModel(style, "mean")
+    scenario = {"magnitude": 7, "location": 0.3}
+    params = {"style": style, "coefficient_type": "mean"}
+
+    for computed, expected in zip(
+        model.params(**scenario), kea._calc_params(**scenario, **params)
+    ):
+        np.testing.assert_array_equal(computed, expected)
+
+    np.testing.assert_allclose(
+        model.displ_site(**scenario, percentile=0.84),
+        kea.calc_displ_site(**scenario, **params, percentile=0.84),
+        rtol=1e-12,
+    )
+    np.testing.assert_allclose(
+        model.prob_exceed(**scenario, displacement_array=[0.1, 1, 3]),
+        kea.calc_prob_exceed(**scenario, **params, displacement_array=[0.1, 1, 3]),
+        rtol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("style", STYLES)
+def test_model_full_coefficients(style):
+    # Results for each model are the results of the function with the full coefficients
+    model = FaultDisplacementModel(style, "full")
+    scenario = {"magnitude": 7, "style": style, "coefficient_type": "full"}
+
+    expected = kea.calc_prob_exceed(**scenario, location=0.3, displacement_array=[0.1, 1])
+    computed = model.prob_exceed(7, 0.3, [0.1, 1])
+    assert computed.shape == (model.n_models, 2)
+    np.testing.assert_allclose(computed.ravel(), expected["probex_folded"].astype(float))
+
+    locations, profile = model.displ_profile(7, 0.5, location_step=0.1)
+    assert profile.shape == (locations.size, model.n_models)
+    np.testing.assert_allclose(
+        profile[3], kea.calc_displ_site(**scenario, location=locations[3], percentile=0.5)
+    )
+    np.testing.assert_allclose(model.weights.sum(), 1)
+
+
+@pytest.mark.parametrize("coefficient_type", ["median", "full"])
+def test_model_scenario_arrays(coefficient_type):
+    # Arrays (and lists) of scenarios have scenario, model, and displacement axes
+    model = FaultDisplacementModel("normal", coefficient_type)
+    computed = model.prob_exceed([7, 7.5], [0.3, 0.4], [0.1, 1, 3])
+    assert computed.shape == (2, model.n_models, 3)
+    np.testing.assert_allclose(
+        computed[1], np.reshape(model.prob_exceed(7.5, 0.4, [0.1, 1, 3]), (model.n_models, 3))
+    )
+
+    displ = model.displ_site([7, 7.5], [0.3, 0.4], 0.5)
+    np.testing.assert_allclose(displ[0], model.displ_site(7, 0.3, 0.5).squeeze())
+
+
+def test_model_custom_coefficients():
+    # A custom set of coefficients (e.g., a DataFrame) gives the same results
+    coefficients = _get_coefficients("reverse", "median")
+    model = FaultDisplacementModel("reverse", coefficients=pd.DataFrame(coefficients))
+    median_model = FaultDisplacementModel("reverse")
+    assert model.coefficient_type == "custom" and model.n_models == 1
+
+    np.testing.assert_allclose(model.displ_avg(7), median_model.displ_avg(7))
+    np.testing.assert_allclose(
+        model.prob_occur(7, [0.1, 0.5], [1, 2]),
+        kea.calc_prob_occur(
+            magnitude=7, location_array=[0.1, 0.5], displacement_array=[1, 2], style="reverse"
+        ),
+    )
+
+    with pytest.raises(KeyError):
+        FaultDisplacementModel("normal", coefficients=pd.DataFrame(coefficients))
+    with pytest.raises(ValueError):
+        FaultDisplacementModel("oblique")
+
+
+def test_model_reduced_coefficients(monkeypatch):
+    # The reduced model is shared until the reduced set of coefficients is replaced
+    model = _get_model("normal", "reduced")
+    assert _get_model("normal", "reduced") is model
+
+    reduced, _ = kea.reduce_posterior(style="normal", n_models=3)
+    monkeypatch.setitem(kea.load_data.DATA["reduced"], "normal", reduced)
+    assert _get_model("normal", "reduced").n_models == 3
+    np.testing.assert_array_equal(
+        _get_coefficients("normal", "reduced")["model_id"], reduced["model_id"]
+    )
@@ -0,0 +1,70 @@
+""" """
+
+import pytest
+import numpy as np
+
+
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+from kuehn_et_al_fdm.calc_displ_site import calc_displ_site
+from kuehn_et_al_fdm.load_data import DATA
+from kuehn_et_al_fdm.reduce_posterior import _calc_reference_hazard, reduce_posterior
+
+
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+def test_reduce_posterior(style):
+    coefficients, report = reduce_posterior(style=style, n_models=20)
+
+    assert 1 <= len(coefficients) <= 20
+    assert np.all(coefficients["weight"] > 0)
+    np.testing.assert_allclose(coefficients["weight"].sum(), 1)
+
+    # The mean reference hazard is matched closely
+    assert report.loc["mean", "max_abs_error"] < 0.01
+
+
+def test_reduce_posterior_reproducible():
+    first, _ = reduce_posterior(style="normal", n_models=10, seed=3)
+    second, _ = reduce_posterior(style="normal", n_models=10, seed=3)
+    np.testing.assert_array_equal(first.to_numpy(), second.to_numpy())
+
+
+def test_reference_hazard_repeatable():
+    # Bit-for-bit identical for the same coefficients, whatever the memory layout
+    coefficients = DATA["full"]["normal"].to_records(index=False)
+    expected = _calc_reference_hazard(coefficients, "normal")
+    buffers = []
+    for size in range(1, 200, 9):
+        buffers.append(np.empty(size))
+        np.testing.assert_array_equal(_calc_reference_hazard(coefficients, "normal"), expected)
+
+
+def test_reduce_posterior_invalid_n_models():
+    with pytest.raises(ValueError):
+        reduce_posterior(style="normal", n_models=0)
+
+
+def test_prob_exceed_reduced_weighted_mean():
+    # The weighted mean hazard of the reduced set is close to the mean hazard of the full set
+    params = {"magnitude": 7, "location": 0.3, "style": "reverse", "displacement_array": [0.1, 1]}
+    full = calc_prob_exceed(**params, coefficient_type="full")
+    reduced = calc_prob_exceed(**params, coefficient_type="reduced")
+
+    assert np.all(reduced["weight"] > 0)
+    for displ in [0.1, 1]:
+        rows = full[full["displ_meters"] == displ]
+        expected = np.average(rows["probex_folded"].astype(float), weights=rows["weight"])
+        rows = reduced[reduced["displ_meters"] == displ]
+        computed = np.average(rows["probex_folded"].astype(float), weights=rows["weight"])
+        assert computed == pytest.approx(expected, abs=0.02)
+
+
+def test_displ_site_reduced_shape():
+    computed = calc_displ_site(
+        magnitude=7,
+        location=0.3,
+        style="normal",
+        percentile=[0.5, 0.84],
+        coefficient_type="reduced",
+    )
+    assert computed.shape[:2] == (1, 2)
+    assert np.all(np.diff(computed, axis=1) > 0)
@@ -0,0 +1,169 @@
+""" """
+
+import http.client
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from kuehn_et_al_fdm import serve
+from kuehn_et_al_fdm.calc_displ_site import calc_displ_site
+from kuehn_et_al_fdm.calc_prob_exceed import calc_prob_exceed
+from kuehn_et_al_fdm.serve import create_http_server, evaluate_requests, serve_stdio
+
+SCENARIOS = [(7, 0.3), (7.2, 0.4), (6.8, 0.1), (7.5, 0.9)]
+
+
+def _make_requests():
+    requests = []
+    for i, (magnitude, location) in enumerate(SCENARIOS):
+        arguments = {"magnitude": magnitude, "location": location, "style": "normal"}
+        requests.append(
+            {
+                "id": i,
+                "calculation": "calc_displ_site",
+                "arguments": {**arguments, "percentile": 0.84},
+            }
+        )
+    for i, (magnitude, location) in enumerate(SCENARIOS):
+        arguments = {"magnitude": magnitude, "location": location, "style": "normal"}
+        requests.append(
+            {
+                "id": 10 + i,
+                "calculation": "calc_prob_exceed",
+                "arguments": {**arguments, "displacement_array": [0.1, 1, 3]},
+            }
+        )
+    return requests
+
+
+def test_evaluate_requests_batching():
+    # Batched results match the direct calculations, in order
+    requests = _make_requests()
+    responses, n_evaluations = evaluate_requests(requests)
+
+    assert [r["id"] for r in responses] == [r["id"] for r in requests]
+    assert n_evaluations == 2
+    for request, response in zip(requests, responses):
+        func = calc_displ_site if request["calculation"] == "calc_displ_site" else calc_prob_exceed
+        np.testing.assert_allclose(response["result"], func(**request["arguments"]), rtol=1e-12)
+
+
+def test_evaluate_requests_errors():
+    # Invalid requests are reported without affecting the rest of the batch
+    requests = _make_requests()[:3]
+    requests[1]["arguments"]["location"] = 1.5
+    invalid = [
+        {"id": 5, "calculation": "calc_nothing"},
+        {"id": 6, "calculation": ["calc_displ_site"], "arguments": {}},
+    ]
+    responses, _ = evaluate_requests(requests + invalid)
+
+    assert "result" in responses[0] and "result" in responses[2]
+    assert responses[1]["error"].startswith("ValueError")
+    assert responses[3]["id"] == 5 and "calc_nothing" in responses[3]["error"]
+    assert responses[4]["id"] == 6 and responses[4]["error"].startswith("ValueError")
+
+
+def test_serve_stdio():
+    requests = _make_requests()
+    invalid = {"id": 99, "calculation": ["calc_displ_site"], "arguments": {}}
+    lines = [json.dumps(invalid)] + [json.dumps(r) for r in requests] + ["not json"]
+    output = io.StringIO()
+    summary = serve_stdio(
+        input_stream=io.StringIO("\n".join(lines) + "\n"), output_stream=output, batch_window=0.5
+    )
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert summary["requests"] == len(lines) == len(responses)
+    assert summary["evaluations"] < summary["requests"]
+    assert [r["id"] for r in responses] == [99] + [r["id"] for r in requests] + [None]
+    assert responses[0]["error"].startswith("ValueError")
+    assert responses[-1]["error"].startswith("ValueError: Invalid JSON")
+    expected = calc_displ_site(**requests[0]["arguments"])
+    np.testing.assert_allclose(responses[1]["result"], expected, rtol=1e-12)
+
+
+def _post(port, request):
+    """Stand-in client: post a request to the local service and return the status and response."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.request("POST", "/evaluate", body=json.dumps(request))
+    response = connection.getresponse()
+    status, content = response.status, json.loads(response.read())
+    connection.close()
+    return status, content
+
+
+def test_http_service():
+    server = create_http_server(port=0, batch_window=0.2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_port
+
+    try:
+        # Concurrent requests are gathered into batches
+        requests = _make_requests()
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            results = list(executor.map(lambda r: _post(port, r), requests))
+
+        for request, (status, response) in zip(requests, results):
+            func = (
+                calc_displ_site
+                if request["calculation"] == "calc_displ_site"
+                else calc_prob_exceed
+            )
+            assert status == 200 and response["id"] == request["id"]
+            np.testing.assert_allclose(
+                response["result"], func(**request["arguments"]), rtol=1e-12
+            )
+
+        status, response = _post(port, {"id": 1, "calculation": "calc_nothing"})
+        assert status == 400 and "calc_nothing" in response["error"]
+
+        # Invalid requests and headers do not stop the service
+        status, response = _post(port, {"id": 2, "calculation": ["calc_nothing"]})
+        assert status == 400 and response["id"] == 2
+
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        connection.putrequest("POST", "/evaluate")
+        connection.putheader("Content-Length", "abc")
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == 400 and "Content-Length" in json.loads(response.read())["error"]
+        connection.close()
+
+        status, response = _post(port, requests[0])
+        assert status == 200 and server.service._worker.is_alive()
+
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        connection.request("GET", "/stats")
+        stats = json.loads(connection.getresponse().read())
+        connection.close()
+
+        assert stats["requests"] == len(requests) + 3
+        assert stats["evaluations"] < stats["requests"]
+        assert sum(stats["latency_s"]["counts"]) == stats["requests"]
+        assert sum(stats["batch_size"]["counts"]) == stats["batches"]
+
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.service.stop()
+
+
+def test_batching_service_errors(monkeypatch):
+    # An error while evaluating a batch is returned for each request; the worker keeps running
+    service = serve.BatchingService(batch_window=0.01)
+    service.start()
+    try:
+        with monkeypatch.context() as m:
+            m.setattr(serve, "evaluate_requests", lambda requests: 1 / 0)
+            response = service.submit({"id": 1, "calculation": "calc_displ_site"})
+        assert response == {"id": 1, "error": "ZeroDivisionError: division by zero"}
+
+        response = service.submit(_make_requests()[0])
+        assert "result" in response and service._worker.is_alive()
+    finally:
+        service.stop()
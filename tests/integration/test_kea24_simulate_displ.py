@@ -0,0 +1,59 @@
+""" """
+
+import pytest
+import numpy as np
+
+
+from kuehn_et_al_fdm.calc_params import _calc_params
+from kuehn_et_al_fdm.simulate_displ import simulate_displ
+
+
+LOCATIONS = [0.2, 0.5]
+
+
+def test_simulate_displ_substreams():
+    # Chunks of ruptures reproduce the realizations of a single run
+    params = {"location_array": LOCATIONS, "style": "strike-slip", "n_realizations": 10}
+    magnitudes = [6.5, 7, 7.5, 8]
+    computed = simulate_displ(**params, magnitude=magnitudes, seed=5)
+    first = simulate_displ(**params, magnitude=magnitudes[:1], seed=5, rupture_id=[0])
+    rest = simulate_displ(**params, magnitude=magnitudes[1:], seed=5, rupture_id=[1, 2, 3])
+
+    np.testing.assert_array_equal(computed, np.concatenate([first, rest]))
+    assert not np.array_equal(computed, simulate_displ(**params, magnitude=magnitudes, seed=6))
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+def test_simulate_displ_moments(style):
+    # Transformed realizations follow the between/within-event variance split
+    magnitude, n = 7.5, 40000
+    computed = simulate_displ(
+        magnitude=magnitude, location_array=LOCATIONS, style=style, n_realizations=n, seed=1
+    )
+    assert computed.shape == (1, n, 1, 2)
+
+    _, lam, mu, sd_total, _, sd_mode = _calc_params(
+        magnitude=magnitude, location=np.array(LOCATIONS), style=style, override=True
+    )
+    Y = (np.power(computed[0, :, 0], lam) - 1) / lam
+    np.testing.assert_allclose(Y.mean(axis=0), mu, atol=0.03)
+    np.testing.assert_allclose(Y.std(axis=0), sd_total, rtol=0.03)
+
+    # Only the between-event term is shared along strike
+    covariance = np.cov(Y, rowvar=False)[0, 1]
+    assert covariance == pytest.approx(np.prod(np.broadcast_to(sd_mode, (2,))), abs=0.03)
+
+
+def test_simulate_displ_full_shape():
+    computed = simulate_displ(
+        magnitude=[7, 7.2], location_array=LOCATIONS, style="reverse", coefficient_type="full"
+    )
+    assert computed.shape == (2, 1, 1000, 2)
+
+
+def test_simulate_displ_invalid_rupture_id():
+    with pytest.raises(ValueError):
+        simulate_displ(
+            magnitude=[7, 7.2], location_array=LOCATIONS, style="normal", rupture_id=[1]
+        )
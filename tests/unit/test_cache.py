@@ -0,0 +1,185 @@
+""" """
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import kuehn_et_al_fdm as kea
+from kuehn_et_al_fdm import cache as cache_module
+from kuehn_et_al_fdm.cache import (
+    cache_info,
+    disable_cache,
+    disable_disk_cache,
+    enable_cache,
+    enable_disk_cache,
+)
+
+
+@pytest.fixture
+def cache():
+    yield enable_cache()
+    disable_cache()
+
+
+def test_cache_hits(cache):
+    params = {"magnitude": 7, "location": 0.3, "style": "normal"}
+    displ = np.array([0.1, 1, 3])
+    expected = kea.calc_prob_exceed(**params, displacement_array=displ)
+
+    # Equivalent inputs (case, defaults, array contents) hit the cache
+    computed = kea.calc_prob_exceed(
+        **params, displacement_array=displ.copy(), coefficient_type="MEDIAN", folded=True
+    )
+    np.testing.assert_array_equal(computed, expected)
+    kea.calc_prob_exceed(**params, displacement_array=[0.1, 1, 3])
+    assert cache_info()["hits"] == 2 and cache_info()["misses"] == 1
+
+    # Different array contents miss the cache
+    kea.calc_prob_exceed(**params, displacement_array=[0.1, 1, 4])
+    assert cache_info()["misses"] == 2
+
+    # Cached results cannot be modified by the caller
+    computed[:] = 0
+    np.testing.assert_array_equal(
+        kea.calc_prob_exceed(**params, displacement_array=displ), expected
+    )
+    kea.calc_displ_site(**params, percentile=0.5)
+    kea.calc_displ_site(**params, percentile=0.5)
+    assert cache_info()["hit_rate"] == pytest.approx(4 / 7)
+
+
+def test_cache_reduced_coefficients(cache, monkeypatch):
+    # Replacing the reduced set of coefficients invalidates the cached results
+    params = {"magnitude": 7, "location": 0.3, "style": "normal", "coefficient_type": "reduced"}
+    default = kea.calc_prob_exceed(**params, displacement_array=[0.1, 1])
+
+    reduced, _ = kea.reduce_posterior(style="normal", n_models=3)
+    monkeypatch.setitem(kea.load_data.DATA["reduced"], "normal", reduced)
+    computed = kea.calc_prob_exceed(**params, displacement_array=[0.1, 1])
+    assert computed.shape != default.shape and cache_info()["misses"] == 2
+
+    disable_cache()
+    np.testing.assert_array_equal(
+        computed, kea.calc_prob_exceed(**params, displacement_array=[0.1, 1])
+    )
+
+
+def test_cache_hits_warn(cache):
+    # Cache hits warn about the magnitude range like the calculation
+    params = {"magnitude": 5, "location": 0.3, "style": "normal", "percentile": 0.5}
+    for _ in range(2):
+        with pytest.warns(UserWarning, match="recommended range"):
+            kea.calc_displ_site(**params)
+    assert cache_info()["hits"] == 1
+
+
+def test_cache_eviction():
+    # Each result is a 100-element float array (800 bytes)
+    cache = enable_cache(max_bytes=2000)
+    try:
+        params = {
+            "location": 0.3,
+            "style": "normal",
+            "displacement_array": np.logspace(-2, 1, 100),
+        }
+        for magnitude in [6, 7, 6, 8]:
+            kea.calc_prob_exceed(magnitude=magnitude, **params)
+
+        info = cache.info()
+        assert info["entries"] == 2 and info["evictions"] == 1 and info["nbytes"] <= 2000
+
+        # Magnitude 7 was the least recently used result
+        kea.calc_prob_exceed(magnitude=6, **params)
+        kea.calc_prob_exceed(magnitude=7, **params)
+        assert cache.info()["hits"] == 2 and cache.info()["misses"] == 4
+    finally:
+        disable_cache()
+
+    assert cache_info() is None
+
+
+def test_disk_cache(tmp_path, monkeypatch):
+    params = {"magnitude": 7, "location": 0.3, "style": "normal", "displacement_array": [0.1, 1]}
+    cache = enable_disk_cache(tmp_path)
+    try:
+        expected = kea.calc_prob_exceed(**params)
+        assert len(list(tmp_path.glob("*.npy"))) == 1
+
+        # A new cache (e.g., in another run) reads the stored result
+        cache = enable_disk_cache(tmp_path)
+        np.testing.assert_array_equal(kea.calc_prob_exceed(**params), expected)
+        assert cache.info()["hits"] == 1
+
+        # Results are invalidated when the model changes
+        monkeypatch.setattr(cache_module, "_get_model_checksum", lambda: "changed")
+        cache = enable_disk_cache(tmp_path)
+        kea.calc_prob_exceed(**params)
+        assert cache.info()["misses"] == 1 and cache.info()["entries"] == 2
+    finally:
+        disable_disk_cache()
+
+
+def test_disk_cache_reduced_coefficients(tmp_path, monkeypatch):
+    params = {
+        "magnitude": 7,
+        "location": 0.3,
+        "style": "normal",
+        "coefficient_type": "reduced",
+        "percentile": 0.5,
+    }
+    cache = enable_disk_cache(tmp_path)
+    try:
+        kea.calc_displ_site(**params)
+
+        # A new cache with a different reduced set does not read the stored result
+        reduced, _ = kea.reduce_posterior(style="normal", n_models=3)
+        monkeypatch.setitem(kea.load_data.DATA["reduced"], "normal", reduced)
+        cache = enable_disk_cache(tmp_path)
+        computed = kea.calc_displ_site(**params)
+        assert cache.info()["hits"] == 0 and cache.info()["entries"] == 2
+    finally:
+        disable_disk_cache()
+
+    assert computed.shape == (3,)
+    np.testing.assert_array_equal(computed, kea.calc_displ_site(**params))
+
+
+def test_disk_cache_scans(tmp_path, monkeypatch):
+    # The directory is scanned on the first write and when the size bound is exceeded
+    scans = []
+    evict = cache_module.DiskCache._evict
+    monkeypatch.setattr(
+        cache_module.DiskCache, "_evict", lambda self: scans.append(1) or evict(self)
+    )
+    cache = cache_module.DiskCache(tmp_path, max_bytes=10000)
+    for i in range(8):
+        cache.put(("key", i), np.zeros(100))
+    assert len(scans) == 1 and cache.info()["entries"] == 8
+
+    # Each file is 928 bytes; files are evicted below the size bound, so the write after each
+    # eviction does not scan
+    for i in range(8, 16):
+        cache.put(("key", i), np.zeros(100))
+    info = cache.info()
+    assert len(scans) == 4 and info["nbytes"] <= 10000 and info["evictions"] == 6
+
+
+def test_disk_cache_concurrent_writers(tmp_path):
+    # Each result is about 1 kB; the size bound keeps only some of them
+    cache = enable_disk_cache(tmp_path, max_bytes=5000)
+    params = {"location": 0.3, "style": "normal", "displacement_array": np.logspace(-2, 1, 100)}
+    magnitudes = np.repeat(np.linspace(6, 8, 10), 4)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            computed = list(
+                executor.map(lambda m: kea.calc_prob_exceed(magnitude=m, **params), magnitudes)
+            )
+    finally:
+        disable_disk_cache()
+
+    for magnitude, result in zip(magnitudes, computed):
+        np.testing.assert_array_equal(result, kea.calc_prob_exceed(magnitude=magnitude, **params))
+    info = cache.info()
+    assert 0 < info["nbytes"] <= 5000 and info["evictions"] > 0
+    assert not list(tmp_path.glob("*.tmp"))
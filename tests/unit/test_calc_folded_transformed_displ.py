@@ -0,0 +1,49 @@
+""" """
+
+import numpy as np
+from scipy import stats
+
+
+from kuehn_et_al_fdm.transformation_functions import (
+    _calc_analytic_mean,
+    _calc_folded_transformed_displ,
+)
+
+
+def test__calc_folded_transformed_displ_mixture_cdf():
+    # The solution should satisfy the 50/50 mixture CDF for every element
+    rng = np.random.default_rng(1)
+    mean_site, mean_complement = rng.normal(0, 1, (2, 50, 1))
+    stdv_site, stdv_complement = rng.uniform(0.5, 1.5, (2, 50, 1))
+    quantile = np.array([0.01, 0.16, 0.5, 0.84, 0.99])
+
+    computed = _calc_folded_transformed_displ(
+        0.2, mean_site, stdv_site, mean_complement, stdv_complement, quantile
+    )
+    mixture_cdf = 0.5 * (
+        stats.norm.cdf(computed, mean_site, stdv_site)
+        + stats.norm.cdf(computed, mean_complement, stdv_complement)
+    )
+
+    assert computed.shape == (50, 5)
+    np.testing.assert_allclose(mixture_cdf, np.broadcast_to(quantile, (50, 5)), atol=1e-8)
+
+
+def test__calc_folded_transformed_displ_identical_components():
+    # Identical components reduce to the closed-form quantile
+    computed = _calc_folded_transformed_displ(0.2, 1.0, 0.8, 1.0, 0.8, 0.84)
+    np.testing.assert_allclose(computed, stats.norm.ppf(0.84, 1.0, 0.8))
+
+
+def test__calc_folded_transformed_displ_mean():
+    # Mean is the average of the back-transformed means
+    lam = 0.2
+    computed = _calc_folded_transformed_displ(lam, [1.0, 0.5], 0.8, 2.0, 0.9, [-1, 0.5])
+    expected_meters = 0.5 * (
+        _calc_analytic_mean(lam, 1.0, 0.8) + _calc_analytic_mean(lam, 2.0, 0.9)
+    )
+    np.testing.assert_allclose(computed[0], (expected_meters**lam - 1) / lam)
+    mixture_cdf = 0.5 * (
+        stats.norm.cdf(computed[1], 0.5, 0.8) + stats.norm.cdf(computed[1], 2.0, 0.9)
+    )
+    np.testing.assert_allclose(mixture_cdf, 0.5, atol=1e-8)
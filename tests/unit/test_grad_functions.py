@@ -0,0 +1,74 @@
+""" """
+
+import pytest
+import numpy as np
+
+
+from kuehn_et_al_fdm.load_data import DATA
+from kuehn_et_al_fdm.prediction_functions import (
+    _func_nm,
+    _func_rv,
+    _func_ss,
+    _grad_func_nm,
+    _grad_func_rv,
+    _grad_func_ss,
+)
+from kuehn_et_al_fdm.uncertainty_functions import _calc_delta_method_stdv, _calc_epistemic_stdv
+
+# Test setup
+RTOL = 1e-4
+STEP = 1e-6
+FUNCTIONS = {
+    "strike-slip": (_func_ss, _grad_func_ss),
+    "reverse": (_func_rv, _grad_func_rv),
+    "normal": (_func_nm, _grad_func_nm),
+}
+
+
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+def test_grad_functions_finite_difference(style):
+    # Analytic gradients should match central finite differences
+    func, grad_func = FUNCTIONS[style]
+    coeffs = DATA["point"][style]
+    coeffs = coeffs[coeffs["model_id"] == "mean"].to_records(index=False)
+
+    magnitudes = np.array([6.2, 6.9, 7.4, 7.9])[:, np.newaxis]
+    locations = np.array([0.0, 0.1, 0.45, 0.8, 1.0])
+
+    grad_mu, grad_sd = grad_func(coeffs, magnitudes, locations)
+    assert set(grad_mu) | set(grad_sd) <= set(DATA["covariance"][style].columns)
+
+    for name in DATA["covariance"][style].columns:
+        upper, lower = coeffs.copy(), coeffs.copy()
+        upper[name] += STEP
+        lower[name] -= STEP
+        _, _, mu_upper, sd_upper, _, _ = func(upper, magnitudes, locations)
+        _, _, mu_lower, sd_lower, _, _ = func(lower, magnitudes, locations)
+
+        expected_mu = (mu_upper - mu_lower) / (2 * STEP)
+        expected_sd = (sd_upper - sd_lower) / (2 * STEP)
+        computed_mu = np.broadcast_to(grad_mu.get(name, 0.0), expected_mu.shape)
+        computed_sd = np.broadcast_to(grad_sd.get(name, 0.0), expected_sd.shape)
+
+        np.testing.assert_allclose(
+            expected_mu, computed_mu, rtol=RTOL, atol=1e-6, err_msg=f"mu, {name}"
+        )
+        np.testing.assert_allclose(
+            expected_sd, computed_sd, rtol=RTOL, atol=1e-6, err_msg=f"sd_total, {name}"
+        )
+
+
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+def test__calc_delta_method_stdv(style):
+    # The delta method should reproduce the tabulated epistemic uncertainties (first order; the
+    # bilinear strike-slip sigma model is strongly nonlinear below the magnitude break)
+    magnitudes = np.array([7.0, 7.5, 8.0])[:, np.newaxis]
+    locations = np.array([0.05, 0.3, 0.5, 0.9])
+
+    sd_med, sd_sigma, correlation = _calc_delta_method_stdv(magnitudes, locations, style)
+    expected_med, expected_sigma = _calc_epistemic_stdv(magnitudes, locations, style)
+
+    assert sd_med.shape == sd_sigma.shape == correlation.shape == (3, 4)
+    assert np.all(np.abs(correlation) <= 1)
+    np.testing.assert_allclose(expected_med, sd_med, rtol=5e-2)
+    np.testing.assert_allclose(expected_sigma, sd_sigma, rtol=0.1)
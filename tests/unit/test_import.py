@@ -0,0 +1,30 @@
+""" """
+
+import subprocess
+import sys
+
+# Modules that should only be imported on first use
+HEAVY_MODULES = ["pandas", "scipy.stats", "scipy.interpolate", "scipy.optimize", "scipy.spatial"]
+
+
+def _imported_heavy_modules(code):
+    script = f"import sys\n{code}\nprint(sorted(m for m in {HEAVY_MODULES} if m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout
+    return output.strip().splitlines()[-1]
+
+
+def test_import_is_light():
+    assert _imported_heavy_modules("import kuehn_et_al_fdm") == "[]"
+
+
+def test_point_estimate_calculations_do_not_import_pandas():
+    code = (
+        "import kuehn_et_al_fdm as kea\n"
+        "kea.calc_displ_site(magnitude=7, location=0.3, style='normal', percentile=0.5)\n"
+        "kea.calc_prob_exceed(magnitude=7, location=0.3, style='normal', displacement_array=[1])\n"
+        "kea.calc_hazard(magnitude=7, location_array=0.3, style='normal', rate=1e-3, "
+        "displacement_array=[1])"
+    )
+    assert _imported_heavy_modules(code) == "[]"
@@ -0,0 +1,89 @@
+""" """
+
+import warnings
+
+import numpy as np
+import pytest
+
+from kuehn_et_al_fdm import kernels
+from kuehn_et_al_fdm.calc_hazard import _calc_scenario_prob_exceed
+from kuehn_et_al_fdm.model import FaultDisplacementModel
+
+STYLES = ["strike-slip", "reverse", "normal"]
+
+
+@pytest.fixture(autouse=True)
+def reset_backend(monkeypatch):
+    monkeypatch.delenv(kernels.BACKEND_ENV_VAR, raising=False)
+    yield
+    kernels._BACKEND = None
+
+
+def _evaluate(style, coefficient_type):
+    """Evaluate the hot paths for a set of scenarios."""
+    rng = np.random.default_rng(42)
+    magnitude, location = rng.uniform(5.5, 8, 50), rng.uniform(0, 1, 50)
+    location[:3] = [0, 0.5, 1]
+    displacement = np.logspace(-3, 1.5, 20)
+    model = FaultDisplacementModel(style, coefficient_type)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return [
+            _calc_scenario_prob_exceed(
+                magnitude, location, style, displacement, coefficient_type, True
+            ),
+            _calc_scenario_prob_exceed(
+                magnitude, location, style, displacement, coefficient_type, False
+            ),
+            model.prob_exceed(7, 0.3, displacement),
+            model.displ_site(magnitude, location, 0.84),
+            model.displ_site(magnitude, location, -1, folded=False),
+            model.displ_site(7, 0.3, 0.5),
+        ]
+
+
+@pytest.mark.parametrize("coefficient_type", ["median", "full"])
+@pytest.mark.parametrize("style", STYLES)
+def test_compiled_matches_numpy(style, coefficient_type, monkeypatch):
+    pytest.importorskip("numba")
+    monkeypatch.setattr(kernels, "COMPILED_MIN_SIZE", 0)
+
+    kernels.set_backend("numpy")
+    expected = _evaluate(style, coefficient_type)
+    kernels.set_backend("numba")
+    computed = _evaluate(style, coefficient_type)
+    assert kernels._get_kernels() is not None
+
+    for c, e in zip(computed, expected):
+        assert c.shape == e.shape
+        np.testing.assert_allclose(c, e, rtol=1e-9, atol=1e-14)
+
+
+def test_compiled_min_size():
+    # Small calculations use NumPy even after the kernels are loaded
+    pytest.importorskip("numba")
+
+    kernels.set_backend("numba")
+    assert kernels._get_kernels() is not None
+    assert kernels._get_kernels(kernels.COMPILED_MIN_SIZE - 1) is None
+    assert kernels._get_kernels(kernels.COMPILED_MIN_SIZE) is not None
+
+
+def test_backend_selection(monkeypatch):
+    with pytest.raises(ValueError):
+        kernels.set_backend("cuda")
+
+    assert kernels.set_backend("NumPy") == kernels.get_backend() == "numpy"
+    assert kernels._get_kernels() is None
+
+    # Without Numba, the environment variable falls back to numpy with a warning
+    monkeypatch.setattr(kernels, "_numba_available", lambda: False)
+    monkeypatch.setenv(kernels.BACKEND_ENV_VAR, "numba")
+    with pytest.warns(UserWarning, match="Numba is not installed"):
+        assert kernels.set_backend() == "numpy"
+    with pytest.raises(ImportError):
+        kernels.set_backend("numba")
+
+    monkeypatch.delenv(kernels.BACKEND_ENV_VAR)
+    assert kernels.set_backend() == "numpy"
@@ -0,0 +1,37 @@
+""" """
+
+import importlib
+import json
+
+import numpy as np
+
+import kuehn_et_al_fdm as kea
+from kuehn_et_al_fdm import model, prediction_functions
+from kuehn_et_al_fdm.profiling import profile
+
+
+def test_profile_stages(tmp_path, monkeypatch):
+    # Prepare the shared models again so the coefficient selection is recorded
+    monkeypatch.setattr(model, "_MODELS", {})
+    filepath = tmp_path / "profile.json"
+    params = {"magnitude": 7, "location": 0.3, "style": "normal", "displacement_array": [0.1, 1]}
+
+    with profile(filepath) as profiler:
+        expected = kea.calc_prob_exceed(**params)
+
+    report = profiler.report()
+    for stage in ["calc_prob_exceed", "_calc_params", "coefficients", "mean", "stdv"]:
+        assert report[stage]["calls"] > 0
+
+    # One call each for the site and complementary locations
+    assert report["_calc_params"]["calls"] == 2
+    assert report["calc_prob_exceed"]["elements"] == 2
+    assert report["calc_prob_exceed"]["self_time_s"] <= report["calc_prob_exceed"]["wall_time_s"]
+    assert json.loads(filepath.read_text()) == report
+
+    # Results are unchanged and the original functions are restored
+    np.testing.assert_array_equal(kea.calc_prob_exceed(**params), expected)
+    assert not hasattr(prediction_functions._func_mu, "__wrapped__")
+    module = importlib.import_module("kuehn_et_al_fdm.calc_prob_exceed")
+    assert kea.calc_prob_exceed is module.calc_prob_exceed
+    assert not hasattr(module.calc_prob_exceed.__wrapped__, "__wrapped__")
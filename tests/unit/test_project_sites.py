@@ -0,0 +1,44 @@
+""" """
+
+import pytest
+import numpy as np
+
+
+from kuehn_et_al_fdm.geometry import project_sites
+
+
+TRACES = [[[0, 0], [10, 0], [10, 10]], [[0, 5], [0, -5]]]
+
+
+def test_project_sites_polylines():
+    sites = [[5, 1], [12, 3], [-3, 0]]
+    computed = project_sites(site_coordinates=sites, rupture_traces=TRACES)
+
+    assert len(computed) == 6
+    np.testing.assert_array_equal(computed["site"], [0, 0, 1, 1, 2, 2])
+    np.testing.assert_array_equal(computed["rupture"], [0, 1, 0, 1, 0, 1])
+    np.testing.assert_allclose(computed["location"], [0.25, 0.4, 0.65, 0.2, 0, 0.5])
+    np.testing.assert_allclose(computed["along_strike"], [5, 4, 13, 2, 0, 5])
+    np.testing.assert_allclose(computed["distance"], [1, 5, 2, 12, 3, 3])
+    np.testing.assert_allclose(computed["rupture_length"], [20, 10, 20, 10, 20, 10])
+
+
+def test_project_sites_cutoff():
+    # The spatial index returns the same pairs as the dense calculation within the cutoff
+    rng = np.random.default_rng(0)
+    sites = rng.uniform(0, 1e4, (500, 2))
+    traces = [
+        np.cumsum(rng.normal(0, 500, (5, 2)), axis=0) + rng.uniform(0, 1e4, 2) for _ in range(50)
+    ]
+
+    dense = project_sites(site_coordinates=sites, rupture_traces=traces)
+    computed = project_sites(site_coordinates=sites, rupture_traces=traces, cutoff_distance=300)
+    expected = dense[dense["distance"] <= 300].reset_index(drop=True)
+
+    assert 0 < len(computed) < len(dense)
+    np.testing.assert_allclose(computed.to_numpy(), expected.to_numpy())
+
+
+def test_project_sites_invalid_trace():
+    with pytest.raises(ValueError):
+        project_sites(site_coordinates=[[0, 0]], rupture_traces=[[[0, 0]]])
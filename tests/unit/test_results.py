@@ -0,0 +1,68 @@
+""" """
+
+import numpy as np
+import pytest
+
+import kuehn_et_al_fdm as kea
+from kuehn_et_al_fdm.results import CalculationResult
+
+SCENARIO = {"magnitude": 7, "location": 0.3, "style": "normal"}
+
+
+@pytest.mark.parametrize("coefficient_type", ["median", "full", "parametric"])
+def test_consistent_axes(coefficient_type):
+    # Same axes for all coefficient types, with the same values as the default results
+    kwargs = {**SCENARIO, "coefficient_type": coefficient_type}
+
+    result = kea.calc_prob_exceed(**kwargs, displacement_array=[0.1, 1, 3], as_result=True)
+    expected = kea.calc_prob_exceed(**kwargs, displacement_array=[0.1, 1, 3])
+    if hasattr(expected, "columns"):
+        expected = expected["probex_folded"].astype(float)
+    assert result.dims == ("scenario", "model", "displacement")
+    assert result.sizes["scenario"] == 1 and result.sizes["displacement"] == 3
+    np.testing.assert_allclose(result.to_numpy().ravel(), np.ravel(expected))
+
+    result = kea.calc_displ_site(**kwargs, percentile=[0.5, 0.84], as_result=True)
+    expected = kea.calc_displ_site(**kwargs, percentile=[0.5, 0.84])
+    assert result.dims == ("scenario", "percentile", "model")
+    assert result.shape[:2] == (1, 2)
+    np.testing.assert_allclose(result.to_numpy().ravel(), np.ravel(expected))
+
+
+def test_conversions():
+    result = kea.calc_prob_exceed(
+        **SCENARIO, displacement_array=[0.1, 1], coefficient_type="full", as_result=True
+    )
+    values = result.data["probex_folded"][1]
+
+    # No copies for NumPy arrays
+    assert np.shares_memory(result.to_numpy(), values)
+    assert np.shares_memory(np.asarray(result), values)
+    assert not np.shares_memory(result.copy().to_numpy(), values)
+
+    # Long-form DataFrame with the coordinates and the broadcast variables
+    df = result.to_frame()
+    assert len(df) == result.size == 2000
+    assert list(df.columns) == ["scenario", "model", "displacement", "probex_folded", "weight"]
+    np.testing.assert_allclose(df["probex_folded"], values.ravel())
+    np.testing.assert_allclose(df["weight"].sum(), 2)
+
+    # The DataFrame is created once; the copies are independent
+    df["weight"] = 0
+    assert result.to_frame()["weight"].sum() > 0
+
+
+def test_contiguous_arrays():
+    # Variables are real arrays (not broadcast views), including the debug variables
+    kwargs = {**SCENARIO, "coefficient_type": "full", "debug": True, "as_result": True}
+    for result in [
+        kea.calc_displ_site(**kwargs, percentile=0.5),
+        kea.calc_prob_exceed(**kwargs, displacement_array=[0.1, 1]),
+    ]:
+        for _, value in result.data.values():
+            assert value.flags.c_contiguous and value.flags.writeable and 0 not in value.strides
+
+
+def test_invalid_axes():
+    with pytest.raises(ValueError):
+        CalculationResult("a", {"a": (("x",), np.zeros(3)), "b": (("x",), np.zeros(2))})
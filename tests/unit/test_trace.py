@@ -0,0 +1,82 @@
+""" """
+
+import numpy as np
+import pytest
+
+import kuehn_et_al_fdm as kea
+from kuehn_et_al_fdm.cache import disable_cache, enable_cache
+from kuehn_et_al_fdm.trace import disable_tracing, enable_tracing, trace
+
+MAGNITUDE = np.array([6.5, 7, 7.5])
+LOCATION = np.array([0.1, 0.3, 0.5])
+
+
+@pytest.mark.filterwarnings("ignore:\\s*\\*\\*\\*Running multiple scenarios")
+@pytest.mark.parametrize("coefficient_type", ["median", "parametric"])
+def test_trace_multiple_scenarios(coefficient_type):
+    # Rows of the batch trace match the debug output for each scenario
+    fields = ["mean_site", "stdv_complement", "Y_folded", "displ_folded_meters"]
+    with trace(fields) as recorder:
+        result = kea.calc_displ_site(
+            magnitude=MAGNITUDE,
+            location=LOCATION,
+            style="strike-slip",
+            percentile=0.84,
+            coefficient_type=coefficient_type,
+            override=True,
+        )
+    columns = recorder.to_arrays("calc_displ_site")
+    assert list(columns) == ["call", "scenario", "percentile", "model_id"] + fields
+    assert len(columns["scenario"]) == result.size
+    np.testing.assert_allclose(columns["displ_folded_meters"], result.ravel())
+
+    for i, (magnitude, location) in enumerate(zip(MAGNITUDE, LOCATION)):
+        expected = kea.calc_displ_site(
+            magnitude=magnitude,
+            location=location,
+            style="strike-slip",
+            percentile=0.84,
+            coefficient_type=coefficient_type,
+            debug=True,
+        )
+        rows = columns["scenario"] == i
+        for field in fields:
+            np.testing.assert_allclose(columns[field][rows], expected[field].astype(float))
+
+
+def test_trace_prob_exceed():
+    params = {"location": 0.3, "style": "reverse", "displacement_array": [0.1, 1, 3]}
+    with trace(["probex_folded"]) as recorder:
+        for magnitude in [6.5, 7]:
+            kea.calc_prob_exceed(magnitude=magnitude, **params, coefficient_type="full")
+    df = recorder.to_frame("calc_prob_exceed")
+    assert len(df) == recorder.n_rows("calc_prob_exceed") == 2 * 1000 * 3
+    assert list(df.columns) == ["call", "scenario", "model_id", "displ_meters", "probex_folded"]
+
+    expected = kea.calc_prob_exceed(magnitude=7, **params, coefficient_type="full", debug=True)
+    np.testing.assert_allclose(
+        df.loc[df["call"] == 1, "probex_folded"], expected["probex_folded"].astype(float)
+    )
+
+
+def test_trace_bypasses_cache():
+    enable_cache()
+    try:
+        params = {"magnitude": 7, "location": 0.3, "style": "normal", "percentile": 0.5}
+        kea.calc_displ_site(**params)
+        with trace() as recorder:
+            kea.calc_displ_site(**params)
+        assert recorder.n_rows("calc_displ_site") == 1
+    finally:
+        disable_cache()
+
+
+def test_enable_disable():
+    recorder = enable_tracing()
+    with pytest.raises(RuntimeError):
+        enable_tracing()
+    assert disable_tracing() is recorder
+    assert disable_tracing() is None
+
+    with pytest.raises(ValueError):
+        enable_tracing(["mean"])
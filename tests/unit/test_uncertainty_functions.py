@@ -0,0 +1,52 @@
+""" """
+
+import pytest
+import numpy as np
+from scipy import stats
+
+
+from kuehn_et_al_fdm.load_data import DATA
+from kuehn_et_al_fdm.uncertainty_functions import (
+    _calc_epistemic_stdv,
+    _calc_fractile_prob_exceed,
+    _calc_fractile_transformed_displ,
+)
+
+
+@pytest.mark.parametrize("style", ["strike-slip", "reverse", "normal"])
+def test__calc_epistemic_stdv_grid_nodes(style):
+    # Interpolation should reproduce the tabulated values at the grid nodes
+    table = DATA["uncertainty"][style]
+    sd_med, sd_sigma = _calc_epistemic_stdv(table["M"], table["Ustar"], style)
+
+    np.testing.assert_allclose(sd_med, table["sd_med"])
+    np.testing.assert_allclose(sd_sigma, table["sd_sigma_T"])
+
+
+def test__calc_epistemic_stdv_broadcasting():
+    # Scenario arrays should broadcast and magnitudes should be clipped to the grid
+    sd_med, sd_sigma = _calc_epistemic_stdv([[6.05], [9.0]], [0.1, 0.5, 0.9], "reverse")
+    expected, _ = _calc_epistemic_stdv(8.2, [0.1, 0.5, 0.9], "reverse")
+
+    assert sd_med.shape == sd_sigma.shape == (2, 3)
+    np.testing.assert_allclose(sd_med[1], expected)
+
+
+def test__calc_fractile_transformed_displ():
+    # The median fractile is unchanged and the spread includes the sigma uncertainty
+    fractiles = [0.16, 0.5, 0.84]
+    computed = _calc_fractile_transformed_displ([1.0], 0.3, 0.4, 0.84, fractiles)
+    stdv = np.sqrt(0.3**2 + (stats.norm.ppf(0.84) * 0.4) ** 2)
+
+    np.testing.assert_allclose(computed[1], 1.0)
+    np.testing.assert_allclose(computed[2] - computed[0], 2 * stats.norm.ppf(0.84) * stdv)
+
+
+def test__calc_fractile_prob_exceed():
+    # The median fractile is the median-model exceedance and fractiles are increasing
+    fractiles = np.array([0.05, 0.5, 0.95])[:, np.newaxis]
+    y = np.linspace(-2, 4, 7)
+    computed = _calc_fractile_prob_exceed(y, 1.0, 0.9, 0.2, 0.1, fractiles)
+
+    np.testing.assert_allclose(computed[1], stats.norm.sf(y, 1.0, 0.9))
+    assert np.all(np.diff(computed, axis=0) > 0)
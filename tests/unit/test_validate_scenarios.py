@@ -0,0 +1,45 @@
+""" """
+
+import warnings
+
+import numpy as np
+import pytest
+
+from kuehn_et_al_fdm.validation import validate_scenarios
+
+SCENARIOS = {
+    "magnitude": [7, 5.5, 7, np.nan, 7],
+    "location": [0.2, 0.5, 1.2, 0.3, 0.5],
+    "style": ["normal", "Normal", "reverse", "normal", "oblique"],
+}
+
+
+def test_validate_scenarios_report():
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter("always")
+        result = validate_scenarios(**SCENARIOS, policy="flag")
+
+    # One aggregated warning for all rows
+    assert len(w) == 1 and issubclass(w[0].category, UserWarning)
+    np.testing.assert_array_equal(result.mask, [True, True, False, False, False])
+    assert result.report["invalid_magnitude"].tolist() == [3]
+    assert result.report["invalid_location"].tolist() == [2]
+    assert result.report["unknown_style"].tolist() == [4]
+    assert result.report["magnitude_out_of_range"].tolist() == [1]
+    assert result.magnitude.size == 5
+
+
+def test_validate_scenarios_policies():
+    with pytest.warns(UserWarning):
+        result = validate_scenarios(**SCENARIOS, policy="drop")
+    np.testing.assert_array_equal(result.magnitude, [7, 5.5])
+    np.testing.assert_array_equal(result.style, ["normal", "Normal"])
+
+    with pytest.raises(ValueError, match="3 of 5 scenarios are invalid"):
+        validate_scenarios(**SCENARIOS, policy="raise")
+
+    # Valid scenarios (with a broadcast style) emit no warning
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = validate_scenarios(magnitude=[6.5, 7], location=0.5, style="strike-slip")
+    assert result.mask.all() and result.location.shape == (2,)
@@ -0,0 +1,39 @@
+""" """
+
+import numpy as np
+
+
+from kuehn_et_al_fdm.utilities import _calc_weighted_mean, _calc_weighted_quantile
+
+
+def test__calc_weighted_mean():
+    values = np.array([[1.0, 10.0], [3.0, 30.0]])
+    computed = _calc_weighted_mean(values, [0.25, 0.75])
+    np.testing.assert_allclose(computed, [2.5, 25.0])
+
+
+def test__calc_weighted_quantile_equal_weights():
+    # Equal weights reproduce the midpoint (Hazen) quantile definition
+    values = np.arange(1.0, 11.0)
+    computed = _calc_weighted_quantile(values, np.ones(10), [0.05, 0.5, 0.95])
+    np.testing.assert_allclose(computed, [1.0, 5.5, 10.0])
+
+
+def test__calc_weighted_quantile_weights():
+    # Quantiles are invariant to the weight scale, ordered, and shift toward heavier rows
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(6, 3))
+    weights = np.array([1.0, 3.0, 2.0, 4.0, 1.0, 1.0])
+    quantiles = [0.1, 0.5, 0.9]
+
+    computed = _calc_weighted_quantile(values, weights, quantiles)
+    scaled = _calc_weighted_quantile(values, 10 * weights, quantiles)
+
+    assert computed.shape == (3, 3)
+    np.testing.assert_allclose(computed, scaled)
+    assert np.all(np.diff(computed, axis=0) >= 0)
+
+    heavy = np.array([0.1, 0.1, 0.1, 0.1, 0.1, 100.0])
+    np.testing.assert_allclose(
+        _calc_weighted_quantile(values, heavy, [0.5])[0], values[-1], atol=1e-2
+    )